@@ -3,45 +3,79 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
 
-from . import crud, models, schemas, security
-from .database import get_db
+from . import cache, crud, models, ratelimit, schemas, security, sessions
+from .database import get_db, read_only
 import logging
+import time
 
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+# 액세스 토큰 클레임 해석 (sub=사용자 id, ver=토큰 버전, sid=세션 id)
+def _token_data(db: Session, payload: dict) -> schemas.TokenData | None:
+    subject = payload.get("sub")
+    if subject is None:
+        return None
+    if "ver" not in payload:
+        # 이전 형식(sub=이메일) 토큰: 배포 후 유효 기간 동안만 이메일 조회로 허용
+        user = crud.get_user_by_email(db, email=subject)
+        if user is None:
+            return None
+        return schemas.TokenData(user_id=user.id, version=user.token_version or 0)
+    return schemas.TokenData(user_id=int(subject), version=payload["ver"], session_id=payload.get("sid"))
+
 # --- 의존성: 현재 인증된 사용자 정보 가져오기 ---
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
+# 동기 Session을 사용하므로 async가 아닌 def로 선언 (FastAPI가 스레드풀에서 실행하여 이벤트 루프를 막지 않음)
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, security.SECRET_KEY, algorithms=[security.ALGORITHM])
-        email: str | None = payload.get("sub")
-        if email is None:
+    # 이미 검증한 토큰이면 JWT 디코딩을 건너뜀
+    token_data = cache.token_cache.get(token)
+    if token_data is None:
+        try:
+            payload = jwt.decode(token, security.SECRET_KEY, algorithms=[security.ALGORITHM])
+            token_data = _token_data(db, payload)
+        except (JWTError, ValueError):
+            logging.exception('JWT decode failed')
             raise credentials_exception
-        token_data = schemas.TokenData(email=email)
-    except JWTError:
-        logging.exception('JWT decode failed')
+        if token_data is None:
+            raise credentials_exception
+        # 토큰 만료 시각을 넘겨서 캐시하지 않음
+        expires_in = payload.get("exp", 0) - time.time()
+        cache.token_cache.set(token, token_data, ttl=expires_in)
+    # 폐기 여부는 캐시된 토큰도 매번 확인 (메모리 조회, 갱신 주기마다 폐기 기록 증분 조회)
+    sessions.denylist.refresh(db)
+    if sessions.denylist.is_revoked(token_data.user_id, token_data.version, token_data.session_id):
+        cache.token_cache.pop(token)
         raise credentials_exception
-    user = crud.get_user_by_email(db, email=token_data.email)
-    if user is None:
+    user = crud.get_user_cached(db, user_id=token_data.user_id)
+    if user is None or (user.token_version or 0) > token_data.version:
+        cache.token_cache.pop(token)
         raise credentials_exception
+    db.info["user_id"] = user.id
     return user
 
 # --- 인증 관련 API 엔드포인트 ---
-@router.post("/signup/", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
+@router.post("/signup/", response_model=schemas.UserSummary, status_code=status.HTTP_201_CREATED)
 def signup(user: schemas.UserCreate, db: Session = Depends(get_db)):
     db_user = crud.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return crud.create_user(db=db, user=user)
+    try:
+        return crud.create_user(db=db, user=user)
+    except security.HashPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many signup attempts, try again later",
+            headers={"Retry-After": "1"},
+        )
 
-@router.post("/login/", response_model=schemas.Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+@router.post("/login/", response_model=schemas.Token, dependencies=[Depends(ratelimit.limit_login_account)])
+def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     logging.info('Login attempt for username=%s', form_data.username)
     user = crud.get_user_by_email(db, email=form_data.username)
     if not user:
@@ -52,7 +86,14 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
             headers={"WWW-Authenticate": "Bearer"},
         )
     try:
-        ok = security.verify_password(form_data.password, user.password)
+        ok, new_hash = security.verify_and_update_password(form_data.password, user.password)
+    except security.HashPoolBusy:
+        logging.warning('Password hash pool saturated, rejecting login for username=%s', form_data.username)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": "1"},
+        )
     except Exception:
         logging.exception('Error while verifying password for user=%s', form_data.username)
         raise HTTPException(
@@ -66,9 +107,38 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = security.create_access_token(data={"sub": user.email})
-    return {"access_token": access_token, "token_type": "bearer"}
+    if new_hash:
+        crud.update_user_password_hash(db, user, new_hash)
+    return sessions.start_session(db, user)
+
+# 리프레시 토큰으로 새 액세스 토큰 발급 (비밀번호 확인 없이 세션 유지, 리프레시 토큰도 새 것으로 교체)
+@router.post("/token/refresh/", response_model=schemas.Token)
+def refresh_access_token(body: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    try:
+        return sessions.rotate_refresh_token(db, body.refresh_token)
+    except sessions.InvalidRefreshToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+# 현재 기기 로그아웃: 리프레시 토큰이 속한 세션과 그 세션의 액세스 토큰을 폐기
+@router.post("/logout/", status_code=status.HTTP_204_NO_CONTENT)
+def logout(body: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    sessions.end_session(db, body.refresh_token)
+
+# 모든 기기에서 로그아웃
+@router.post("/logout/all/", status_code=status.HTTP_204_NO_CONTENT)
+def logout_all(current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
+    sessions.revoke_all_sessions(db, current_user.id)
 
-@router.get("/users/me/", response_model=schemas.User)
-async def read_users_me(current_user: models.User = Depends(get_current_user)):
-    return current_user
+@router.get("/users/me/", response_model=schemas.UserExpanded, response_model_exclude_unset=True, dependencies=[Depends(read_only)])
+def read_users_me(
+    expand: str | None = None,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # 캐시된 스냅샷은 인증에만 사용: 다른 워커에서 바뀐 잔액·장착 정보가 보이도록 응답은 primary 의 현재 행으로 만듦
+    user = crud.get_user_expanded(db, current_user.id, expand)
+    return schemas.UserExpanded.from_user(user, expand)
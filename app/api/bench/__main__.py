@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from . import results
+
+# 운영 DB를 실수로 덮어쓰지 않도록 DATABASE_URL 대신 별도 변수/옵션만 사용 (seed는 테이블을 지우고 다시 만듦)
+DEFAULT_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite:///./bench.db")
+
+
+TABLE_COLUMNS = {
+    "load": ("count", "p50_ms", "p95_ms", "p99_ms", "rps", "queries_per_request", "errors"),
+    "micro": ("count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "ops_per_s"),
+    "startup": ("count", "mean_ms", "p50_ms", "p95_ms", "max_ms"),
+    "handlers": ("count", "p50_ms", "p95_ms", "p99_ms", "rps", "errors"),
+}
+
+
+def _print_table(kind: str, rows: dict) -> None:
+    columns = TABLE_COLUMNS[kind]
+    print(f"{'':50}" + "".join(f"{column:>20}" for column in columns))
+    for name, stats in rows.items():
+        print(f"{name:50}" + "".join(f"{stats.get(column, ''):>20}" for column in columns))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.api.bench", description="Carrot API 벤치마크")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="벤치마크 DB를 비우고 고정 시드로 데이터 생성")
+    seed_parser.add_argument("--profile", choices=("small", "realistic"), default="small")
+    seed_parser.add_argument("--seed", type=int, default=42)
+    for option in ("users", "days", "categories", "items", "inventory"):
+        seed_parser.add_argument(f"--{option}", type=int)
+    seed_parser.add_argument("--todos-per-day", type=float)
+
+    load_parser = commands.add_parser("load", help="동시 클라이언트로 실제 라우터에 부하")
+    load_parser.add_argument("--clients", type=int, default=32)
+    load_parser.add_argument("--duration", type=float, default=30)
+    load_parser.add_argument("--warmup", type=float, default=5)
+    load_parser.add_argument("--seed", type=int, default=42)
+    load_parser.add_argument("--seeded-users", type=int, help="기본값: 벤치마크 DB의 시드 사용자 수")
+    load_parser.add_argument("--base-url", help="실행 중인 서버 주소 (생략하면 프로세스 내 ASGI 앱 사용)")
+    load_parser.add_argument("--output")
+
+    micro_parser = commands.add_parser("micro", help="crud 함수와 스키마 직렬화 마이크로 벤치마크")
+    micro_parser.add_argument("--repeat", type=int, default=200)
+    micro_parser.add_argument("--warmup", type=int, default=20)
+    micro_parser.add_argument("--only", help="이름에 이 문자열이 포함된 벤치마크만 실행")
+    micro_parser.add_argument("--output")
+
+    startup_parser = commands.add_parser("startup", help="새 프로세스의 앱 import ~ 첫 요청 응답 시간 측정")
+    startup_parser.add_argument("--runs", type=int, default=5)
+    startup_parser.add_argument("--output")
+
+    handlers_parser = commands.add_parser(
+        "handlers", help="느린 쿼리를 실행하는 async def 핸들러와 def(스레드풀) 핸들러의 처리량 비교",
+    )
+    handlers_parser.add_argument("--clients", type=int, default=32)
+    handlers_parser.add_argument("--duration", type=float, default=10)
+    handlers_parser.add_argument("--warmup", type=float, default=1)
+    handlers_parser.add_argument("--delay-ms", type=float, default=20, help="쿼리 한 번이 DB에서 걸리는 시간(ms)")
+    handlers_parser.add_argument("--output")
+
+    compare_parser = commands.add_parser("compare", help="두 결과 JSON 비교 (회귀 시 종료 코드 1)")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="회귀로 판단할 변화율(%%)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base, encoding="utf-8") as base_file, open(args.head, encoding="utf-8") as head_file:
+            try:
+                rows, regressed = results.compare(json.load(base_file), json.load(head_file), args.threshold)
+            except ValueError as e:
+                parser.error(str(e))
+        for row in rows:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['metric']:60} {row['base']:>12} -> {row['head']:>12} {row['change_pct']:>+8.1f}%{flag}")
+        return 1 if regressed else 0
+
+    # 앱 모듈은 import 시점에 엔진을 만들므로 환경 변수를 먼저 지정
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DATABASE_REPLICA_URLS"] = ""
+    # 요청마다 남는 INFO 로그가 측정에 섞이지 않도록 기본 레벨을 낮춤
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # 모든 가상 사용자가 같은 IP에서 동시에 로그인하므로 로그인 요청 제한을 끔
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    if args.command == "seed":
+        from . import seed
+
+        summary = seed.seed(
+            args.profile, args.seed,
+            users=args.users, days=args.days, todos_per_day=args.todos_per_day,
+            categories=args.categories, items=args.items, inventory=args.inventory,
+        )
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return 0
+
+    if args.command == "load":
+        from . import load, seed
+
+        seeded_users = args.seeded_users or seed.seeded_user_count()
+        if not seeded_users:
+            parser.error("no seeded users found; run the seed command first or pass --seeded-users")
+        result = asyncio.run(load.run(
+            args.clients, args.duration, args.warmup, seeded_users, seed_value=args.seed, base_url=args.base_url,
+        ))
+    elif args.command == "handlers":
+        from . import handlers
+
+        result = asyncio.run(handlers.run(args.clients, args.duration, args.warmup, args.delay_ms))
+    elif args.command == "startup":
+        from . import startup
+
+        result = startup.run(args.runs)
+    else:
+        from . import micro
+
+        result = micro.run(args.repeat, args.warmup, only=args.only)
+
+    result["meta"] = results.metadata(args.database_url)
+    _print_table(result["kind"], result["scenarios"])
+    if "summary" in result:
+        print(json.dumps(result["summary"]))
+    print(f"saved {results.write(result, args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event, text
+
+from ..database import SessionLocal, engine
+from . import results
+
+# 동기 Session 을 쓰는 핸들러를 async def 로 선언한 경우(이벤트 루프에서 DB 호출, 이전 get_current_user)와
+# def 로 선언한 경우(FastAPI 스레드풀에서 실행, 현재 방식)의 처리량을 같은 느린 쿼리로 비교
+MODES = {"async_def": "/async", "threadpool": "/threadpool"}
+
+# 드라이버 안에서 delay 초 동안 블로킹되는 쿼리 (SQLite 는 접속마다 bench_sleep 함수를 등록)
+SLOW_QUERIES = {
+    "postgresql": "SELECT pg_sleep(:seconds)",
+    "sqlite": "SELECT bench_sleep(:seconds)",
+}
+
+
+def _sleep(seconds: float) -> int:
+    time.sleep(seconds)
+    return 0
+
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _register_sleep(dbapi_connection, connection_record):
+        dbapi_connection.create_function("bench_sleep", 1, _sleep)
+
+
+def build_app(delay: float) -> FastAPI:
+    slow_query = text(SLOW_QUERIES[engine.dialect.name])
+    app = FastAPI()
+
+    # 세션은 핸들러 안에서 닫음: get_db 의 정리 단계는 응답 후 스레드풀에서 실행되므로, async def 핸들러가
+    # 이벤트 루프를 막은 채 커넥션 풀을 기다리면 커넥션을 반납할 정리 단계가 돌지 못해 멈춤
+    @app.get("/async")
+    async def slow_async():
+        with SessionLocal() as db:
+            db.execute(slow_query, {"seconds": delay})
+        return {"ok": True}
+
+    @app.get("/threadpool")
+    def slow_threadpool():
+        with SessionLocal() as db:
+            db.execute(slow_query, {"seconds": delay})
+        return {"ok": True}
+
+    return app
+
+
+async def _run_mode(client: httpx.AsyncClient, path: str, clients: int, duration: float, warmup: float) -> dict:
+    samples: list[float] = []
+    errors = 0
+
+    async def worker(deadline: float, record: bool) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(path)
+            if record:
+                samples.append(time.perf_counter() - started)
+                errors += response.status_code >= 400
+
+    if warmup:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(deadline, False) for _ in range(clients)))
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(worker(deadline, True) for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    stats = results.summarize_ms(samples)
+    stats["rps"] = round(len(samples) / elapsed, 2) if elapsed else 0.0
+    stats["errors"] = errors
+    return stats
+
+
+async def run(clients: int = 32, duration: float = 10, warmup: float = 1, delay_ms: float = 20) -> dict:
+    """느린 쿼리(delay_ms)를 실행하는 async def / def 핸들러에 clients 개의 동시 요청을 보내 모드별 처리량을 측정"""
+    app = build_app(delay_ms / 1000)
+    scenarios = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+        for mode, path in MODES.items():
+            scenarios[mode] = await _run_mode(client, path, clients, duration, warmup)
+    before, after = scenarios["async_def"]["rps"], scenarios["threadpool"]["rps"]
+    return {
+        "kind": "handlers",
+        "config": {"clients": clients, "duration": duration, "warmup": warmup, "delay_ms": delay_ms},
+        "summary": {"speedup": round(after / before, 2) if before else None},
+        "scenarios": scenarios,
+    }
@@ -0,0 +1,270 @@
+import asyncio
+import random
+import re
+import time
+from datetime import date, timedelta
+
+import httpx
+
+from . import results
+from .seed import BENCH_PASSWORD, SEED_TODAY, TITLE_WORDS, bench_email
+
+# 조회 위주의 모바일 앱 사용 패턴: (가중치, 시나리오)
+# 시나리오는 (기록 이름, 응답)을 반환하며 기록 이름은 ROUTES 의 키와 같음
+ROUTES = {
+    "login": ("POST", "/login/"),
+    "refresh": ("POST", "/token/refresh/"),
+    "todos_by_date": ("GET", "/todos/"),
+    "todos_month": ("GET", "/todos/range/"),
+    "todos_summary": ("GET", "/todos/summary/"),
+    "search_todos": ("GET", "/todos/search"),
+    "categories": ("GET", "/categories/"),
+    "users_me": ("GET", "/users/me/"),
+    "shop_items": ("GET", "/shop/items"),
+    "inventory": ("GET", "/api/inventory"),
+    "sync": ("GET", "/sync"),
+    "create_todo": ("POST", "/todos/"),
+    "complete_todo": ("POST", "/todos/{todo_id}/complete/"),
+    "uncomplete_todo": ("POST", "/todos/{todo_id}/uncomplete/"),
+}
+
+# 최근 기간을 주로 조회 (앱 첫 화면은 오늘 날짜)
+RECENT_DAYS = 90
+
+
+class VirtualUser:
+    def __init__(self, email: str, today: date, rng: random.Random):
+        self.email = email
+        self.today = today
+        self.rng = rng
+        self.headers: dict[str, str] = {}
+        self.refresh_token = ""
+        self.todos: dict[int, bool] = {}
+        self.sync_cursor = 0
+
+    def recent_day(self) -> date:
+        return self.today - timedelta(days=self.rng.randrange(RECENT_DAYS))
+
+    def use_tokens(self, tokens: dict) -> None:
+        self.headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        self.refresh_token = tokens["refresh_token"]
+
+    def remember(self, todos: list[dict]) -> None:
+        for todo in todos:
+            self.todos[todo["id"]] = todo["completed"]
+
+
+async def login(client: httpx.AsyncClient, user: VirtualUser):
+    response = await client.post("/login/", data={"username": user.email, "password": BENCH_PASSWORD})
+    if response.status_code == 200:
+        user.use_tokens(response.json())
+    return "login", response
+
+
+# 액세스 토큰 만료 시 앱이 보내는 재발급 요청 (bcrypt 없이 세션 유지)
+async def refresh(client: httpx.AsyncClient, user: VirtualUser):
+    response = await client.post("/token/refresh/", json={"refresh_token": user.refresh_token})
+    if response.status_code == 200:
+        user.use_tokens(response.json())
+    return "refresh", response
+
+
+async def todos_by_date(client: httpx.AsyncClient, user: VirtualUser):
+    response = await client.get("/todos/", params={"target_date": user.recent_day().isoformat()}, headers=user.headers)
+    if response.status_code == 200:
+        user.remember(response.json())
+    return "todos_by_date", response
+
+
+async def todos_month(client: httpx.AsyncClient, user: VirtualUser):
+    month = user.recent_day().strftime("%Y-%m")
+    return "todos_month", await client.get("/todos/range/", params={"month": month}, headers=user.headers)
+
+
+async def todos_summary(client: httpx.AsyncClient, user: VirtualUser):
+    month = user.recent_day().strftime("%Y-%m")
+    return "todos_summary", await client.get("/todos/summary/", params={"month": month}, headers=user.headers)
+
+
+# 검색창 입력 중 요청: 시드 제목 단어의 앞부분(접두어)
+async def search_todos(client: httpx.AsyncClient, user: VirtualUser):
+    word = user.rng.choice(TITLE_WORDS)
+    params = {"q": word[:user.rng.randint(1, len(word))]}
+    return "search_todos", await client.get("/todos/search", params=params, headers=user.headers)
+
+
+async def categories(client: httpx.AsyncClient, user: VirtualUser):
+    return "categories", await client.get("/categories/", headers=user.headers)
+
+
+async def users_me(client: httpx.AsyncClient, user: VirtualUser):
+    return "users_me", await client.get("/users/me/", headers=user.headers)
+
+
+async def shop_items(client: httpx.AsyncClient, user: VirtualUser):
+    return "shop_items", await client.get("/shop/items", headers=user.headers)
+
+
+async def inventory(client: httpx.AsyncClient, user: VirtualUser):
+    return "inventory", await client.get("/api/inventory", headers=user.headers)
+
+
+async def sync(client: httpx.AsyncClient, user: VirtualUser):
+    response = await client.get("/sync", params={"since": user.sync_cursor}, headers=user.headers)
+    if response.status_code == 200:
+        user.sync_cursor = response.json()["cursor"]
+    return "sync", response
+
+
+async def create_todo(client: httpx.AsyncClient, user: VirtualUser):
+    payload = {"title": f"bench {user.rng.randrange(1_000_000)}", "date": user.today.isoformat()}
+    response = await client.post("/todos/", json=payload, headers=user.headers)
+    if response.status_code == 200:
+        user.remember([response.json()])
+    return "create_todo", response
+
+
+async def toggle_todo(client: httpx.AsyncClient, user: VirtualUser):
+    if not user.todos:
+        return await create_todo(client, user)
+    todo_id = user.rng.choice(list(user.todos))
+    action = "uncomplete" if user.todos[todo_id] else "complete"
+    response = await client.post(f"/todos/{todo_id}/{action}/", headers=user.headers)
+    if response.status_code == 200:
+        user.todos[todo_id] = action == "complete"
+    return f"{action}_todo", response
+
+
+SCENARIOS = (
+    (30, todos_by_date),
+    (10, todos_month),
+    (5, todos_summary),
+    (2, search_todos),
+    (10, categories),
+    (10, users_me),
+    (8, shop_items),
+    (8, inventory),
+    (5, sync),
+    (5, create_todo),
+    (9, toggle_todo),
+    (2, refresh),
+)
+
+
+def _ok(response: httpx.Response) -> bool:
+    return response.status_code < 400
+
+
+async def _run_user(client, user: VirtualUser, deadline: float, samples: dict, errors: dict) -> None:
+    weights = [weight for weight, _ in SCENARIOS]
+    scenarios = [scenario for _, scenario in SCENARIOS]
+    while time.perf_counter() < deadline:
+        scenario = user.rng.choices(scenarios, weights)[0]
+        started = time.perf_counter()
+        name, response = await scenario(client, user)
+        elapsed = time.perf_counter() - started
+        samples.setdefault(name, []).append(elapsed)
+        if not _ok(response):
+            errors[name] = errors.get(name, 0) + 1
+
+
+_METRIC_LINE = re.compile(r'^http_request_db_statements_(sum|count)\{method="([^"]*)",route="([^"]*)"\} (\S+)$')
+
+
+async def _statement_totals(client: httpx.AsyncClient) -> dict[tuple[str, str], list[float]]:
+    """/metrics 에서 라우트별 (SQL 문 수 합계, 요청 수) 를 읽음"""
+    response = await client.get("/metrics")
+    response.raise_for_status()
+    totals: dict[tuple[str, str], list[float]] = {}
+    for line in response.text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if match:
+            kind, method, route, value = match.groups()
+            totals.setdefault((method, route), [0.0, 0.0])[0 if kind == "sum" else 1] = float(value)
+    return totals
+
+
+def _queries_per_request(before: dict, after: dict) -> dict[tuple[str, str], float]:
+    per_request = {}
+    for key, (statements, requests) in after.items():
+        base_statements, base_requests = before.get(key, (0.0, 0.0))
+        if requests > base_requests:
+            per_request[key] = round((statements - base_statements) / (requests - base_requests), 2)
+    return per_request
+
+
+def _client(base_url: str | None) -> httpx.AsyncClient:
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=60)
+    from ..main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+
+async def run(
+    clients: int,
+    duration: float,
+    warmup: float,
+    seeded_users: int,
+    seed_value: int = 42,
+    today: date = SEED_TODAY,
+    base_url: str | None = None,
+) -> dict:
+    """시드된 사용자로 로그인한 clients 개의 가상 사용자가 duration 초 동안 시나리오를 반복 실행"""
+    rng = random.Random(seed_value)
+    user_ids = rng.sample(range(1, seeded_users + 1), min(clients, seeded_users))
+    users = [
+        VirtualUser(bench_email(user_ids[index % len(user_ids)]), today, random.Random(seed_value + index))
+        for index in range(clients)
+    ]
+
+    async with _client(base_url) as client:
+        samples: dict[str, list[float]] = {}
+        errors: dict[str, int] = {}
+
+        login_samples = []
+        async def timed_login(user):
+            started = time.perf_counter()
+            _, response = await login(client, user)
+            login_samples.append(time.perf_counter() - started)
+            if not _ok(response):
+                errors["login"] = errors.get("login", 0) + 1
+        await asyncio.gather(*(timed_login(user) for user in users))
+
+        if warmup:
+            deadline = time.perf_counter() + warmup
+            await asyncio.gather(*(_run_user(client, user, deadline, {}, {}) for user in users))
+
+        before = await _statement_totals(client)
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(_run_user(client, user, deadline, samples, errors) for user in users))
+        elapsed = time.perf_counter() - started
+        after = await _statement_totals(client)
+
+    queries = _queries_per_request(before, after)
+    scenarios = {"login": {**results.summarize_ms(login_samples), "errors": errors.get("login", 0)}}
+    for name, values in sorted(samples.items()):
+        stats = results.summarize_ms(values)
+        stats["errors"] = errors.get(name, 0)
+        stats["rps"] = round(len(values) / elapsed, 2)
+        if ROUTES[name] in queries:
+            stats["queries_per_request"] = queries[ROUTES[name]]
+        scenarios[name] = stats
+
+    total = sum(len(values) for values in samples.values())
+    return {
+        "kind": "load",
+        "config": {
+            "clients": clients, "duration": duration, "warmup": warmup, "seeded_users": seeded_users,
+            "seed": seed_value, "today": today.isoformat(), "target": base_url or "in-process",
+        },
+        "summary": {
+            "requests": total,
+            "errors": sum(count for name, count in errors.items() if name != "login"),
+            "duration_s": round(elapsed, 3),
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            **results.summarize_ms([value for values in samples.values() for value in values]),
+        },
+        "scenarios": scenarios,
+    }
@@ -0,0 +1,235 @@
+import time
+from datetime import date, datetime, timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, func, insert
+from sqlalchemy.orm import joinedload, selectinload
+
+from .. import changes, crud, models, schemas, search, serializers
+from ..database import SessionLocal
+from . import results
+from .seed import SEED_TODAY, TITLE_WORDS
+
+# 직렬화 벤치마크에 사용할 할일 수 (id 순으로 앞에서부터, 사용자 구분 없이)
+SERIALIZE_BATCH = 1000
+# 카테고리 삭제 벤치마크: 카테고리에 연결한 할일 수, 정책·크기별 반복 횟수(--repeat 보다 작으면 --repeat)
+DELETE_CATEGORY_SIZES = (10, 1000, 10000)
+DELETE_CATEGORY_REPEAT = 5
+# 시드 사용자와 섞이지 않도록 카테고리 삭제 벤치마크 전용 사용자를 만들고 끝나면 데이터와 함께 지움
+DELETE_CATEGORY_EMAIL = "delete-category@micro.bench.invalid"
+
+
+def _measure(fn, repeat: int, warmup: int, reset=None, setup=None) -> dict:
+    # setup(측정할 데이터 준비, 반환값을 fn 인자로 전달)과 reset(세션 identity map 비우기 등)은 측정 시간에서 제외
+    for _ in range(warmup):
+        fn(*(setup() if setup else ()))
+        if reset:
+            reset()
+    samples = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        started = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - started)
+        if reset:
+            reset()
+    stats = results.summarize_ms(samples)
+    stats["ops_per_s"] = round(len(samples) / sum(samples), 1) if sum(samples) else 0.0
+    return stats
+
+
+def _busiest_user(db) -> int:
+    return db.query(models.Todo.owner_id).group_by(models.Todo.owner_id).order_by(
+        func.count().desc(), models.Todo.owner_id
+    ).limit(1).scalar()
+
+
+def crud_benchmarks(db, user_id: int, today: date) -> tuple[dict, object]:
+    def reset():
+        db.rollback()
+        db.expunge_all()
+
+    month_start = today.replace(day=1)
+    year_ago = today - timedelta(days=365)
+    cursor = changes.current_version(db, user_id)
+    return {
+        "crud.get_user": lambda: crud.get_user(db, user_id),
+        "crud.get_todos_by_date": lambda: crud.get_todos_by_date(db, user_id, today - timedelta(days=1)),
+        "crud.get_todos_by_range[month]": lambda: crud.get_todos_by_range(
+            db, user_id, month_start - timedelta(days=31), month_start
+        ),
+        "crud.get_todos[page=100]": lambda: crud.get_todos(db, user_id, limit=100),
+        "crud.get_day_summaries[year]": lambda: crud.get_day_summaries(db, user_id, year_ago, today),
+        "crud.get_categories_by_user": lambda: crud.get_categories_by_user(db, user_id),
+        "crud.get_user_inventory": lambda: crud.get_user_inventory(db, user_id),
+        "crud.get_all_shop_items": lambda: crud.get_all_shop_items(db),
+        "crud.get_changes_since[full]": lambda: crud.get_changes_since(db, user_id, 0, cursor),
+        "crud.get_todo_rows_by_range[month]": lambda: crud.get_todo_rows_by_range(
+            db, user_id, month_start - timedelta(days=31), month_start
+        ),
+        "crud.get_category_rows": lambda: crud.get_category_rows(db, user_id),
+        "crud.get_user_inventory_rows": lambda: crud.get_user_inventory_rows(db, user_id),
+        # 검색 첫 페이지 (PostgreSQL 은 GIN 인덱스, 그 외 DB는 캐시된 프로세스 내 역색인)
+        "search.search_todos[prefix]": lambda: search.search_todos(db, user_id, TITLE_WORDS[0][:1]),
+        "search.search_todos[word]": lambda: search.search_todos(db, user_id, TITLE_WORDS[2]),
+    }, reset
+
+
+def _seed_category(db, user_id: int, size: int, day: datetime) -> tuple[int]:
+    category = models.Category(text="delete benchmark", owner_id=user_id)
+    db.add(category)
+    db.flush()
+    todo_ids = db.execute(insert(models.Todo).returning(models.Todo.id), [
+        {"title": f"delete benchmark {index}", "date": day, "owner_id": user_id, "completed": index % 2 == 0}
+        for index in range(size)
+    ]).scalars().all()
+    db.execute(models.todo_category_association.insert(), [
+        {"todo_id": todo_id, "category_id": category.id} for todo_id in todo_ids
+    ])
+    crud.adjust_day_summary(db, user_id, day, total=size, completed=(size + 1) // 2)
+    db.commit()
+    return (category.id,)
+
+
+def _clear_user_rows(db, user_id: int) -> None:
+    association = models.todo_category_association
+    todo_ids = db.query(models.Todo.id).filter(models.Todo.owner_id == user_id).scalar_subquery()
+    db.execute(delete(association).where(association.c.todo_id.in_(todo_ids)))
+    for model, owner_column in (
+        (models.Todo, models.Todo.owner_id),
+        (models.Category, models.Category.owner_id),
+        (models.TodoDaySummary, models.TodoDaySummary.owner_id),
+        (models.SyncTombstone, models.SyncTombstone.owner_id),
+    ):
+        db.execute(delete(model).where(owner_column == user_id))
+    db.commit()
+    db.expunge_all()
+
+
+# 집합 단위 삭제 이전의 crud.delete_category (할일을 하나씩 로드해 집계를 고치고 ORM 으로 삭제), 비교 기준으로만 사용
+def _delete_category_orm_per_row(db, category_id: int):
+    db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
+    if db_category:
+        for todo in db_category.todos:
+            crud.adjust_day_summary(db, todo.owner_id, todo.date, total=-1, completed=-1 if todo.completed else 0)
+            db.delete(todo)
+        db.delete(db_category)
+        db.commit()
+    return db_category
+
+
+def delete_category_benchmarks(db, repeat: int, warmup: int, today: date, only: str | None = None) -> dict:
+    """연결된 할일이 DELETE_CATEGORY_SIZES 개인 카테고리를 이전 방식(orm_per_row)과 정책별(delete_todos, unlink)로 삭제하는 시간"""
+    deleters = {"orm_per_row": _delete_category_orm_per_row}
+    for policy in crud.CATEGORY_DELETE_POLICIES:
+        deleters[policy] = lambda db, category_id, policy=policy: crud.delete_category(db, category_id, policy)
+    names = {
+        (size, policy): f"crud.delete_category[{policy},todos={size}]"
+        for size in DELETE_CATEGORY_SIZES for policy in deleters
+    }
+    names = {key: name for key, name in names.items() if not only or only in name}
+    if not names:
+        return {}
+    day = datetime.combine(today, datetime.min.time())
+    user = models.User(email=DELETE_CATEGORY_EMAIL, password="")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    benchmarks = {}
+    try:
+        for (size, policy), name in names.items():
+            benchmarks[name] = _measure(
+                lambda category_id: deleters[policy](db, category_id),
+                min(repeat, DELETE_CATEGORY_REPEAT), min(warmup, 1),
+                reset=lambda: _clear_user_rows(db, user_id),
+                setup=lambda: _seed_category(db, user_id, size, day),
+            )
+    finally:
+        db.rollback()
+        _clear_user_rows(db, user_id)
+        db.execute(delete(models.SyncCursor).where(models.SyncCursor.user_id == user_id))
+        db.execute(delete(models.User).where(models.User.id == user_id))
+        db.commit()
+    return benchmarks
+
+
+def serialization_benchmarks(db, user_id: int) -> tuple[dict, dict]:
+    todo_ids = [todo_id for (todo_id,) in db.query(models.Todo.id).order_by(models.Todo.id).limit(SERIALIZE_BATCH)]
+    batch = models.Todo.id.in_(todo_ids)
+    todos = db.query(models.Todo).options(crud.TODO_WITH_CATEGORIES).filter(batch).order_by(models.Todo.id).all()
+    todo_rows = crud.get_todo_rows(db, batch, order_by=(models.Todo.id,))
+    # 행 튜플 -> dict 변환 비용만 측정하기 위해 조회 결과(튜플)를 미리 만들어 둠
+    todo_tuples = db.query(*serializers.TODO.columns).filter(batch).order_by(models.Todo.id).all()
+    inventory_rows, _ = crud.get_user_inventory_rows(db, user_id)
+    items = crud.get_all_shop_items(db)
+    inventory, _ = crud.get_user_inventory(db, user_id)
+    user = db.query(models.User).options(
+        selectinload(models.User.todos).selectinload(models.Todo.categories),
+        selectinload(models.User.inventory).joinedload(models.Inventory.item),
+    ).filter(models.User.id == user_id).one()
+
+    todo_list = TypeAdapter(list[schemas.Todo])
+    item_list = TypeAdapter(list[schemas.ItemResponse])
+    inventory_list = TypeAdapter(list[schemas.Inventory])
+    validated_todos = todo_list.validate_python(todos, from_attributes=True)
+    # 이름에는 행 수를 넣지 않고 config 에 기록 (데이터가 달라도 결과 비교 키가 유지되도록)
+    sizes = {"todos": len(todos), "items": len(items), "inventory": len(inventory), "user_todos": len(user.todos)}
+
+    def load_orm_and_dump():
+        db.expunge_all()
+        loaded = db.query(models.Todo).options(crud.TODO_WITH_CATEGORIES).filter(batch).order_by(models.Todo.id).all()
+        return todo_list.dump_json(todo_list.validate_python(loaded, from_attributes=True))
+
+    return {
+        "schemas.Todo.validate": lambda: todo_list.validate_python(todos, from_attributes=True),
+        "schemas.Todo.dump_json": lambda: todo_list.dump_json(validated_todos),
+        "schemas.Todo.validate+dump_json": lambda: todo_list.dump_json(
+            todo_list.validate_python(todos, from_attributes=True)
+        ),
+        # 목록 응답 빠른 경로 (serializers): 행 dict -> JSON, 행 튜플 -> dict -> JSON
+        "serializers.Todo.dumps": lambda: serializers.dumps(serializers.TODO_LIST, todo_rows),
+        "serializers.Todo.to_dict+dumps": lambda: serializers.dumps(
+            serializers.TODO_LIST, [serializers.TODO.to_dict(row, categories=[]) for row in todo_tuples]
+        ),
+        "serializers.Inventory.dumps": lambda: serializers.dumps(serializers.INVENTORY_LIST, inventory_rows),
+        # DB 조회까지 포함한 할일 목록 응답 본문 생성: ORM + 검증 vs 행 조회
+        "todos.orm+validate+dump_json": load_orm_and_dump,
+        "todos.get_todo_rows+dumps": lambda: serializers.dumps(
+            serializers.TODO_LIST, crud.get_todo_rows(db, batch, order_by=(models.Todo.id,))
+        ),
+        "schemas.ItemResponse.validate+dump_json": lambda: item_list.dump_json(
+            item_list.validate_python(items, from_attributes=True)
+        ),
+        "schemas.Inventory.validate+dump_json": lambda: inventory_list.dump_json(
+            inventory_list.validate_python(inventory, from_attributes=True)
+        ),
+        "schemas.UserExpanded.from_user[todos,inventory]": lambda: schemas.UserExpanded.from_user(
+            user, "todos,inventory"
+        ).model_dump_json(exclude_unset=True),
+    }, sizes
+
+
+def run(repeat: int = 200, warmup: int = 20, today: date = SEED_TODAY, only: str | None = None) -> dict:
+    """crud 조회 함수와 스키마 직렬화의 호출당 시간을 측정"""
+    benchmarks = {}
+    with SessionLocal() as db:
+        user_id = _busiest_user(db)
+        if user_id is None:
+            raise RuntimeError("benchmark database is empty; run the seed command first")
+        crud_fns, reset = crud_benchmarks(db, user_id, today)
+        for name, fn in crud_fns.items():
+            if not only or only in name:
+                benchmarks[name] = _measure(fn, repeat, warmup, reset)
+        benchmarks.update(delete_category_benchmarks(db, repeat, warmup, today, only))
+        serializer_fns, sizes = serialization_benchmarks(db, user_id)
+        for name, fn in serializer_fns.items():
+            if not only or only in name:
+                benchmarks[name] = _measure(fn, repeat, warmup)
+    return {
+        "kind": "micro",
+        "config": {
+            "repeat": repeat, "warmup": warmup, "user_id": user_id, "today": today.isoformat(), "only": only,
+            "serialized_rows": sizes,
+        },
+        "scenarios": benchmarks,
+    }
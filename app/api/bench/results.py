@@ -0,0 +1,102 @@
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import make_url
+
+RESULTS_DIR = Path("bench_results")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """정렬된 값에서 선형 보간 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def summarize_ms(samples_seconds: list[float]) -> dict:
+    values = sorted(sample * 1000 for sample in samples_seconds)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 3),
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3),
+    }
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(
+            ("git", *args), capture_output=True, text=True, check=True, timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def metadata(database_url: str) -> dict:
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "database": make_url(database_url).get_backend_name(),
+    }
+
+
+def write(result: dict, output: str | None) -> Path:
+    if output:
+        path = Path(output)
+    else:
+        commit = (result["meta"].get("commit") or "unknown")[:12]
+        path = RESULTS_DIR / f"{result['kind']}-{commit}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+# 비교 대상 지표: 값이 클수록 나쁨
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "queries_per_request")
+
+
+def _flatten(result: dict) -> dict[str, float]:
+    metrics = {}
+    for name, stats in result.get("scenarios", {}).items():
+        for key in COMPARED_METRICS:
+            if key in stats:
+                metrics[f"{name}.{key}"] = stats[key]
+    if "throughput_rps" in result.get("summary", {}):
+        # 처리량은 클수록 좋으므로 부호를 바꿔 같은 기준으로 비교
+        metrics["summary.throughput_rps"] = -result["summary"]["throughput_rps"]
+    return metrics
+
+
+def compare(base: dict, head: dict, threshold_pct: float) -> tuple[list[dict], bool]:
+    """같은 종류(load/micro)의 두 결과를 지표별로 비교하고 threshold_pct 이상 나빠진 지표가 있는지 반환"""
+    if base.get("kind") != head.get("kind"):
+        raise ValueError(f"cannot compare {base.get('kind')} results with {head.get('kind')} results")
+    base_metrics, head_metrics = _flatten(base), _flatten(head)
+    rows, regressed = [], False
+    for name in sorted(base_metrics.keys() & head_metrics.keys()):
+        before, after = base_metrics[name], head_metrics[name]
+        if before:
+            change = (after - before) / abs(before) * 100
+        else:
+            change = 0.0 if after == before else float("inf")
+        is_regression = change >= threshold_pct
+        regressed = regressed or is_regression
+        rows.append({
+            "metric": name, "base": round(abs(before), 3), "head": round(abs(after), 3),
+            "change_pct": round(change, 1), "regression": is_regression,
+        })
+    return rows, regressed
@@ -0,0 +1,155 @@
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+
+from .. import models, security
+from ..database import engine
+
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+BENCH_PASSWORD = "benchpass123"
+INSERT_CHUNK_SIZE = 5000
+# 이 수만큼 할일이 쌓이면 중간에 INSERT 하여 메모리 사용량을 제한
+FLUSH_ROWS = 50000
+# 생성 데이터가 실행 날짜에 따라 달라지지 않도록 기준일을 고정
+SEED_TODAY = date(2026, 1, 1)
+
+# users: 사용자 수, days: 오늘 이전 기간(일), todos_per_day: 날짜별 평균 할일 수
+PROFILES = {
+    "small": {"users": 200, "days": 90, "todos_per_day": 2.0, "categories": 5, "items": 60, "inventory": 10},
+    "realistic": {"users": 2000, "days": 730, "todos_per_day": 1.5, "categories": 8, "items": 120, "inventory": 25},
+}
+
+ITEM_TYPES = ("hat", "accessory", "background")
+TITLE_WORDS = ("운동", "독서", "장보기", "회의", "과제", "청소", "산책", "공부", "요리", "빨래", "병원", "정리")
+EQUIP_COLUMNS = {"hat": "equipped_hat_id", "accessory": "equipped_acc_id", "background": "equipped_background_id"}
+CATEGORY_TEXTS = ("업무", "개인", "건강", "공부", "가족", "취미", "쇼핑", "기타")
+
+
+def bench_email(index: int) -> str:
+    return f"user{index}@{BENCH_EMAIL_DOMAIN}"
+
+
+def seeded_user_count() -> int:
+    with engine.connect() as conn:
+        return conn.execute(
+            select(func.count()).select_from(models.User).where(models.User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+        ).scalar_one()
+
+
+def _insert(conn, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        conn.execute(table.insert(), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def _todo_count(rng: random.Random, mean: float) -> int:
+    # 평균이 mean인 기하분포에 가까운 날짜별 할일 수 (할일 없는 날도 있고 많은 날도 있음)
+    count = 0
+    while rng.random() < mean / (mean + 1):
+        count += 1
+    return count
+
+
+def seed(profile: str = "small", seed_value: int = 42, today: date = SEED_TODAY, **overrides) -> dict:
+    """벤치마크용 데이터베이스를 비우고 같은 seed_value에 대해 항상 같은 데이터를 생성"""
+    config = {**PROFILES[profile], **{key: value for key, value in overrides.items() if value is not None}}
+    rng = random.Random(seed_value)
+    started = time.perf_counter()
+
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    password_hash = security.get_password_hash(BENCH_PASSWORD)
+
+    items = []
+    for item_id in range(1, config["items"] + 1):
+        item_type = ITEM_TYPES[(item_id - 1) % len(ITEM_TYPES)]
+        items.append({
+            "id": item_id, "name": f"{item_type}-{item_id}", "price": rng.randrange(10, 500, 10),
+            "item_type": item_type, "image_url": f"https://example.com/items/{item_id}.png",
+        })
+
+    counts = dict.fromkeys(("users", "categories", "todos", "todo_categories", "todo_day_summaries", "inventories"), 0)
+    pending: dict[str, list[dict]] = {key: [] for key in counts}
+    tables = {
+        "users": models.User.__table__,
+        "categories": models.Category.__table__,
+        "inventories": models.Inventory.__table__,
+        "todos": models.Todo.__table__,
+        "todo_categories": models.todo_category_association,
+        "todo_day_summaries": models.TodoDaySummary.__table__,
+    }
+
+    def flush(conn) -> None:
+        # FK 순서대로 INSERT (users -> categories/inventories/todos -> 연결 테이블)
+        for key, table in tables.items():
+            _insert(conn, table, pending[key])
+            counts[key] += len(pending[key])
+            pending[key].clear()
+
+    first_day = today - timedelta(days=config["days"])
+    # 과거 기간 + 앞으로 2주 (예정된 할일)
+    span = config["days"] + 14
+    category_id = todo_id = inventory_id = 0
+    with engine.begin() as conn:
+        _insert(conn, models.Item.__table__, items)
+        for user_id in range(1, config["users"] + 1):
+            user = {
+                "id": user_id, "email": bench_email(user_id), "password": password_hash,
+                "carrot_balance": rng.randrange(0, 5000),
+                "equipped_hat_id": None, "equipped_acc_id": None, "equipped_background_id": None,
+            }
+            pending["users"].append(user)
+
+            owned = rng.sample(items, min(config["inventory"], len(items)))
+            equipped_types = set()
+            for item in sorted(owned, key=lambda owned_item: owned_item["id"]):
+                inventory_id += 1
+                equip = item["item_type"] not in equipped_types and rng.random() < 0.5
+                if equip:
+                    equipped_types.add(item["item_type"])
+                    user[EQUIP_COLUMNS[item["item_type"]]] = item["id"]
+                pending["inventories"].append({
+                    "id": inventory_id, "user_id": user_id, "item_id": item["id"], "is_equipped": equip, "version": 0,
+                })
+
+            user_categories = []
+            for text in rng.sample(CATEGORY_TEXTS, min(config["categories"], len(CATEGORY_TEXTS))):
+                category_id += 1
+                user_categories.append(category_id)
+                pending["categories"].append({"id": category_id, "text": text, "owner_id": user_id, "version": 0})
+
+            for offset in range(span):
+                day = first_day + timedelta(days=offset)
+                total = completed_count = 0
+                for _ in range(_todo_count(rng, config["todos_per_day"])):
+                    todo_id += 1
+                    completed = day < today and rng.random() < 0.7
+                    pending["todos"].append({
+                        "id": todo_id, "title": " ".join(rng.sample(TITLE_WORDS, 2)), "completed": completed,
+                        "owner_id": user_id,
+                        # API 와 같이 날짜만 저장 (자정)
+                        "date": datetime.combine(day, datetime.min.time()),
+                        "version": 0,
+                    })
+                    if user_categories and rng.random() < 0.5:
+                        pending["todo_categories"].append({"todo_id": todo_id, "category_id": rng.choice(user_categories)})
+                    total += 1
+                    completed_count += 1 if completed else 0
+                if total:
+                    pending["todo_day_summaries"].append(
+                        {"owner_id": user_id, "day": day, "total": total, "completed": completed_count}
+                    )
+
+            if len(pending["todos"]) >= FLUSH_ROWS:
+                flush(conn)
+        flush(conn)
+
+    return {
+        "profile": profile,
+        "seed": seed_value,
+        "today": today.isoformat(),
+        "config": config,
+        "rows": {"items": len(items), **counts},
+        "seconds": round(time.perf_counter() - started, 3),
+    }
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+# 새 프로세스에서 앱 import -> lifespan(warm-up) -> 첫 요청까지의 시간을 측정
+# 측정 프로세스가 미리 import 한 모듈이 결과에 섞이지 않도록 이 모듈은 표준 라이브러리만 import
+
+
+def _probe() -> None:
+    import httpx
+
+    started = time.perf_counter()
+    from ..main import app
+    imported = time.perf_counter()
+
+    async def first_requests() -> dict:
+        async with app.router.lifespan_context(app):
+            ready = time.perf_counter()
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+                health = await client.get("/healthz")
+                first = time.perf_counter()
+                catalog = await client.get("/shop/items")
+                catalog_done = time.perf_counter()
+        return {
+            "import": imported - started,
+            "warm_up": ready - imported,
+            "first_request": first - ready,
+            "import_to_first_request": first - started,
+            "catalog_request": catalog_done - first,
+            "statuses": [health.status_code, catalog.status_code],
+        }
+
+    print(json.dumps(asyncio.run(first_requests())))
+
+
+def run(runs: int = 5) -> dict:
+    """runs 번 새 프로세스를 띄워 단계별 시작 시간을 측정"""
+    from . import results
+
+    samples: dict[str, list[float]] = {}
+    statuses = set()
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            (sys.executable, "-m", __name__), capture_output=True, text=True, check=True,
+        )
+        process_seconds = time.perf_counter() - started
+        measured = json.loads(completed.stdout.strip().splitlines()[-1])
+        statuses.update(measured.pop("statuses"))
+        measured["process_total"] = process_seconds
+        for name, seconds in measured.items():
+            samples.setdefault(name, []).append(seconds)
+    return {
+        "kind": "startup",
+        "config": {"runs": runs, "statuses": sorted(statuses)},
+        "scenarios": {name: results.summarize_ms(values) for name, values in samples.items()},
+    }
+
+
+if __name__ == "__main__":
+    _probe()
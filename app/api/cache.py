@@ -0,0 +1,95 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- 환경 변수 ---
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+# 다른 프로세스에서 items 테이블을 변경한 경우에도 이 시간이 지나면 다시 로드
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+
+
+class TTLCache:
+    """TTL 만료와 크기 제한(LRU 제거)을 갖는 프로세스 로컬 캐시"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# 토큰 -> 사용자 ID (JWT 검증 결과 메모이제이션, 토큰 만료 시각까지만 유지)
+token_cache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+# 사용자 ID -> users 행 스냅샷 (컬럼 값 dict, 인증용: 잔액·장착 정보를 응답할 때는 행을 다시 읽음)
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int) -> None:
+    """users 행을 변경하는 쓰기 경로에서 호출하여 캐시된 스냅샷을 제거 (현재 프로세스만, 다른 워커는 TTL 까지 유지)"""
+    user_cache.pop(user_id)
+
+
+# 상점 카탈로그: (ETag, 직렬화된 JSON 본문)과 item_id -> 아이템 정보 색인
+catalog_cache = TTLCache(maxsize=2, ttl=CATALOG_CACHE_TTL_SECONDS)
+CATALOG_KEY = "shop_items"
+CATALOG_INDEX_KEY = "item_index"
+
+
+def invalidate_catalog() -> None:
+    catalog_cache.clear()
+
+
+# 본문 내용으로 만든 ETag (워커 프로세스가 달라도 같은 카탈로그면 같은 값)
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,92 @@
+from typing import Iterable
+
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from . import cache, models
+
+# 델타 동기화 대상 모델: (동기화 응답 키, 소유자 컬럼, 클라이언트 식별 컬럼)
+VERSIONED_MODELS = {
+    models.Todo: ("todos", "owner_id", "id"),
+    models.Category: ("categories", "owner_id", "id"),
+    models.Inventory: ("inventory", "user_id", "item_id"),
+}
+
+# 사용자 변경 버전을 1 증가시키고 새 값을 반환
+# (sync_cursors 행 잠금이 커밋까지 유지되므로 같은 사용자의 버전은 커밋 순서대로 증가)
+def next_version(db: Session, user_id: int) -> int:
+    table = models.SyncCursor.__table__
+    conn = db.connection()
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(table).values(user_id=user_id, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={"version": table.c.version + 1},
+        ).returning(table.c.version)
+        return conn.execute(stmt).scalar_one()
+    updated = conn.execute(
+        update(table).where(table.c.user_id == user_id).values(version=table.c.version + 1)
+    ).rowcount
+    if not updated:
+        conn.execute(table.insert().values(user_id=user_id, version=1))
+    return conn.execute(select(table.c.version).where(table.c.user_id == user_id)).scalar_one()
+
+def current_version(db: Session, user_id: int) -> int:
+    version = db.query(models.SyncCursor.version).filter(models.SyncCursor.user_id == user_id).scalar()
+    return version or 0
+
+# ORM을 거치지 않는 집합 단위 DELETE 경로에서 직접 삭제 기록을 남길 때 사용
+def record_deletes(db: Session, user_id: int, entity: str, entity_ids: Iterable[int]) -> None:
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return
+    version = next_version(db, user_id)
+    db.connection().execute(models.SyncTombstone.__table__.insert(), [
+        {"owner_id": user_id, "entity": entity, "entity_id": entity_id, "version": version}
+        for entity_id in entity_ids
+    ])
+
+# flush 직전에 변경된 동기화 대상 행에 버전을 찍고, 삭제된 행은 tombstone으로 기록
+@event.listens_for(Session, "before_flush")
+def _stamp_versions(session: Session, flush_context, instances) -> None:
+    changed = []
+    for obj in session.new:
+        if type(obj) in VERSIONED_MODELS:
+            changed.append((obj, False))
+    for obj in session.dirty:
+        if type(obj) in VERSIONED_MODELS and session.is_modified(obj):
+            changed.append((obj, False))
+    for obj in session.deleted:
+        if type(obj) in VERSIONED_MODELS:
+            changed.append((obj, True))
+    if not changed:
+        return
+
+    versions: dict[int, int] = {}
+    for obj, deleted in changed:
+        entity, owner_attr, key_attr = VERSIONED_MODELS[type(obj)]
+        owner_id = getattr(obj, owner_attr)
+        if owner_id is None:
+            continue
+        if owner_id not in versions:
+            versions[owner_id] = next_version(session, owner_id)
+        if deleted:
+            session.add(models.SyncTombstone(
+                owner_id=owner_id, entity=entity, entity_id=getattr(obj, key_attr), version=versions[owner_id],
+            ))
+        else:
+            obj.version = versions[owner_id]
+
+# 상점 물품이 변경되면 커밋 후 카탈로그 캐시를 무효화
+@event.listens_for(Session, "after_flush")
+def _track_catalog_changes(session: Session, flush_context) -> None:
+    if any(isinstance(obj, models.Item) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["catalog_changed"] = True
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_catalog(session: Session) -> None:
+    if session.info.pop("catalog_changed", False):
+        cache.invalidate_catalog()
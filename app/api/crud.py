@@ -1,12 +1,71 @@
-from sqlalchemy.orm import Session, joinedload
-from datetime import date
+from sqlalchemy import delete, func, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, contains_eager, joinedload, make_transient_to_detached, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+import os
+from collections import Counter
+from datetime import date, datetime, time, timedelta
 from typing import List
-from . import models, schemas, security
+from . import cache, changes, events, models, schemas, security, serializers
+
+# --- 로딩 프로필 (응답 직렬화 시 lazy load로 인한 N+1 방지) ---
+# 할일 + 카테고리: 다대다 관계는 IN 쿼리 1회로 일괄 로드
+TODO_WITH_CATEGORIES = (selectinload(models.Todo.categories),)
+# 인벤토리 + 아이템: 다대일 관계는 JOIN으로 같은 쿼리에서 로드
+INVENTORY_WITH_ITEM = (joinedload(models.Inventory.item),)
+# 사용자 응답의 ?expand= 관계: 할일(+카테고리)은 IN 쿼리 2회, 인벤토리(+아이템)는 JOIN 쿼리 1회
+USER_EXPANSIONS = {
+    "todos": selectinload(models.User.todos).selectinload(models.Todo.categories),
+    "inventory": selectinload(models.User.inventory).joinedload(models.Inventory.item),
+}
+
+# --- keyset(커서) 페이지 조회 ---
+MAX_PAGE_SIZE = 200
+
+# key_column 오름차순으로 after 이후 limit 건 조회, 다음 페이지가 있으면 마지막 키를 커서로 반환
+def _keyset_page(query, key_column, after: int | None, limit: int | None):
+    if after is not None:
+        query = query.filter(key_column > after)
+    query = query.order_by(key_column)
+    if limit is None:
+        return query.all(), None
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, getattr(last, key_column.key)
 
 # --- User CRUD 함수 ---
 def get_user_by_email(db: Session, email: str) -> models.User | None:
     return db.query(models.User).filter(models.User.email == email).first()
 
+def get_user(db: Session, user_id: int) -> models.User | None:
+    return db.query(models.User).filter(models.User.id == user_id).first()
+
+# users 행의 컬럼 값만 담은 스냅샷 (세션과 무관하게 캐시에 보관)
+def snapshot_user(user: models.User) -> dict:
+    return {column.key: getattr(user, column.key) for column in models.User.__table__.columns}
+
+# 캐시된 스냅샷이 있으면 SELECT 없이 현재 세션에 붙여서 반환
+def get_user_cached(db: Session, user_id: int) -> models.User | None:
+    snapshot = cache.user_cache.get(user_id)
+    if snapshot is None:
+        user = get_user(db, user_id)
+        if user is not None:
+            cache.user_cache.set(user_id, snapshot_user(user))
+        return user
+    user = models.User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+# users 행을 다시 읽고(세션에 있는 객체도 현재 값으로 갱신) ?expand= 로 요청한 관계를 함께 로드
+def get_user_expanded(db: Session, user_id: int, expand: str | None = None) -> models.User | None:
+    options = [USER_EXPANSIONS[field] for field in schemas.expand_fields(expand)]
+    return db.query(models.User).options(*options).populate_existing()\
+        .filter(models.User.id == user_id).first()
+
 # 사용자 계정 생성 
 def create_user(db: Session, user: schemas.UserCreate) -> models.User:
     hashed_password = security.get_password_hash(user.password)
@@ -17,12 +76,180 @@ def create_user(db: Session, user: schemas.UserCreate) -> models.User:
     db.refresh(db_user)
     return db_user
 
+# 로그인 시 해시 비용 파라미터가 바뀐 경우 새 해시로 교체
+def update_user_password_hash(db: Session, user: models.User, hashed_password: str) -> models.User:
+    user.password = hashed_password
+    db.commit()
+    cache.invalidate_user(user.id)
+    return user
+
 # --- Todo CRUD 함수 ---
-def get_todos(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.Todo).filter(models.Todo.owner_id == user_id).offset(skip).limit(limit).all()
+def get_todos(db: Session, user_id: int, after_id: int | None = None, limit: int = 100):
+    query = db.query(models.Todo).options(*TODO_WITH_CATEGORIES).filter(models.Todo.owner_id == user_id)
+    return _keyset_page(query, models.Todo.id, after_id, limit)
 
+# date 컬럼이 DATETIME이므로 동등 비교 대신 [start, end) 반열린 구간으로 조회
 def get_todos_by_date(db: Session, user_id: int, target_date: date):
-    return db.query(models.Todo).filter(models.Todo.owner_id == user_id, models.Todo.date == target_date).all()
+    return get_todos_by_range(db, user_id=user_id, start=target_date, end=target_date + timedelta(days=1))
+
+def get_todos_by_range(db: Session, user_id: int, start: date, end: date):
+    return db.query(models.Todo).options(*TODO_WITH_CATEGORIES)\
+        .filter(
+            models.Todo.owner_id == user_id,
+            models.Todo.date >= datetime.combine(start, time.min),
+            models.Todo.date < datetime.combine(end, time.min),
+        )\
+        .order_by(models.Todo.date, models.Todo.id)\
+        .all()
+
+# --- 목록 응답용 행 조회 (ORM 객체 대신 응답 dict 를 반환, serializers.RowLayout 참고) ---
+# 할일과 카테고리를 같은 조건으로 한 번씩 조회 (selectinload 와 같은 쿼리 수, IN 목록 없이 인덱스 범위 조회)
+def get_todo_rows(db: Session, *criteria, order_by=(models.Todo.date, models.Todo.id)) -> list[dict]:
+    association = models.todo_category_association
+    categories: dict[int, list[dict]] = {}
+    category_rows = db.query(association.c.todo_id, *serializers.CATEGORY.columns)\
+        .join(models.Category, models.Category.id == association.c.category_id)\
+        .join(models.Todo, models.Todo.id == association.c.todo_id)\
+        .filter(*criteria)\
+        .order_by(association.c.todo_id, models.Category.id)
+    for todo_id, *category in category_rows:
+        categories.setdefault(todo_id, []).append(serializers.CATEGORY.to_dict(category))
+    rows = db.query(models.Todo.id, *serializers.TODO.columns).filter(*criteria).order_by(*order_by)
+    return [serializers.TODO.to_dict(row[1:], categories=categories.get(row[0], [])) for row in rows]
+
+def get_todo_rows_by_range(db: Session, user_id: int, start: date, end: date) -> list[dict]:
+    return get_todo_rows(
+        db,
+        models.Todo.owner_id == user_id,
+        models.Todo.date >= datetime.combine(start, time.min),
+        models.Todo.date < datetime.combine(end, time.min),
+    )
+
+def get_todo_rows_by_date(db: Session, user_id: int, target_date: date) -> list[dict]:
+    return get_todo_rows_by_range(db, user_id=user_id, start=target_date, end=target_date + timedelta(days=1))
+
+# --- 일자별 할일 집계 (todo_day_summaries) ---
+def _as_day(value: date | datetime) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+# 해당 일자의 집계 행을 증감하고 리비전을 올림 (행이 없으면 생성, 커밋은 호출자가 수행)
+# 그날 할일 목록 응답이 바뀌는 모든 쓰기 경로에서 호출 (개수 변화가 없는 수정도 total=completed=0 으로 호출)
+# 커밋되면 사용자의 변경 스트림에도 해당 날짜를 알림
+def adjust_day_summary(db: Session, owner_id: int, day: date | datetime, total: int = 0, completed: int = 0):
+    events.todos_changed(db, owner_id, [_as_day(day)])
+    table = models.TodoDaySummary.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(table).values(owner_id=owner_id, day=_as_day(day), total=total, completed=completed, revision=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.owner_id, table.c.day],
+            set_={
+                "total": table.c.total + total,
+                "completed": table.c.completed + completed,
+                "revision": table.c.revision + 1,
+            },
+        )
+        db.execute(stmt)
+        return
+    updated = db.query(models.TodoDaySummary).filter(
+        models.TodoDaySummary.owner_id == owner_id,
+        models.TodoDaySummary.day == _as_day(day),
+    ).update({
+        models.TodoDaySummary.total: models.TodoDaySummary.total + total,
+        models.TodoDaySummary.completed: models.TodoDaySummary.completed + completed,
+        models.TodoDaySummary.revision: models.TodoDaySummary.revision + 1,
+    }, synchronize_session=False)
+    if not updated:
+        db.add(models.TodoDaySummary(owner_id=owner_id, day=_as_day(day), total=total, completed=completed, revision=1))
+
+# 카테고리 이름 변경·연결 해제처럼 여러 날짜의 할일 목록이 함께 바뀌는 경우 해당 날짜들의 리비전을 올림
+# (할일이 있는 날짜에는 항상 집계 행이 있으므로 UPDATE 만 수행)
+def bump_day_revisions(db: Session, owner_id: int, days: set[date]) -> None:
+    events.todos_changed(db, owner_id, days)
+    summary = models.TodoDaySummary
+    for chunk in _chunks(sorted(days)):
+        db.execute(
+            update(summary)
+            .where(summary.owner_id == owner_id, summary.day.in_(chunk))
+            .values(revision=summary.revision + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+def _category_days(db: Session, category_id: int) -> dict[int, set[date]]:
+    association = models.todo_category_association
+    days: dict[int, set[date]] = {}
+    rows = db.query(models.Todo.owner_id, models.Todo.date)\
+        .join(association, association.c.todo_id == models.Todo.id)\
+        .filter(association.c.category_id == category_id)\
+        .distinct()
+    for owner_id, todo_date in rows:
+        days.setdefault(owner_id, set()).add(_as_day(todo_date))
+    return days
+
+# --- 할일 목록 리비전 (ETag/If-None-Match) ---
+# 목록 응답보다 먼저 읽어야 함 (리비전을 읽은 뒤 바뀐 내용이 응답에 섞여도 다음 요청에서 다시 받게 됨)
+def get_day_revision(db: Session, user_id: int, day: date) -> int:
+    revision = db.query(models.TodoDaySummary.revision).filter(
+        models.TodoDaySummary.owner_id == user_id,
+        models.TodoDaySummary.day == day,
+    ).scalar()
+    return revision or 0
+
+def get_day_revisions(db: Session, user_id: int, start: date, end: date) -> list[tuple[date, int]]:
+    return [tuple(row) for row in db.query(models.TodoDaySummary.day, models.TodoDaySummary.revision).filter(
+        models.TodoDaySummary.owner_id == user_id,
+        models.TodoDaySummary.day >= start,
+        models.TodoDaySummary.day < end,
+    ).order_by(models.TodoDaySummary.day)]
+
+# 카테고리 목록 리비전: 카테고리 쓰기마다 찍히는 동기화 버전의 최댓값과 개수 (삭제는 개수로 반영)
+def get_category_revision(db: Session, user_id: int) -> tuple[int, int]:
+    count, version = db.query(func.count(), func.max(models.Category.version)).filter(
+        models.Category.owner_id == user_id
+    ).one()
+    return count, version or 0
+
+def get_day_summaries(db: Session, user_id: int, start: date, end: date) -> List[models.TodoDaySummary]:
+    return db.query(models.TodoDaySummary).filter(
+        models.TodoDaySummary.owner_id == user_id,
+        models.TodoDaySummary.day >= start,
+        models.TodoDaySummary.day < end,
+        models.TodoDaySummary.total > 0,
+    ).order_by(models.TodoDaySummary.day).all()
+
+# 기존 todos로부터 집계 테이블을 다시 계산 (배포 시 1회 백필 또는 복구용)
+def rebuild_day_summaries(db: Session, user_id: int | None = None) -> int:
+    summaries: dict[tuple[int, date], list[int]] = {}
+    rows = db.query(models.Todo.owner_id, models.Todo.date, models.Todo.completed)
+    summary_query = db.query(models.TodoDaySummary)
+    if user_id is not None:
+        rows = rows.filter(models.Todo.owner_id == user_id)
+        summary_query = summary_query.filter(models.TodoDaySummary.owner_id == user_id)
+    for owner_id, todo_date, completed in rows:
+        counts = summaries.setdefault((owner_id, _as_day(todo_date)), [0, 0])
+        counts[0] += 1
+        counts[1] += 1 if completed else 0
+    # 리비전은 이어서 증가시켜 클라이언트가 가진 ETag 와 겹치지 않게 함 (할일이 없어진 날짜도 행을 남김)
+    revisions = {
+        (summary.owner_id, summary.day): summary.revision
+        for summary in summary_query.with_entities(
+            models.TodoDaySummary.owner_id, models.TodoDaySummary.day, models.TodoDaySummary.revision
+        )
+    }
+    summary_query.delete(synchronize_session=False)
+    db.add_all([
+        models.TodoDaySummary(
+            owner_id=owner_id, day=day, total=total, completed=completed, revision=revisions.get((owner_id, day), 0) + 1,
+        )
+        for (owner_id, day), (total, completed) in summaries.items()
+    ])
+    db.add_all([
+        models.TodoDaySummary(owner_id=owner_id, day=day, total=0, completed=0, revision=revision + 1)
+        for (owner_id, day), revision in revisions.items() if (owner_id, day) not in summaries
+    ])
+    db.commit()
+    return len(summaries)
 
 def create_user_todo(db: Session, todo: schemas.TodoCreate, user_id: int):
     todo_data = todo.dict(exclude={'category_ids'})
@@ -34,6 +261,7 @@ def create_user_todo(db: Session, todo: schemas.TodoCreate, user_id: int):
             db_todo.categories.extend(categories)
 
     db.add(db_todo)
+    adjust_day_summary(db, user_id, db_todo.date, total=1, completed=1 if db_todo.completed else 0)
     db.commit()
     db.refresh(db_todo)
     return db_todo
@@ -41,14 +269,45 @@ def create_user_todo(db: Session, todo: schemas.TodoCreate, user_id: int):
 def get_todo(db: Session, todo_id: int):
     return db.query(models.Todo).filter(models.Todo.id == todo_id).first()
 
+# 완료 상태를 조건부 UPDATE 로 전환하고 실제로 바뀐 할일 id 를 반환
+# (같은 할일을 동시에 전환해도 한 트랜잭션에서만 반환되므로, 반환된 id 에 대해서만 보상·집계를 반영)
+def _set_completed(db: Session, owner_id: int, todo_ids, completed: bool) -> list[int]:
+    todo_ids = list(todo_ids)
+    if not todo_ids:
+        return []
+    return db.execute(
+        update(models.Todo)
+        .where(models.Todo.id.in_(todo_ids), models.Todo.owner_id == owner_id, models.Todo.completed.is_not(completed))
+        .values(completed=completed, version=changes.next_version(db, owner_id))
+        .returning(models.Todo.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+# 수정 요청에서 null 로 보낼 수 없는 필드 (null 이면 NOT NULL 위반·빈 제목이 되므로 적용하지 않음)
+REQUIRED_TODO_FIELDS = ("title", "date")
+
+def null_required_fields(todo: schemas.TodoUpdate) -> list[str]:
+    sent = todo.dict(exclude_unset=True, include=set(REQUIRED_TODO_FIELDS))
+    return [field for field, value in sent.items() if value is None]
+
 def update_todo(db: Session, todo_id: int, todo: schemas.TodoUpdate):
     db_todo = db.query(models.Todo).filter(models.Todo.id == todo_id).first()
     if not db_todo:
         return None
-    # 완료 상태 변경에 따른 당근 잔액 업데이트
-    if todo.completed is not None and db_todo.completed != todo.completed:
-        amount = 30 if todo.completed else -30
-        update_carrot_balance(db, user_id=db_todo.owner_id, amount=amount)
+    old_day = _as_day(db_todo.date)
+    update_data = todo.dict(exclude_unset=True)
+    update_data.pop('category_ids', None)
+    completed = update_data.pop('completed', None)
+    # 완료 상태 변경에 따른 당근 잔액 업데이트 (할일 수정과 같은 트랜잭션, 실제로 전환한 요청만 지급·차감)
+    carrot_changed = False
+    if completed is not None:
+        carrot_changed = bool(_set_completed(db, db_todo.owner_id, [todo_id], completed))
+        set_committed_value(db_todo, "completed", completed)
+        if carrot_changed:
+            amount = 30 if completed else -30
+            apply_carrot_delta(db, user_id=db_todo.owner_id, amount=amount, reason="todo_update", ref_id=todo_id)
+    new_completed = bool(db_todo.completed)
+    old_completed = not new_completed if carrot_changed else new_completed
 
     if todo.category_ids is not None:
         db_todo.categories.clear()
@@ -56,26 +315,231 @@ def update_todo(db: Session, todo_id: int, todo: schemas.TodoUpdate):
             categories = db.query(models.Category).filter(models.Category.id.in_(todo.category_ids)).all()
             db_todo.categories.extend(categories)
 
-    update_data = todo.dict(exclude_unset=True)
-    update_data.pop('category_ids', None)  
     for key, value in update_data.items():
         setattr(db_todo, key, value)
+    new_day = _as_day(db_todo.date)
+    if old_day != new_day:
+        adjust_day_summary(db, db_todo.owner_id, old_day, total=-1, completed=-int(old_completed))
+        adjust_day_summary(db, db_todo.owner_id, new_day, total=1, completed=int(new_completed))
+    else:
+        adjust_day_summary(db, db_todo.owner_id, new_day, completed=int(new_completed) - int(old_completed))
     db.commit()
+    if carrot_changed:
+        cache.invalidate_user(db_todo.owner_id)
     db.refresh(db_todo)
     return db_todo
 
+# 완료 상태를 조건부 UPDATE 한 번으로 전환 (동시 요청 중 하나만 성공, 성공 시 보상·집계를 같은 트랜잭션에 반영)
+# 반환값: 변경 후 당근 잔액, 이미 해당 상태였다면 None
+def set_todo_completed(db: Session, db_todo: models.Todo, completed: bool) -> int | None:
+    owner_id = db_todo.owner_id
+    if not _set_completed(db, owner_id, [db_todo.id], completed):
+        db.rollback()
+        return None
+    adjust_day_summary(db, owner_id, db_todo.date, completed=1 if completed else -1)
+    if completed:
+        balance = apply_carrot_delta(db, owner_id, 1, reason="todo_complete", ref_id=db_todo.id)
+    else:
+        # 잔액이 0이면 차감하지 않음 (기존 max(0, 잔액 - 1) 동작)
+        balance = apply_carrot_delta(db, owner_id, -1, reason="todo_uncomplete", ref_id=db_todo.id, require_funds=True)
+        if balance is None:
+            balance = 0
+    db.commit()
+    cache.invalidate_user(owner_id)
+    return balance
+
 # ID로 할일 항목 삭제 함수
 def delete_todo(db: Session, todo_id: int):
     db_todo = db.query(models.Todo).filter(models.Todo.id == todo_id).first()
     if db_todo:
+        adjust_day_summary(db, db_todo.owner_id, db_todo.date, total=-1, completed=-1 if db_todo.completed else 0)
         db.delete(db_todo)
         db.commit()
     return db_todo
 
+# 할일 생성/수정/완료/삭제를 한 트랜잭션으로 일괄 처리 (당근 잔액·일자별 집계는 배치당 1회 반영)
+def apply_todo_batch(db: Session, user_id: int, batch: schemas.TodoBatchRequest) -> tuple[list[dict], int]:
+    results: list[dict] = []
+    carrot_delta = 0
+    day_totals: Counter = Counter()
+    day_completed: Counter = Counter()
+    touched_days: set[date] = set()  # 개수 변화 없이 내용만 바뀐 날짜 (리비전만 증가)
+
+    # 대상 할일과 카테고리를 각각 한 번의 쿼리로 로드
+    todo_ids = {item.id for item in batch.update} | set(batch.complete) | set(batch.delete)
+    todos = {}
+    if todo_ids:
+        todos = {
+            todo.id: todo
+            for todo in db.query(models.Todo).options(*TODO_WITH_CATEGORIES).filter(models.Todo.id.in_(todo_ids))
+        }
+    category_ids = {cid for item in [*batch.create, *batch.update] for cid in (item.category_ids or [])}
+    categories = {}
+    if category_ids:
+        categories = {
+            category.id: category
+            for category in db.query(models.Category).filter(models.Category.id.in_(category_ids))
+        }
+
+    def owned(op: str, index: int, todo_id: int) -> models.Todo | None:
+        todo = todos.get(todo_id)
+        if todo is None or todo.owner_id != user_id:
+            results.append({"op": op, "index": index, "id": todo_id, "status": "not_found" if todo is None else "forbidden"})
+            return None
+        return todo
+
+    # complete/delete 에서 같은 id 가 다시 나오면 한 번만 처리하고 나머지는 duplicate 로 보고
+    def first_occurrence(op: str, index: int, todo_id: int, seen: set[int]) -> bool:
+        if todo_id in seen:
+            results.append({"op": op, "index": index, "id": todo_id, "status": "duplicate"})
+            return False
+        seen.add(todo_id)
+        return True
+
+    # 같은 배치에서 삭제할 할일은 수정·완료하지 않음 (삭제될 할일로 당근이 지급되지 않도록)
+    deleting = set(batch.delete)
+
+    # 완료 상태는 flush 후 조건부 UPDATE 로 한꺼번에 전환하고, 실제로 바뀐 할일에 대해서만 보상·집계를 반영
+    # (같은 할일을 완료하는 배치·요청이 동시에 와도 한쪽에서만 지급)
+    update_completed: dict[int, bool] = {}
+
+    created = []
+    for index, item in enumerate(batch.create):
+        db_todo = models.Todo(**item.dict(exclude={'category_ids'}), owner_id=user_id, completed=False)
+        db_todo.categories.extend(categories[cid] for cid in (item.category_ids or []) if cid in categories)
+        created.append((index, db_todo))
+        day_totals[_as_day(db_todo.date)] += 1
+    db.add_all(todo for _, todo in created)
+
+    for index, item in enumerate(batch.update):
+        db_todo = owned("update", index, item.id)
+        if db_todo is None:
+            continue
+        if item.id in deleting:
+            results.append({"op": "update", "index": index, "id": item.id, "status": "deleted"})
+            continue
+        if null_required_fields(item):
+            results.append({"op": "update", "index": index, "id": item.id, "status": "invalid"})
+            continue
+        old_day, was_completed = _as_day(db_todo.date), int(bool(db_todo.completed))
+        if item.completed is not None:
+            update_completed[item.id] = item.completed
+        if item.category_ids is not None:
+            db_todo.categories = [categories[cid] for cid in item.category_ids if cid in categories]
+        update_data = item.dict(exclude_unset=True, exclude={'id', 'category_ids', 'completed'})
+        for key, value in update_data.items():
+            setattr(db_todo, key, value)
+        new_day = _as_day(db_todo.date)
+        day_totals[old_day] -= 1
+        day_completed[old_day] -= was_completed
+        day_totals[new_day] += 1
+        day_completed[new_day] += was_completed
+        touched_days.update((old_day, new_day))
+        results.append({"op": "update", "index": index, "id": item.id, "status": "ok"})
+
+    completing: set[int] = set()
+    pending_completes: dict[int, dict] = {}
+    for index, todo_id in enumerate(batch.complete):
+        if not first_occurrence("complete", index, todo_id, completing):
+            continue
+        db_todo = owned("complete", index, todo_id)
+        if db_todo is None:
+            continue
+        if todo_id in deleting:
+            results.append({"op": "complete", "index": index, "id": todo_id, "status": "deleted"})
+            continue
+        # 실제 완료 여부는 아래 조건부 UPDATE 결과로 정함 (이미 완료였다면 already_completed 로 바꿈)
+        pending_completes[todo_id] = {"op": "complete", "index": index, "id": todo_id, "status": "ok"}
+        results.append(pending_completes[todo_id])
+
+    deleted_ids = []
+    removing: set[int] = set()
+    for index, todo_id in enumerate(batch.delete):
+        if not first_occurrence("delete", index, todo_id, removing):
+            continue
+        db_todo = owned("delete", index, todo_id)
+        if db_todo is None:
+            continue
+        day_totals[_as_day(db_todo.date)] -= 1
+        day_completed[_as_day(db_todo.date)] -= int(bool(db_todo.completed))
+        deleted_ids.append(todo_id)
+        results.append({"op": "delete", "index": index, "id": todo_id, "status": "ok"})
+
+    try:
+        # 생성/수정 내용을 먼저 flush 한 뒤 삭제는 집합 단위 DELETE 로 처리
+        db.flush()
+        for completed in (True, False):
+            targets = [todo_id for todo_id, value in update_completed.items() if value is completed]
+            for todo_id in _set_completed(db, user_id, targets, completed):
+                set_committed_value(todos[todo_id], "completed", completed)
+                carrot_delta += 30 if completed else -30
+                day_completed[_as_day(todos[todo_id].date)] += 1 if completed else -1
+        completed_ids = set(_set_completed(db, user_id, list(pending_completes), True))
+        for todo_id, result in pending_completes.items():
+            if todo_id in completed_ids:
+                set_committed_value(todos[todo_id], "completed", True)
+                carrot_delta += 1
+                day_completed[_as_day(todos[todo_id].date)] += 1
+            else:
+                result["status"] = "already_completed"
+        if deleted_ids:
+            db.execute(delete(models.todo_category_association).where(
+                models.todo_category_association.c.todo_id.in_(deleted_ids)
+            ))
+            db.query(models.Todo).filter(models.Todo.id.in_(deleted_ids)).delete(synchronize_session=False)
+            changes.record_deletes(db, user_id, "todos", deleted_ids)
+            for todo_id in deleted_ids:
+                db.expunge(todos[todo_id])
+        for day in set(day_totals) | set(day_completed) | touched_days:
+            adjust_day_summary(db, user_id, day, total=day_totals[day], completed=day_completed[day])
+        balance = None
+        if carrot_delta:
+            balance = apply_carrot_delta(db, user_id, carrot_delta, reason="todo_batch")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if carrot_delta:
+        cache.invalidate_user(user_id)
+
+    results = [{"op": "create", "index": index, "id": todo.id, "status": "ok"} for index, todo in created] + results
+    if balance is None:
+        balance = get_carrot_balance(db, user_id)
+    return results, balance
+
+# --- 델타 동기화 조회 ---
+# since 이후 변경된 행과 삭제 기록을 조회 (since=0 이면 전체 스냅샷)
+def get_changes_since(db: Session, user_id: int, since: int, until: int) -> dict:
+    def changed(model, owner_column, *options):
+        query = db.query(model).options(*options).filter(owner_column == user_id, model.version <= until)
+        if since > 0:
+            query = query.filter(model.version > since)
+        return query.order_by(model.version).all()
+
+    deleted: dict[str, list[int]] = {entity: [] for entity, _, _ in changes.VERSIONED_MODELS.values()}
+    if since > 0:
+        tombstones = db.query(models.SyncTombstone.entity, models.SyncTombstone.entity_id).filter(
+            models.SyncTombstone.owner_id == user_id,
+            models.SyncTombstone.version > since,
+            models.SyncTombstone.version <= until,
+        ).order_by(models.SyncTombstone.version)
+        for entity, entity_id in tombstones:
+            deleted.setdefault(entity, []).append(entity_id)
+    return {
+        "todos": changed(models.Todo, models.Todo.owner_id, *TODO_WITH_CATEGORIES),
+        "categories": changed(models.Category, models.Category.owner_id),
+        "inventory": changed(models.Inventory, models.Inventory.user_id, *INVENTORY_WITH_ITEM),
+        "deleted": deleted,
+    }
+
 # --- Category CRUD 함수 ---
 def get_categories_by_user(db: Session, user_id: int):
     return db.query(models.Category).filter(models.Category.owner_id == user_id).all()
 
+def get_category_rows(db: Session, user_id: int) -> list[dict]:
+    rows = db.query(*serializers.CATEGORY.columns).filter(models.Category.owner_id == user_id)
+    return [serializers.CATEGORY.to_dict(row) for row in rows]
+
 def create_category(db: Session, category: schemas.CategoryCreate, user_id: int):
     db_category = models.Category(**category.dict(), owner_id=user_id)
     db.add(db_category)
@@ -87,15 +551,55 @@ def update_category(db: Session, category_id: int, category: schemas.CategoryCre
     db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
     if db_category:
         db_category.text = category.text
+        # 이 카테고리가 붙은 할일 목록의 카테고리 이름이 바뀜
+        for owner_id, days in _category_days(db, category_id).items():
+            bump_day_revisions(db, owner_id, days)
         db.commit()
         db.refresh(db_category)
     return db_category
 
-def delete_category(db: Session, category_id: int):
+# 카테고리 삭제 시 연결된 할일 처리 정책: delete_todos(할일도 삭제) | unlink(연결만 해제)
+CATEGORY_DELETE_POLICIES = ("delete_todos", "unlink")
+CATEGORY_DELETE_POLICY = os.getenv("CATEGORY_DELETE_POLICY", "delete_todos")
+DELETE_CHUNK_SIZE = 500
+
+def _chunks(ids: list[int], size: int = DELETE_CHUNK_SIZE):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+# 연결된 할일을 행 단위 ORM 삭제 대신 집합 단위 DELETE/UPDATE 로 처리
+def delete_category(db: Session, category_id: int, policy: str | None = None):
     db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
     if db_category:
-        for todo in db_category.todos:
-            db.delete(todo)
+        policy = policy or CATEGORY_DELETE_POLICY
+        association = models.todo_category_association
+        linked_todo_ids = db.query(association.c.todo_id).filter(association.c.category_id == category_id)
+        if policy == "delete_todos":
+            # 일자별 집계는 (날짜, 완료 여부) 그룹 단위로 한 번에 차감
+            day_totals: Counter = Counter()
+            day_completed: Counter = Counter()
+            grouped = db.query(models.Todo.owner_id, models.Todo.date, models.Todo.completed, func.count())\
+                .filter(models.Todo.id.in_(linked_todo_ids.scalar_subquery()))\
+                .group_by(models.Todo.owner_id, models.Todo.date, models.Todo.completed)
+            for owner_id, todo_date, completed, count in grouped:
+                day_totals[(owner_id, _as_day(todo_date))] += count
+                day_completed[(owner_id, _as_day(todo_date))] += count if completed else 0
+            for owner_id, day in day_totals:
+                adjust_day_summary(db, owner_id, day, total=-day_totals[(owner_id, day)], completed=-day_completed[(owner_id, day)])
+
+            todo_ids = [todo_id for (todo_id,) in linked_todo_ids]
+            for chunk in _chunks(todo_ids):
+                db.execute(delete(association).where(association.c.todo_id.in_(chunk)))
+                db.execute(delete(models.Todo).where(models.Todo.id.in_(chunk)))
+            changes.record_deletes(db, db_category.owner_id, "todos", todo_ids)
+        else:
+            # 연결만 해제: 할일의 카테고리 목록이 바뀌므로 동기화 버전과 해당 날짜 리비전만 갱신
+            for owner_id, days in _category_days(db, category_id).items():
+                bump_day_revisions(db, owner_id, days)
+            version = changes.next_version(db, db_category.owner_id)
+            db.query(models.Todo).filter(models.Todo.id.in_(linked_todo_ids.scalar_subquery()))\
+                .update({models.Todo.version: version}, synchronize_session=False)
+            db.execute(delete(association).where(association.c.category_id == category_id))
         db.delete(db_category)
         db.commit()
     return db_category
@@ -103,7 +607,24 @@ def delete_category(db: Session, category_id: int):
 
 # 상점의 모든 물품을 조회하는 함수
 def get_all_shop_items(db: Session):
-    return db.query(models.Item).all()
+    return db.query(models.Item).order_by(models.Item.id).all()
+
+def get_shop_items_page(
+    db: Session,
+    after_id: int | None = None,
+    limit: int | None = None,
+    item_type: str | None = None,
+    min_price: int | None = None,
+    max_price: int | None = None,
+):
+    query = db.query(models.Item)
+    if item_type is not None:
+        query = query.filter(models.Item.item_type == item_type)
+    if min_price is not None:
+        query = query.filter(models.Item.price >= min_price)
+    if max_price is not None:
+        query = query.filter(models.Item.price <= max_price)
+    return _keyset_page(query, models.Item.id, after_id, limit)
 
 # 사용자 당근 잔액 조회 함수
 def get_carrot_balance(db: Session, user_id: int) -> int | None:
@@ -112,85 +633,191 @@ def get_carrot_balance(db: Session, user_id: int) -> int | None:
         return user.carrot_balance
     return None
 
-# 사용자 당근 잔액 업데이트 함수
-def update_carrot_balance(db: Session, user_id: int, amount: int) -> models.User | None:
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user:
-        db_user.carrot_balance += amount
-        if db_user.carrot_balance < 0:
-             pass 
+# 당근 잔액을 단일 UPDATE ... RETURNING 으로 증감하고 원장에 기록 (커밋은 호출자가 수행)
+# require_funds=True 이면 잔액이 부족할 때 차감하지 않고 None 반환
+def apply_carrot_delta(
+    db: Session,
+    user_id: int,
+    amount: int,
+    reason: str,
+    ref_id: int | None = None,
+    require_funds: bool = False,
+) -> int | None:
+    stmt = update(models.User).where(models.User.id == user_id)
+    if require_funds and amount < 0:
+        stmt = stmt.where(models.User.carrot_balance >= -amount)
+    stmt = stmt.values(carrot_balance=models.User.carrot_balance + amount)\
+        .returning(models.User.carrot_balance)\
+        .execution_options(synchronize_session=False)
+    balance = db.execute(stmt).scalar_one_or_none()
+    if balance is None:
+        return None
+    db.add(models.CarrotLedgerEntry(
+        user_id=user_id, amount=amount, balance_after=balance, reason=reason, ref_id=ref_id,
+    ))
+    events.balance_changed(db, user_id, balance)
+    return balance
 
-        db.commit()
-        db.refresh(db_user)
-        return db_user
-    return None
+# 사용자 당근 잔액 업데이트 함수
+def update_carrot_balance(db: Session, user_id: int, amount: int, reason: str = "adjustment") -> models.User | None:
+    balance = apply_carrot_delta(db, user_id, amount, reason=reason)
+    if balance is None:
+        return None
+    db.commit()
+    cache.invalidate_user(user_id)
+    return get_user(db, user_id)
 
 # 사용자 인벤토리 목록 조회 함수
-def get_user_inventory(db: Session, user_id: int) -> List[models.Inventory]:
-    return db.query(models.Inventory)\
-        .options(joinedload(models.Inventory.item))\
-        .filter(models.Inventory.user_id == user_id)\
-        .all()
+# (user_id, item_id) 유니크 인덱스 순서로 keyset 페이지 조회, 필터는 JOIN 한 items 컬럼에 적용
+def get_user_inventory(
+    db: Session,
+    user_id: int,
+    after_item_id: int | None = None,
+    limit: int | None = None,
+    item_type: str | None = None,
+    min_price: int | None = None,
+    max_price: int | None = None,
+    is_equipped: bool | None = None,
+) -> tuple[List[models.Inventory], int | None]:
+    query = db.query(models.Inventory)\
+        .join(models.Inventory.item)\
+        .options(contains_eager(models.Inventory.item))
+    query = _filter_inventory(query, user_id, item_type, min_price, max_price, is_equipped)
+    return _keyset_page(query, models.Inventory.item_id, after_item_id, limit)
+
+# get_user_inventory 와 같은 조건·페이지로 응답 dict 목록을 반환
+def get_user_inventory_rows(
+    db: Session,
+    user_id: int,
+    after_item_id: int | None = None,
+    limit: int | None = None,
+    item_type: str | None = None,
+    min_price: int | None = None,
+    max_price: int | None = None,
+    is_equipped: bool | None = None,
+) -> tuple[list[dict], int | None]:
+    query = db.query(models.Inventory.item_id, *serializers.INVENTORY.columns, *serializers.ITEM.columns)\
+        .join(models.Inventory.item)
+    query = _filter_inventory(query, user_id, item_type, min_price, max_price, is_equipped)
+    rows, next_cursor = _keyset_page(query, models.Inventory.item_id, after_item_id, limit)
+    split = 1 + len(serializers.INVENTORY.columns)
+    return [
+        serializers.INVENTORY.to_dict(row[1:split], item=serializers.ITEM.to_dict(row[split:])) for row in rows
+    ], next_cursor
+
+def _filter_inventory(query, user_id: int, item_type, min_price, max_price, is_equipped):
+    query = query.filter(models.Inventory.user_id == user_id)
+    if item_type is not None:
+        query = query.filter(models.Item.item_type == item_type)
+    if min_price is not None:
+        query = query.filter(models.Item.price >= min_price)
+    if max_price is not None:
+        query = query.filter(models.Item.price <= max_price)
+    if is_equipped is not None:
+        query = query.filter(models.Inventory.is_equipped == is_equipped)
+    return query
+
+# --- 장착 엔진 ---
+# 아이템 타입별 users 장착 컬럼 (그 외 타입은 inventories.is_equipped 만 관리)
+EQUIP_SLOTS = {
+    "hat": "equipped_hat_id",
+    "accessory": "equipped_acc_id",
+    "background": "equipped_background_id",
+}
+
+# item_id -> 아이템 정보 (카탈로그 캐시에 보관, items 변경 시 함께 무효화)
+def get_catalog_index(db: Session) -> dict[int, dict]:
+    index = cache.catalog_cache.get(cache.CATALOG_INDEX_KEY)
+    if index is None:
+        index = {
+            item.id: {
+                "id": item.id,
+                "name": item.name,
+                "price": item.price,
+                "image_url": item.image_url,
+                "item_type": item.item_type,
+            }
+            for item in get_all_shop_items(db)
+        }
+        cache.catalog_cache.set(cache.CATALOG_INDEX_KEY, index)
+    return index
+
+# 타입별 장착할 아이템(None 이면 해당 타입 해제)을 UPDATE 두 번으로 적용
+# 1) inventories: 대상 타입 아이템 중 장착 대상만 is_equipped=True, 나머지는 False
+# 2) users: 해당 타입의 equipped_*_id 컬럼 갱신
+# 반환값: 성공 여부 (카탈로그에 없거나, 타입이 맞지 않거나, 보유하지 않은 아이템이면 False)
+def apply_outfit(db: Session, user_id: int, outfit: dict[str, int | None]) -> bool:
+    if not outfit:
+        return True
+    catalog = get_catalog_index(db)
+    targets = {item_id for item_id in outfit.values() if item_id is not None}
+    for item_type, item_id in outfit.items():
+        if item_id is not None and (item_id not in catalog or catalog[item_id]["item_type"] != item_type):
+            return False
+    slot_item_ids = [item_id for item_id, item in catalog.items() if item["item_type"] in outfit]
+
+    changed = db.execute(
+        update(models.Inventory)
+        .where(
+            models.Inventory.user_id == user_id,
+            models.Inventory.item_id.in_(slot_item_ids),
+            or_(models.Inventory.is_equipped.is_(True), models.Inventory.item_id.in_(targets)),
+        )
+        .values(
+            is_equipped=models.Inventory.item_id.in_(targets),
+            version=changes.next_version(db, user_id),
+        )
+        .returning(models.Inventory.item_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    if not targets <= set(changed):
+        db.rollback()
+        return False
 
-def update_user_inventory(db: Session, user_id: int, item_id: int, is_equipped: bool) -> models.Inventory | None:
-    inventory_item = db.query(models.Inventory).filter(
-        models.Inventory.user_id == user_id,
-        models.Inventory.item_id == item_id
-    ).first()
+    user_columns = {EQUIP_SLOTS[item_type]: item_id for item_type, item_id in outfit.items() if item_type in EQUIP_SLOTS}
+    if user_columns:
+        db.execute(
+            update(models.User).where(models.User.id == user_id).values(**user_columns)
+            .execution_options(synchronize_session=False)
+        )
+    events.equipment_changed(db, user_id, equipped=targets, unequipped=set(changed) - targets)
+    db.commit()
+    cache.invalidate_user(user_id)
+    return True
 
-    if not inventory_item:
+def update_user_inventory(db: Session, user_id: int, item_id: int, is_equipped: bool) -> dict | None:
+    item = get_catalog_index(db).get(item_id)
+    if item is None:
         return None
 
-    # 장착하는 경우
+    # 장착하는 경우: 같은 타입의 다른 아이템 해제와 함께 적용
     if is_equipped:
-        item_to_equip = db.query(models.Item).filter(models.Item.id == item_id).first()
-        if not item_to_equip:
-            return None 
-        
-        item_type = item_to_equip.item_type
-
-        # 동일한 타입의 다른 장착된 아이템을 해제
-        currently_equipped_items = db.query(models.Inventory).join(models.Item).filter(
-            models.Inventory.user_id == user_id,
-            models.Inventory.is_equipped == True,
-            models.Item.item_type == item_type,
-            models.Inventory.item_id != item_id 
-        ).all()
-
-        for equipped_item in currently_equipped_items:
-            equipped_item.is_equipped = False
-
-        # User 모델의 equipped_id 필드 업데이트
-        user = db.query(models.User).filter(models.User.id == user_id).first()
-        if user:
-            if item_type == 'hat':
-                user.equipped_hat_id = item_id
-            elif item_type == 'accessory':
-                user.equipped_acc_id = item_id
-            elif item_type == 'background':
-                user.equipped_background_id = item_id
+        if not apply_outfit(db, user_id, {item["item_type"]: item_id}):
+            return None
+        return {"item": item, "is_equipped": True}
 
     # 장착 해제하는 경우
-    else:
-        # User 모델의 equipped_id 필드 초기화
-        user = db.query(models.User).filter(models.User.id == user_id).first()
-        if user:
-            item_to_unequip = db.query(models.Item).filter(models.Item.id == item_id).first()
-            if item_to_unequip:
-                if item_to_unequip.item_type == 'hat' and user.equipped_hat_id == item_id:
-                    user.equipped_hat_id = None
-                elif item_to_unequip.item_type == 'accessory' and user.equipped_acc_id == item_id:
-                    user.equipped_acc_id = None
-                elif item_to_unequip.item_type == 'background' and user.equipped_background_id == item_id:
-                    user.equipped_background_id = None
-
-    # 현재 아이템의 is_equipped 상태 업데이트
-    inventory_item.is_equipped = is_equipped
-    
+    updated = db.execute(
+        update(models.Inventory)
+        .where(models.Inventory.user_id == user_id, models.Inventory.item_id == item_id)
+        .values(is_equipped=False, version=changes.next_version(db, user_id))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not updated:
+        db.rollback()
+        return None
+    column = EQUIP_SLOTS.get(item["item_type"])
+    if column:
+        db.execute(
+            update(models.User)
+            .where(models.User.id == user_id, getattr(models.User, column) == item_id)
+            .values({column: None})
+            .execution_options(synchronize_session=False)
+        )
+    events.equipment_changed(db, user_id, unequipped=[item_id])
     db.commit()
-    db.refresh(inventory_item)
-    
-    return inventory_item
+    cache.invalidate_user(user_id)
+    return {"item": item, "is_equipped": False}
 
 # 상점 아이템 구매 로직 데이터 일관성 준수
 def purchase_item_transaction(
@@ -206,7 +833,7 @@ def purchase_item_transaction(
     if not user:
         return "user_not_found"
 
-    # 중복 구매 확인
+    # 중복 구매 확인 (uq_inventories_user_id_item_id 인덱스 조회)
     existing_inventory = db.query(models.Inventory).filter(
         models.Inventory.user_id == user_id,
         models.Inventory.item_id == item_id
@@ -215,14 +842,13 @@ def purchase_item_transaction(
     if existing_inventory:
         return "already_owned"
 
-    # 잔액 확인
-    if user.carrot_balance < item.price:
-        return "not_enough_balance"
-    
-    # 트랜잭션 처리
+    # 트랜잭션 처리: 잔액 확인과 차감을 조건부 UPDATE 한 번으로 수행
     try:
-        user.carrot_balance -= item.price
-        
+        balance = apply_carrot_delta(db, user_id, -item.price, reason="purchase", ref_id=item_id, require_funds=True)
+        if balance is None:
+            db.rollback()
+            return "not_enough_balance"
+
         new_inventory_item = models.Inventory(
             user_id=user_id,
             item_id=item_id,
@@ -230,11 +856,15 @@ def purchase_item_transaction(
         )
         db.add(new_inventory_item)
         db.commit()
+        cache.invalidate_user(user_id)
         db.refresh(user)
-        db.refresh(new_inventory_item)
         
         return user
 
+    except IntegrityError:
+        # 동시 구매 요청이 유니크 제약에 걸린 경우
+        db.rollback()
+        return "already_owned"
     except Exception as e:
         db.rollback()
-        return "transaction_failed"
\ No newline at end of file
+        return "transaction_failed"
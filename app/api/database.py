@@ -1,19 +1,326 @@
+import itertools
+import logging
 import os
-from sqlalchemy import create_engine
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi import Depends
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 from dotenv import load_dotenv
 
+from . import cache
+
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# --- 커넥션 풀 설정 ---
+# DB_POOLER_MODE=transaction: pgbouncer/Supabase 트랜잭션 풀러(6543 포트) 사용 시.
+#   애플리케이션 풀은 NullPool로 두고 풀링은 풀러에 맡기며, 세션 단위 설정 대신 트랜잭션마다 SET LOCAL 사용
+DB_POOLER_MODE = os.getenv("DB_POOLER_MODE", "session")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+# 워커 시작 시 미리 열어 둘 커넥션 수 (풀 크기를 넘지 않음, 0이면 사용하지 않음)
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", str(DB_POOL_SIZE)))
+
+
+class PoolStats:
+    """커넥션 체크아웃 대기 시간과 타임아웃 횟수 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += 1 if timed_out else 0
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(QueuePool):
+    """체크아웃 대기 시간을 pool_stats에 기록하는 QueuePool"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - started)
+        return connection
+
+
+def _engine_options(url: str) -> dict:
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return {}
+    options: dict = {"pool_pre_ping": DB_POOL_PRE_PING}
+    connect_args: dict = {}
+    if DB_POOLER_MODE == "transaction":
+        options["poolclass"] = NullPool
+        # 기본 드라이버(psycopg2)는 파라미터를 클라이언트에서 채워 보내므로 서버 측 prepared statement를 만들지 않아 설정할 것이 없음
+        # postgresql+psycopg:// (psycopg 3) 로 바꾼 경우에만 자동 prepare 를 끔
+        if url.get_dialect().driver == "psycopg":
+            connect_args["prepare_threshold"] = None
+    else:
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+        if DB_STATEMENT_TIMEOUT_MS:
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def _create_engine(url: str):
+    created = create_engine(url, **_engine_options(url))
+    # 트랜잭션 풀러는 접속 옵션/세션 SET을 유지하지 않으므로 트랜잭션마다 statement_timeout 지정
+    if DB_POOLER_MODE == "transaction" and DB_STATEMENT_TIMEOUT_MS and created.dialect.name == "postgresql":
+        @event.listens_for(created, "begin")
+        def _set_statement_timeout(conn):
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {DB_STATEMENT_TIMEOUT_MS}")
+    return created
+
+
+engine = _create_engine(SQLALCHEMY_DATABASE_URL)
+
+def pool_status() -> dict:
+    status = {
+        "checkouts": pool_stats.checkouts,
+        "timeouts": pool_stats.timeouts,
+        "wait_seconds_total": pool_stats.wait_seconds_total,
+        "wait_seconds_max": pool_stats.wait_seconds_max,
+    }
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return status
+
+
+# --- 읽기 전용 복제본 라우팅 ---
+# DATABASE_REPLICA_URLS: 쉼표로 구분한 복제본 URL 목록 (비어 있으면 모든 쿼리가 primary 로 감)
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# 사용자가 쓰기를 커밋한 뒤 이 시간 동안은 해당 사용자의 읽기를 primary 로 보냄 (read-your-writes)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+# 쓰기를 커밋한 응답에 마지막 쓰기 시각(epoch ms)을 쿠키와 헤더로 내려 보냄. 클라이언트가 다음 요청에 되돌려 주면
+# 다른 워커에서도 primary 로 읽음 (recent_writers 는 같은 워커에서만 유효, 워커 간 시계 차이는 유지 시간보다 충분히 작아야 함)
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+# 잔액/장착 정보 일관성, 사용자 캐시 적재, 토큰 폐기 즉시 반영을 위해 항상 primary 에서 읽는 테이블
+PRIMARY_ONLY_TABLES = {"users", "token_revocations"}
+
+replica_engines = [_create_engine(url) for url in DATABASE_REPLICA_URLS]
+_replica_cycle = itertools.cycle(range(len(replica_engines)))
+_replica_cycle_lock = threading.Lock()
+recent_writers = cache.TTLCache(maxsize=cache.USER_CACHE_MAX_SIZE, ttl=READ_YOUR_WRITES_SECONDS)
+
+
+class RoutingSession(Session):
+    """read_only 로 표시된 세션의 SELECT 만 복제본으로 보내고, 그 외에는 primary 사용"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or clause is None or not getattr(clause, "is_select", False):
+            # flush, DML, connection() 직접 사용은 모두 쓰기로 간주
+            self.info["wrote"] = True
+            return engine
+        if not self._use_replica(mapper):
+            return engine
+        # 세션 내 읽기는 한 복제본에 고정하여 같은 시점의 데이터를 보도록 함
+        if "replica" not in self.info:
+            with _replica_cycle_lock:
+                self.info["replica"] = next(_replica_cycle)
+        return replica_engines[self.info["replica"]]
+
+    def _use_replica(self, mapper) -> bool:
+        if not replica_engines or not self.info.get("read_only") or self.info.get("wrote"):
+            return False
+        if mapper is not None and mapper.local_table.name in PRIMARY_ONLY_TABLES:
+            return False
+        tracker = _write_tracker.get()
+        if tracker is not None and tracker.recently_wrote():
+            return False
+        user_id = self.info.get("user_id")
+        return user_id is None or recent_writers.get(user_id) is None
+
+
+class WriteTracker:
+    def __init__(self, last_write_at: float | None = None):
+        self.last_write_at = last_write_at  # 클라이언트가 보낸 마지막 쓰기 시각 (epoch 초)
+        self.wrote_at: float | None = None  # 이 요청에서 쓰기를 커밋한 시각
+
+    def recently_wrote(self) -> bool:
+        return self.last_write_at is not None and time.time() - self.last_write_at < READ_YOUR_WRITES_SECONDS
+
+
+_write_tracker: ContextVar[WriteTracker | None] = ContextVar("write_tracker", default=None)
+
+
+def parse_last_write(value: str | None) -> float | None:
+    """클라이언트가 보낸 마지막 쓰기 시각(epoch ms)을 초 단위로 변환 (형식 오류나 먼 미래 값은 무시)"""
+    if not value:
+        return None
+    try:
+        last_write_at = int(value) / 1000
+    except ValueError:
+        return None
+    if last_write_at > time.time() + READ_YOUR_WRITES_SECONDS:
+        return None
+    return last_write_at
+
+
+@contextmanager
+def track_writes(last_write_at: float | None = None):
+    tracker = WriteTracker(last_write_at)
+    token = _write_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _write_tracker.reset(token)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session):
+    if not session.info.pop("wrote", False):
+        return
+    tracker = _write_tracker.get()
+    if tracker is not None:
+        tracker.wrote_at = time.time()
+    if session.info.get("user_id") is not None:
+        recent_writers.set(session.info["user_id"], True)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_writes(session):
+    session.info.pop("wrote", None)
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+
+
+def _warm_engine(target, connections: int) -> int:
+    pool = target.pool
+    # NullPool/SQLite 처럼 커넥션을 유지하지 않는 풀은 접속 확인만
+    connections = min(connections, pool.size()) if isinstance(pool, QueuePool) else min(connections, 1)
+    if connections <= 0:
+        return 0
+
+    def open_connection():
+        conn = target.connect()
+        conn.exec_driver_sql("SELECT 1")
+        return conn
+
+    # 동시에 열어 두어야 서로 다른 커넥션이 풀에 쌓임 (접속·TLS 핸드셰이크도 병렬로 진행)
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        opened = list(executor.map(lambda _: open_connection(), range(connections)))
+    for conn in opened:
+        conn.close()
+    return len(opened)
+
+
+def warm_pool(connections: int = WARMUP_CONNECTIONS) -> int:
+    """primary/복제본 풀에 커넥션을 미리 열어 첫 요청이 접속 비용을 지지 않도록 하고, 연 커넥션 수를 반환"""
+    return sum(_warm_engine(target, connections) for target in (engine, *replica_engines))
 
 Base = declarative_base()
 
+# --- 요청당 SQL 문 수 제한 (개발/테스트용 N+1 감지, 0이면 비활성) ---
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "0"))
+# 이 시간(ms) 이상 걸린 SQL 문을 SLOW_QUERY_SAMPLE_RATE 비율로 샘플링해 경고 로그로 남김 (0이면 사용하지 않음)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_SAMPLE_RATE", "1.0"))
+
+class QueryBudgetExceeded(RuntimeError):
+    """한 요청에서 허용된 SQL 문 수를 초과한 경우"""
+
+class QueryCounter:
+    def __init__(self, budget: int = 0, label: str = ""):
+        self.budget = budget
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+
+_query_counter: ContextVar[QueryCounter | None] = ContextVar("query_counter", default=None)
+
+@contextmanager
+def count_queries(budget: int = 0, label: str = ""):
+    counter = QueryCounter(budget, label)
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+    counter = _query_counter.get()
+    if counter is None:
+        return
+    counter.count += 1
+    if counter.budget and counter.count > counter.budget:
+        conn.info["query_started"].pop()
+        raise QueryBudgetExceeded(
+            f"{counter.label or 'request'} exceeded query budget "
+            f"({counter.count} > {counter.budget}): {statement}"
+        )
+
+# 문 실행 시간을 요청 단위 DB 시간에 더하고, 느린 문은 샘플링해 기록 (바인드 파라미터는 남기지 않음)
+@event.listens_for(Engine, "after_cursor_execute")
+def _time_statement(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    counter = _query_counter.get()
+    if counter is not None:
+        counter.seconds += elapsed
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS and random.random() < SLOW_QUERY_SAMPLE_RATE:
+        logger.warning(
+            "slow query (%.1f ms) in %s: %s",
+            elapsed * 1000, counter.label if counter and counter.label else "-", " ".join(statement.split()),
+        )
+
+# 실행 중 오류가 난 문은 after_cursor_execute 가 호출되지 않으므로 시작 시각만 정리
+@event.listens_for(Engine, "handle_error")
+def _discard_statement_timer(context):
+    conn = context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
 # DB 세션 의존성 주입 함수
 def get_db():
     db = SessionLocal()
@@ -21,3 +328,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# 조회 전용 엔드포인트 표시용 의존성: dependencies=[Depends(read_only)]
+# 같은 요청의 get_db 세션을 공유하며, 이 세션의 SELECT 를 복제본으로 보낼 수 있게 함
+def read_only(db: Session = Depends(get_db)) -> None:
+    db.info["read_only"] = True
@@ -0,0 +1,382 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from datetime import date
+from typing import Callable, Iterable
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# --- 환경 변수 ---
+# memory: 워커 프로세스 안에서만 전달, broker: EVENTS_BROKER_ADDRESS 의 브로커를 거쳐 모든 워커에 전달
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory")
+EVENTS_BROKER_ADDRESS = os.getenv("EVENTS_BROKER_ADDRESS", "127.0.0.1:8765")
+# 연결별 대기 이벤트 수 상한 (넘치면 밀린 이벤트를 버리고 resync 하나로 대체)
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+# 사용자별 동시 스트림 수 상한 (넘으면 가장 오래된 스트림을 닫음)
+EVENTS_MAX_CONNECTIONS_PER_USER = int(os.getenv("EVENTS_MAX_CONNECTIONS_PER_USER", "5"))
+
+# 클라이언트가 놓친 이벤트가 있을 수 있으니 /sync 로 다시 맞추라는 알림
+RESYNC = {"type": "resync", "data": {}}
+
+
+# --- 커밋 후 발행 ---
+# crud 의 쓰기 경로가 트랜잭션 안에서 변경 내용을 session.info 에 모아 두면 커밋 후 한 번에 발행
+# (롤백되면 버림, 같은 트랜잭션의 같은 종류 변경은 사용자별로 하나로 합침)
+def _pending(db: Session) -> dict:
+    return db.info.setdefault("pending_events", {})
+
+
+def todos_changed(db: Session, user_id: int, days: Iterable[date]) -> None:
+    """이 날짜들의 할일 목록이 바뀜 (클라이언트는 If-None-Match 로 해당 날짜 목록을 다시 조회)"""
+    _pending(db).setdefault((user_id, "todos"), {"days": set()})["days"].update(days)
+
+
+def balance_changed(db: Session, user_id: int, balance: int) -> None:
+    _pending(db)[(user_id, "carrot_balance")] = {"balance": balance}
+
+
+def equipment_changed(db: Session, user_id: int, equipped: Iterable[int] = (), unequipped: Iterable[int] = ()) -> None:
+    data = _pending(db).setdefault((user_id, "equipment"), {"equipped": set(), "unequipped": set()})
+    equipped, unequipped = set(equipped), set(unequipped)
+    data["equipped"] = (data["equipped"] - unequipped) | equipped
+    data["unequipped"] = (data["unequipped"] - equipped) | unequipped
+
+
+def _encode(data: dict) -> dict:
+    return {
+        key: sorted(value.isoformat() if isinstance(value, date) else value for value in values)
+        if isinstance(values, set) else values
+        for key, values in data.items()
+    }
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    pending = session.info.pop("pending_events", None)
+    if not pending:
+        return
+    for (user_id, kind), data in pending.items():
+        try:
+            backend.publish({"user_id": user_id, "type": kind, "data": _encode(data)})
+        except Exception:
+            # 알림 실패로 이미 커밋된 요청이 실패하지 않도록 기록만 함 (클라이언트는 재연결 시 /sync 로 맞춤)
+            logger.warning("event publish failed user_id=%s type=%s", user_id, kind, exc_info=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop("pending_events", None)
+
+
+# --- 워커별 연결 관리 ---
+class Subscription:
+    """스트림 연결 하나의 이벤트 대기열 (이벤트 루프 스레드에서만 사용)"""
+
+    def __init__(self, user_id: int, maxsize: int = EVENTS_QUEUE_SIZE):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflows = 0
+
+    def put(self, message: dict) -> bool:
+        """대기열이 가득 찬 느린 연결은 밀린 이벤트를 버리고 resync 하나만 남김, 버렸으면 False"""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self._clear()
+            self.queue.put_nowait(RESYNC)
+            self.overflows += 1
+            return False
+
+    def close(self) -> None:
+        # None 을 받은 스트림은 종료
+        self._clear()
+        self.queue.put_nowait(None)
+
+    def _clear(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class Hub:
+    """사용자 id -> 이 워커에 연결된 스트림 목록
+
+    백엔드는 커밋한 요청 스레드나 브로커 수신 태스크에서 deliver_threadsafe 로 이벤트 루프에 넘겨 전달"""
+
+    def __init__(self, max_connections_per_user: int = EVENTS_MAX_CONNECTIONS_PER_USER):
+        self.max_connections_per_user = max_connections_per_user
+        self._subscriptions: dict[int, dict[Subscription, None]] = {}  # 연결 순서 유지
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.overflows = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop | None) -> None:
+        self._loop = loop
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id)
+        with self._lock:
+            connections = self._subscriptions.setdefault(user_id, {})
+            while len(connections) >= self.max_connections_per_user:
+                oldest = next(iter(connections))
+                del connections[oldest]
+                oldest.close()
+            connections[subscription] = None
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            connections = self._subscriptions.get(subscription.user_id)
+            if connections is None:
+                return
+            connections.pop(subscription, None)
+            if not connections:
+                del self._subscriptions[subscription.user_id]
+
+    def deliver(self, message: dict) -> None:
+        """이벤트 루프 스레드에서 호출, user_id 가 None 이면 모든 연결에 전달"""
+        user_id = message.get("user_id")
+        with self._lock:
+            if user_id is None:
+                targets = [sub for connections in self._subscriptions.values() for sub in connections]
+            else:
+                targets = list(self._subscriptions.get(user_id, ()))
+        for subscription in targets:
+            if not subscription.put(message):
+                self.overflows += 1
+        self.delivered += len(targets)
+
+    def deliver_threadsafe(self, message: dict) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        # 이 워커에 스트림이 없는 사용자의 이벤트는 루프로 넘기지 않음
+        user_id = message.get("user_id")
+        if user_id is not None and user_id not in self._subscriptions:
+            return
+        loop.call_soon_threadsafe(self.deliver, message)
+
+    def close_all(self) -> None:
+        with self._lock:
+            targets = [sub for connections in self._subscriptions.values() for sub in connections]
+            self._subscriptions.clear()
+        for subscription in targets:
+            subscription.close()
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._subscriptions),
+            "connections": sum(len(connections) for connections in list(self._subscriptions.values())),
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+
+hub = Hub()
+
+
+# --- 팬아웃 백엔드 ---
+# start(deliver) / publish(message) / stop() 을 제공하는 객체로 교체 가능
+# publish 는 커밋한 요청 스레드에서 호출되므로 막히지 않아야 함
+class MemoryBackend:
+    """워커 프로세스 안에서만 전달 (워커가 하나이거나 사용자의 기기가 같은 워커에 붙는 경우)"""
+
+    def __init__(self):
+        self._deliver: Callable[[dict], None] | None = None
+
+    async def start(self, deliver: Callable[[dict], None]) -> None:
+        self._deliver = deliver
+
+    def publish(self, message: dict) -> None:
+        if self._deliver is not None:
+            self._deliver(message)
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+
+class BrokerBackend:
+    """로컬 브로커(python -m app.api.events)를 거쳐 다른 워커에도 전달
+
+    같은 워커의 연결에는 브로커를 거치지 않고 바로 전달하며, 브로커에 연결되지 않은 동안 보낼 이벤트는 버림
+    (다시 연결되면 이 워커의 모든 스트림에 resync 를 보내 그 사이 놓친 이벤트를 /sync 로 맞추게 함)"""
+
+    def __init__(self, address: str = EVENTS_BROKER_ADDRESS, queue_size: int = EVENTS_QUEUE_SIZE * 10):
+        host, _, port = address.rpartition(":")
+        self.host, self.port = host or "127.0.0.1", int(port)
+        self.queue_size = queue_size
+        self.connected = False
+        self.dropped = 0
+        self._deliver: Callable[[dict], None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._outgoing: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self, deliver: Callable[[dict], None]) -> None:
+        self._deliver = deliver
+        self._loop = asyncio.get_running_loop()
+        self._outgoing = asyncio.Queue(self.queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    def publish(self, message: dict) -> None:
+        if self._deliver is not None:
+            self._deliver(message)
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        line = (json.dumps(message, separators=(",", ":")) + "\n").encode()
+        loop.call_soon_threadsafe(self._enqueue, line)
+
+    def _enqueue(self, line: bytes) -> None:
+        if not self.connected:
+            self.dropped += 1
+            return
+        try:
+            self._outgoing.put_nowait(line)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("event broker send queue full, dropping event")
+
+    async def _run(self) -> None:
+        delay = 0.5
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as exc:
+                logger.warning("event broker %s:%s unavailable (%s), retrying in %.1fs", self.host, self.port, exc, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+            delay = 0.5
+            self.connected = True
+            self._deliver(RESYNC)
+            sender = asyncio.create_task(self._send(writer))
+            try:
+                while line := await reader.readline():
+                    try:
+                        self._deliver(json.loads(line))
+                    except ValueError:
+                        logger.warning("invalid event from broker: %r", line[:200])
+            except (OSError, ValueError):
+                # ValueError: 스트림 버퍼 한도(64 KiB)를 넘는 줄 (연결을 끊고 다시 연결해 resync 로 맞춤)
+                pass
+            finally:
+                self.connected = False
+                sender.cancel()
+                writer.close()
+                while not self._outgoing.empty():
+                    self._outgoing.get_nowait()
+            logger.warning("event broker connection lost, reconnecting")
+
+    async def _send(self, writer: asyncio.StreamWriter) -> None:
+        while True:
+            line = await self._outgoing.get()
+            writer.write(line)
+            await writer.drain()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._loop = None
+        self._deliver = None
+
+
+def _create_backend():
+    if EVENTS_BACKEND == "broker":
+        return BrokerBackend()
+    return MemoryBackend()
+
+
+backend = _create_backend()
+
+
+def set_backend(new_backend) -> None:
+    """팬아웃 백엔드 교체 (start 전에 호출)"""
+    global backend
+    backend = new_backend
+
+
+async def start() -> None:
+    """워커 시작 시 (lifespan) 이벤트 루프에 연결하고 백엔드 시작"""
+    hub.bind(asyncio.get_running_loop())
+    await backend.start(hub.deliver_threadsafe)
+
+
+async def stop() -> None:
+    await backend.stop()
+    hub.close_all()
+    hub.bind(None)
+
+
+# --- 로컬 브로커 ---
+class Broker:
+    """워커 간 이벤트 중계: 한 워커가 보낸 줄(JSON)을 다른 모든 워커 연결에 그대로 전달
+
+    여러 uvicorn 워커를 한 호스트에서 실행할 때 쓰는 최소 구현이며, 받는 쪽 워커가 느려 대기열이 넘치면
+    밀린 이벤트를 버리고 resync 를 보냄"""
+
+    def __init__(self, queue_size: int = EVENTS_QUEUE_SIZE * 10):
+        self.queue_size = queue_size
+        self._peers: dict[asyncio.StreamWriter, asyncio.Queue] = {}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._peers[writer] = queue
+        sender = asyncio.create_task(self._send(writer, queue))
+        logger.info("worker connected (%d)", len(self._peers))
+        try:
+            while line := await reader.readline():
+                for peer, peer_queue in self._peers.items():
+                    if peer is not writer:
+                        self._put(peer_queue, line)
+        except (OSError, ValueError):
+            # ValueError: 스트림 버퍼 한도를 넘는 줄을 보낸 워커는 연결을 끊음 (워커가 다시 연결하며 resync)
+            pass
+        finally:
+            del self._peers[writer]
+            sender.cancel()
+            writer.close()
+            logger.info("worker disconnected (%d)", len(self._peers))
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, line: bytes) -> None:
+        try:
+            queue.put_nowait(line)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait((json.dumps(RESYNC) + "\n").encode())
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, queue: asyncio.Queue) -> None:
+        while True:
+            line = await queue.get()
+            writer.write(line)
+            await writer.drain()
+
+    async def serve(self, address: str = EVENTS_BROKER_ADDRESS) -> None:
+        host, _, port = address.rpartition(":")
+        server = await asyncio.start_server(self.handle, host or "127.0.0.1", int(port))
+        logger.info("event broker listening on %s", address)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+    asyncio.run(Broker().serve())
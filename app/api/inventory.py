@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
-from .database import get_db
-from . import crud, models, schemas
+from .database import get_db, read_only
+from . import crud, models, schemas, serializers
 from .auth import get_current_user
 
 router = APIRouter()
@@ -11,13 +11,30 @@ class InventoryUpdate(schemas.BaseModel):
     item_id: int
     is_equipped: bool
 
-@router.get("/api/inventory", response_model=List[schemas.Inventory])
+# limit 지정 시 keyset 페이지 조회, 다음 페이지 커서(item_id)는 X-Next-Cursor 헤더로 전달
+@router.get("/api/inventory", response_model=List[schemas.Inventory], dependencies=[Depends(read_only)])
 def read_user_inventory(
+    cursor: int | None = None,
+    limit: int | None = Query(None, ge=1, le=crud.MAX_PAGE_SIZE),
+    item_type: str | None = None,
+    min_price: int | None = None,
+    max_price: int | None = None,
+    equipped: bool | None = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    inventory_items = crud.get_user_inventory(db, user_id=current_user.id)
-    return inventory_items
+    inventory_items, next_cursor = crud.get_user_inventory_rows(
+        db,
+        user_id=current_user.id,
+        after_item_id=cursor,
+        limit=limit,
+        item_type=item_type,
+        min_price=min_price,
+        max_price=max_price,
+        is_equipped=equipped,
+    )
+    headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else None
+    return serializers.json_response(serializers.INVENTORY_LIST, inventory_items, headers=headers)
 
 @router.put("/api/inventory/{item_id}/equip", response_model=schemas.Inventory)
 def update_inventory_item_status(
@@ -42,3 +59,14 @@ def update_inventory_item_status(
     if not updated_item:
         raise HTTPException(status_code=404, detail="인벤토리 아이템을 찾을 수 없거나 업데이트에 실패했습니다.")
     return updated_item
+
+# --- 코디 일괄 적용 API (모자/액세서리/배경을 한 번에 장착) ---
+@router.put("/api/inventory/outfit", response_model=schemas.UserSummary)
+def apply_outfit(
+    outfit: schemas.Outfit,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    if not crud.apply_outfit(db, user_id=current_user.id, outfit=outfit.model_dump(exclude_unset=True)):
+        raise HTTPException(status_code=404, detail="인벤토리 아이템을 찾을 수 없거나 업데이트에 실패했습니다.")
+    return current_user
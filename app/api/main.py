@@ -1,11 +1,27 @@
-from fastapi import FastAPI
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from . import models
-from .database import engine
+from fastapi.responses import JSONResponse, PlainTextResponse
+from . import crud, database, events, observability, ratelimit
+from .database import QUERY_BUDGET, SessionLocal, count_queries, engine, warm_pool
 
-models.Base.metadata.create_all(bind=engine)
+observability.setup_logging()
+logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# 스키마는 배포 시 마이그레이션으로 관리 (alembic upgrade head), 워커는 import 시 DB에 접속하지 않음
+# 변경 스트림(/events)의 팬아웃 백엔드는 워커의 이벤트 루프에서 시작·종료
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(warm_up)
+    await events.start()
+    yield
+    await events.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://10.0.2.2:8080",
@@ -14,14 +30,80 @@ origins = [
     "http://127.0.0.1:8000",
 ]
 
+# 라우트별 IP 한도 초과 요청은 라우팅·본문 파싱·DB 접근 전에 429로 거절
+# (계정별 로그인 한도는 auth.py 의 라우트 의존성에서 확인)
+@app.middleware("http")
+async def rate_limit(request: Request, call_next):
+    rejected = ratelimit.check_ip(request)
+    if rejected is not None:
+        return rejected
+    return await call_next(request)
+
+# 요청 지연·SQL 문 수·DB 시간을 라우트 템플릿별로 집계 (/metrics 로 노출)
+# QUERY_BUDGET 설정 시(개발/테스트) 요청당 SQL 문 수가 이를 넘으면 예외 발생 (N+1 회귀 감지)
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    with count_queries(QUERY_BUDGET, f"{request.method} {request.url.path}") as counter:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            route = request.scope.get("route")
+            observability.observe_request(
+                request.method, route.path if route is not None else "unmatched", status,
+                time.perf_counter() - started, counter.count, counter.seconds,
+            )
+    return response
+
+# 복제본 사용 시 read-your-writes: 요청의 마지막 쓰기 시각(쿠키 또는 X-Last-Write 헤더)을 세션 라우팅에 전달하고,
+# 쓰기를 커밋한 응답에는 새 시각을 내려 보냄 (다른 워커가 처리하는 다음 요청도 primary 에서 읽도록)
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    if not database.replica_engines:
+        return await call_next(request)
+    last_write = request.cookies.get(database.LAST_WRITE_COOKIE) or request.headers.get(database.LAST_WRITE_HEADER)
+    with database.track_writes(database.parse_last_write(last_write)) as tracker:
+        response = await call_next(request)
+    if tracker.wrote_at is not None:
+        value = str(int(tracker.wrote_at * 1000))
+        response.headers[database.LAST_WRITE_HEADER] = value
+        response.set_cookie(
+            database.LAST_WRITE_COOKIE, value,
+            max_age=math.ceil(database.READ_YOUR_WRITES_SECONDS), httponly=True, samesite="lax",
+        )
+    return response
+
+# CORS 는 마지막에 등록하여 가장 바깥 미들웨어로 둠 (429 등 다른 미들웨어가 만든 응답에도 CORS 헤더를 붙임)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 브라우저 클라이언트가 페이지 커서, 조건부 요청용 ETag, 한도 초과 시 Retry-After 를 읽을 수 있도록 노출
+    expose_headers=["X-Next-Cursor", "ETag", "Retry-After", database.LAST_WRITE_HEADER],
 )
 
+# 로드밸런서/오케스트레이터용 헬스 체크: DB 접속 가능 여부
+@app.get("/healthz", include_in_schema=False)
+def healthz():
+    try:
+        with engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1")
+    except Exception:
+        logger.exception("health check failed")
+        return JSONResponse({"status": "unavailable"}, status_code=503)
+    return {"status": "ok"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    # 라우트·풀 상태가 드러나므로 허용한 주소에서만 응답하고, 그 외에는 엔드포인트가 없는 것처럼 404
+    if not observability.metrics_allowed(ratelimit.client_ip(request)):
+        return JSONResponse({"detail": "Not Found"}, status_code=404)
+    return PlainTextResponse(observability.render_metrics(), media_type="text/plain; version=0.0.4")
+
 # 인증 
 from .auth import router as auth_router
 app.include_router(auth_router)
@@ -31,9 +113,31 @@ from .todos import router as todos_router
 app.include_router(todos_router)
 
 # MyPage 
-from .mypage_shop import router as mypage_router
+from .mypage_shop import load_shop_catalog, router as mypage_router
 app.include_router(mypage_router)
 
 # inventory 
 from .inventory import router as inventory_router
 app.include_router(inventory_router)
+
+# 델타 동기화
+from .sync import router as sync_router
+app.include_router(sync_router)
+
+# 변경 스트림 (SSE)
+from .stream import router as stream_router
+app.include_router(stream_router)
+
+# 워커 시작 시 풀 커넥션을 미리 열고 상점 카탈로그 캐시를 채움
+# DB에 접속할 수 없어도 워커는 시작하며, 첫 요청에서 다시 접속을 시도함
+def warm_up() -> None:
+    started = time.perf_counter()
+    try:
+        connections = warm_pool()
+        with SessionLocal() as db:
+            load_shop_catalog(db)
+            crud.get_catalog_index(db)
+    except Exception:
+        logger.exception("startup warm-up failed")
+        return
+    logger.info("startup warm-up finished in %.0f ms (%d connections)", (time.perf_counter() - started) * 1000, connections)
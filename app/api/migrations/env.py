@@ -0,0 +1,55 @@
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app.api import models
+from app.api.database import SQLALCHEMY_DATABASE_URL
+
+config = context.config
+target_metadata = models.Base.metadata
+
+if config.config_file_name is not None:
+    from logging.config import fileConfig
+
+    fileConfig(config.config_file_name)
+
+
+# 특정 DB 전용 객체(info["dialect"], 예: PostgreSQL 검색 인덱스)는 다른 DB에서 autogenerate 비교 대상에서 제외
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    dialect = obj.info.get("dialect") if hasattr(obj, "info") else None
+    return dialect is None or dialect == context.get_context().dialect.name
+
+
+def run_migrations_offline() -> None:
+    # alembic upgrade head --sql: 접속 없이 SQL 스크립트만 출력
+    context.configure(
+        url=SQLALCHEMY_DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # 마이그레이션은 세션 단위 커넥션이 필요하므로 트랜잭션 풀러(6543)가 아닌 직접/세션 풀러 접속을 사용
+    connectable = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+    with connectable.connect() as connection:
+        # SQLite 는 ALTER TABLE 이 제한적이므로 batch 모드(테이블 재생성)로 제약 조건 변경
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_object=include_object,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,108 @@
+"""baseline schema (create_all 로 만들어지던 초기 테이블)
+
+기존 DB: alembic stamp 0001_baseline 후 alembic upgrade head
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "items",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("price", sa.Integer(), nullable=False),
+        sa.Column("item_type", sa.String(), nullable=False),
+        sa.Column("image_url", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_items_id", "items", ["id"])
+    op.create_index("ix_items_name", "items", ["name"])
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("password", sa.String(), nullable=True),
+        sa.Column("carrot_balance", sa.Integer(), nullable=False),
+        sa.Column("equipped_hat_id", sa.Integer(), nullable=True),
+        sa.Column("equipped_acc_id", sa.Integer(), nullable=True),
+        sa.Column("equipped_background_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["equipped_hat_id"], ["items.id"]),
+        sa.ForeignKeyConstraint(["equipped_acc_id"], ["items.id"]),
+        sa.ForeignKeyConstraint(["equipped_background_id"], ["items.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "todos",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("completed", sa.Boolean(), nullable=True),
+        sa.Column("owner_id", sa.Integer(), nullable=True),
+        sa.Column("date", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_todos_id", "todos", ["id"])
+    op.create_index("ix_todos_title", "todos", ["title"])
+    op.create_index("ix_todos_date", "todos", ["date"])
+
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("text", sa.String(), nullable=True),
+        sa.Column("owner_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_categories_id", "categories", ["id"])
+    op.create_index("ix_categories_text", "categories", ["text"])
+
+    op.create_table(
+        "todo_category_association",
+        sa.Column("todo_id", sa.Integer(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["todo_id"], ["todos.id"]),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.PrimaryKeyConstraint("todo_id", "category_id"),
+    )
+
+    op.create_table(
+        "inventories",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("item_id", sa.Integer(), nullable=True),
+        sa.Column("is_equipped", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["item_id"], ["items.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_inventories_id", "inventories", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("inventories")
+    op.drop_table("todo_category_association")
+    op.drop_table("categories")
+    op.drop_table("todos")
+    op.drop_table("users")
+    op.drop_table("items")
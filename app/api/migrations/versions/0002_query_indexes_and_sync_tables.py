@@ -0,0 +1,184 @@
+"""query indexes, sync versions, day summaries and carrot ledger
+
+create_all 은 기존 테이블에 컬럼/인덱스를 추가하지 못하므로 그동안 모델에만 반영된 변경을 적용.
+이전 배포의 create_all 로 새 테이블만 먼저 생긴 DB도 있으므로 이미 있는 객체는 건너뜀.
+PostgreSQL 에서는 기존 테이블의 인덱스를 CONCURRENTLY 로 만들어 쓰기를 막지 않음.
+
+Revision ID: 0002_query_indexes_and_sync_tables
+Revises: 0001_baseline
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_query_indexes_and_sync_tables"
+down_revision: Union[str, Sequence[str], None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (인덱스 이름, 테이블, 컬럼)
+INDEXES = (
+    ("ix_todos_owner_id_date", "todos", ["owner_id", "date"]),
+    ("ix_todos_owner_id_version", "todos", ["owner_id", "version"]),
+    ("ix_categories_owner_id_version", "categories", ["owner_id", "version"]),
+    ("ix_items_item_type", "items", ["item_type"]),
+    ("ix_inventories_user_id_version", "inventories", ["user_id", "version"]),
+)
+VERSIONED_TABLES = ("todos", "categories", "inventories")
+INVENTORY_UNIQUE = "uq_inventories_user_id_item_id"
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+# --sql(오프라인) 모드에서는 DB를 조회할 수 없으므로 0001_baseline 상태라고 가정
+def _offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _has_table(table: str) -> bool:
+    if _offline():
+        return False
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def _has_column(table: str, column: str) -> bool:
+    if _offline():
+        return False
+    return any(col["name"] == column for col in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def _has_index(table: str, name: str) -> bool:
+    if _offline():
+        return False
+    inspector = sa.inspect(op.get_bind())
+    return any(index["name"] == name for index in inspector.get_indexes(table)) or any(
+        constraint["name"] == name for constraint in inspector.get_unique_constraints(table)
+    )
+
+
+def _create_index(name: str, table: str, columns: list[str], unique: bool = False) -> None:
+    if _has_index(table, name):
+        return
+    if _is_postgresql():
+        # CONCURRENTLY 는 트랜잭션 밖에서만 실행 가능
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True)
+    else:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def _backfill_day_summaries() -> None:
+    todos = sa.table(
+        "todos", sa.column("owner_id", sa.Integer), sa.column("date", sa.DateTime), sa.column("completed", sa.Boolean),
+    )
+    summaries = sa.table(
+        "todo_day_summaries",
+        sa.column("owner_id", sa.Integer), sa.column("day", sa.Date),
+        sa.column("total", sa.Integer), sa.column("completed", sa.Integer),
+    )
+    # SQLite 의 CAST(... AS DATE)는 숫자로 변환되므로 date() 함수 사용
+    day = sa.func.date(todos.c.date) if op.get_context().dialect.name == "sqlite" else sa.cast(todos.c.date, sa.Date)
+    op.execute(summaries.insert().from_select(
+        ["owner_id", "day", "total", "completed"],
+        sa.select(
+            todos.c.owner_id, day, sa.func.count(),
+            sa.func.sum(sa.case((todos.c.completed == sa.true(), 1), else_=0)),
+        ).where(todos.c.owner_id.is_not(None)).group_by(todos.c.owner_id, day),
+    ))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in VERSIONED_TABLES:
+        if not _has_column(table, "version"):
+            op.add_column(table, sa.Column("version", sa.Integer(), nullable=False, server_default="0"))
+
+    if not _has_table("todo_day_summaries"):
+        op.create_table(
+            "todo_day_summaries",
+            sa.Column("owner_id", sa.Integer(), nullable=False),
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("total", sa.Integer(), nullable=False),
+            sa.Column("completed", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("owner_id", "day"),
+        )
+        _backfill_day_summaries()
+
+    if not _has_table("sync_cursors"):
+        op.create_table(
+            "sync_cursors",
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("user_id"),
+        )
+
+    if not _has_table("sync_tombstones"):
+        op.create_table(
+            "sync_tombstones",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("owner_id", sa.Integer(), nullable=False),
+            sa.Column("entity", sa.String(), nullable=False),
+            sa.Column("entity_id", sa.Integer(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_sync_tombstones_owner_id_version", "sync_tombstones", ["owner_id", "version"])
+
+    if not _has_table("carrot_ledger"):
+        op.create_table(
+            "carrot_ledger",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("amount", sa.Integer(), nullable=False),
+            sa.Column("balance_after", sa.Integer(), nullable=False),
+            sa.Column("reason", sa.String(), nullable=False),
+            sa.Column("ref_id", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_carrot_ledger_user_id", "carrot_ledger", ["user_id"])
+
+    for name, table, columns in INDEXES:
+        _create_index(name, table, columns)
+
+    if not _has_index("inventories", INVENTORY_UNIQUE):
+        # 중복 구매로 생긴 같은 (user_id, item_id) 행은 가장 먼저 생성된 행만 남김
+        op.execute(
+            "DELETE FROM inventories WHERE id NOT IN "
+            "(SELECT MIN(id) FROM inventories GROUP BY user_id, item_id)"
+        )
+        if _is_postgresql():
+            # 고유 인덱스를 먼저 CONCURRENTLY 로 만든 뒤 제약 조건으로 승격 (긴 잠금 없이)
+            _create_index(INVENTORY_UNIQUE, "inventories", ["user_id", "item_id"], unique=True)
+            op.execute(
+                f"ALTER TABLE inventories ADD CONSTRAINT {INVENTORY_UNIQUE} UNIQUE USING INDEX {INVENTORY_UNIQUE}"
+            )
+        else:
+            with op.batch_alter_table("inventories") as batch_op:
+                batch_op.create_unique_constraint(INVENTORY_UNIQUE, ["user_id", "item_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("inventories") as batch_op:
+        batch_op.drop_constraint(INVENTORY_UNIQUE, type_="unique")
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_table("carrot_ledger")
+    op.drop_table("sync_tombstones")
+    op.drop_table("sync_cursors")
+    op.drop_table("todo_day_summaries")
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("version")
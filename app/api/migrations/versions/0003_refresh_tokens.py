@@ -0,0 +1,82 @@
+"""refresh tokens, token revocations and users.token_version
+
+액세스 토큰에 사용자 id 와 토큰 버전을 담고, 리프레시 토큰(해시)과 토큰 폐기 기록을 저장.
+token_version 은 상수 기본값이 있는 컬럼 추가라 PostgreSQL 11 이상에서는 테이블을 다시 쓰지 않음.
+
+Revision ID: 0003_refresh_tokens
+Revises: 0002_query_indexes_and_sync_tables
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_refresh_tokens"
+down_revision: Union[str, Sequence[str], None] = "0002_query_indexes_and_sync_tables"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# --sql(오프라인) 모드에서는 DB를 조회할 수 없으므로 0002 상태라고 가정
+def _offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _has_table(table: str) -> bool:
+    if _offline():
+        return False
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def _has_column(table: str, column: str) -> bool:
+    if _offline():
+        return False
+    return any(col["name"] == column for col in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_column("users", "token_version"):
+        op.add_column("users", sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"))
+
+    if not _has_table("refresh_tokens"):
+        op.create_table(
+            "refresh_tokens",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("family_id", sa.String(), nullable=False),
+            sa.Column("token_hash", sa.String(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("revoked_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("token_hash"),
+        )
+        op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+        op.create_index("ix_refresh_tokens_family_id", "refresh_tokens", ["family_id"])
+
+    if not _has_table("token_revocations"):
+        op.create_table(
+            "token_revocations",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("family_id", sa.String(), nullable=True),
+            sa.Column("min_version", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_token_revocations_created_at", "token_revocations", ["created_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("token_revocations")
+    op.drop_table("refresh_tokens")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
@@ -0,0 +1,44 @@
+"""todo_day_summaries.revision
+
+날짜별 할일 목록 응답이 바뀌는 쓰기마다 증가하는 리비전 (GET /todos/, /todos/range/ 의 ETag).
+상수 기본값이 있는 컬럼 추가라 PostgreSQL 11 이상에서는 테이블을 다시 쓰지 않음.
+
+Revision ID: 0004_todo_day_revisions
+Revises: 0003_refresh_tokens
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_todo_day_revisions"
+down_revision: Union[str, Sequence[str], None] = "0003_refresh_tokens"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# --sql(오프라인) 모드에서는 DB를 조회할 수 없으므로 0003 상태라고 가정
+def _offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _has_column(table: str, column: str) -> bool:
+    if _offline():
+        return False
+    return any(col["name"] == column for col in sa.inspect(op.get_bind()).get_columns(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_column("todo_day_summaries", "revision"):
+        op.add_column("todo_day_summaries", sa.Column("revision", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("todo_day_summaries") as batch_op:
+        batch_op.drop_column("revision")
@@ -0,0 +1,67 @@
+"""todo title / category text search indexes
+
+GET /todos/search 용 GIN 인덱스 (PostgreSQL 전용, SQLite 는 프로세스 내 역색인으로 검색하므로 변경 없음).
+접두어 일치는 'simple' 설정 tsvector 식 인덱스, 부분 문자열(ILIKE '%x%')은 pg_trgm 트라이그램 인덱스로 처리.
+pg_trgm 은 PostgreSQL 13 이상에서 DB 소유자가 설치할 수 있는 확장이며, 인덱스는 CONCURRENTLY 로 만들어 쓰기를 막지 않음.
+
+Revision ID: 0005_todo_search_indexes
+Revises: 0004_todo_day_revisions
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_todo_search_indexes"
+down_revision: Union[str, Sequence[str], None] = "0004_todo_day_revisions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (테이블, 컬럼): 컬럼마다 tsvector 식 인덱스와 트라이그램 인덱스
+SEARCH_COLUMNS = (("todos", "title"), ("categories", "text"))
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+# --sql(오프라인) 모드에서는 DB를 조회할 수 없으므로 0004 상태라고 가정
+def _offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _has_index(table: str, name: str) -> bool:
+    if _offline():
+        return False
+    return any(index["name"] == name for index in sa.inspect(op.get_bind()).get_indexes(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _is_postgresql():
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in SEARCH_COLUMNS:
+        indexes = (
+            (f"ix_{table}_{column}_tsv", [sa.text(f"to_tsvector('simple'::regconfig, coalesce({column}, ''))")], {}),
+            (f"ix_{table}_{column}_trgm", [column], {"postgresql_ops": {column: "gin_trgm_ops"}}),
+        )
+        for name, columns, options in indexes:
+            if _has_index(table, name):
+                continue
+            # CONCURRENTLY 는 트랜잭션 밖에서만 실행 가능
+            with op.get_context().autocommit_block():
+                op.create_index(name, table, columns, postgresql_using="gin", postgresql_concurrently=True, **options)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _is_postgresql():
+        return
+    for table, column in SEARCH_COLUMNS:
+        for name in (f"ix_{table}_{column}_tsv", f"ix_{table}_{column}_trgm"):
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -1,7 +1,26 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Time, DATETIME, Table
+from datetime import datetime, timezone
+from sqlalchemy import DDL, Boolean, Column, Date, ForeignKey, Index, Integer, String, Time, DATETIME, Table, UniqueConstraint, event, text
 from sqlalchemy.orm import relationship
 from .database import Base
 
+# --- 검색 인덱스 (PostgreSQL 전용, search.py 참고) ---
+# 접두어 일치는 'simple' 설정 tsvector 의 GIN 인덱스로, 부분 문자열(ILIKE '%x%')은 pg_trgm 트라이그램 인덱스로 처리
+# (검색 쿼리의 식이 인덱스 식과 같아야 인덱스를 사용하므로 search.py 는 search_vector() 로 같은 식을 만듦)
+def search_vector(column: str) -> str:
+    return f"to_tsvector('simple'::regconfig, coalesce({column}, ''))"
+
+# info["dialect"]: 마이그레이션 autogenerate 가 다른 DB에서는 비교하지 않음 (migrations/env.py)
+def _search_indexes(table: str, column: str) -> tuple[Index, Index]:
+    options = {"postgresql_using": "gin", "info": {"dialect": "postgresql"}}
+    return (
+        Index(f"ix_{table}_{column}_tsv", text(search_vector(column)), **options).ddl_if(dialect="postgresql"),
+        Index(
+            f"ix_{table}_{column}_trgm", column, postgresql_ops={column: "gin_trgm_ops"}, **options,
+        ).ddl_if(dialect="postgresql"),
+    )
+
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+
 class User(Base):
     __tablename__ = "users"
 
@@ -15,6 +34,8 @@ class User(Base):
     equipped_hat_id = Column(Integer, ForeignKey("items.id"), nullable=True)
     equipped_acc_id = Column(Integer, ForeignKey("items.id"), nullable=True)
     equipped_background_id = Column(Integer, ForeignKey("items.id"), nullable=True)
+    # 액세스 토큰에 함께 담기는 버전 (증가시키면 이전에 발급한 액세스 토큰이 모두 무효화)
+    token_version = Column(Integer, default=0, nullable=False)
 
     # 인벤토리와 관계 설정 (역참조)
     inventory = relationship("Inventory", back_populates="owner")
@@ -28,12 +49,19 @@ todo_category_association = Table(
 
 class Todo(Base):
     __tablename__ = "todos"
+    # 사용자별 날짜 범위 조회(캘린더)를 인덱스 범위 스캔 한 번으로 처리
+    __table_args__ = (
+        Index("ix_todos_owner_id_date", "owner_id", "date"),
+        Index("ix_todos_owner_id_version", "owner_id", "version"),
+        *_search_indexes("todos", "title"),
+    )
 
     id = Column(Integer, primary_key=True, index=True) 
     title = Column(String, index=True) 
     completed = Column(Boolean, default=False) 
     owner_id = Column(Integer, ForeignKey("users.id")) 
     date = Column(DATETIME, index=True, nullable=False) 
+    version = Column(Integer, default=0, nullable=False) # 델타 동기화용 변경 버전
 
     owner = relationship("User", back_populates="todos") 
     categories = relationship(
@@ -42,12 +70,28 @@ class Todo(Base):
         back_populates="todos"
     )
 
+class TodoDaySummary(Base):
+    """사용자별·일자별 할일 개수와 완료 개수 (캘린더 히트맵용, 할일 쓰기 경로에서 증분 갱신)"""
+    __tablename__ = "todo_day_summaries"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    total = Column(Integer, default=0, nullable=False)
+    completed = Column(Integer, default=0, nullable=False)
+    # 이 날짜의 할일 목록 응답이 바뀌는 쓰기마다 증가 (GET /todos/ 의 ETag)
+    revision = Column(Integer, default=0, nullable=False)
+
 class Category(Base):
     __tablename__ = "categories"
+    __table_args__ = (
+        Index("ix_categories_owner_id_version", "owner_id", "version"),
+        *_search_indexes("categories", "text"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     text = Column(String, index=True)
     owner_id = Column(Integer, ForeignKey("users.id"))
+    version = Column(Integer, default=0, nullable=False)
 
     owner = relationship("User")
     todos = relationship("Todo", secondary=todo_category_association, back_populates="categories")
@@ -59,7 +103,7 @@ class Item(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     price = Column(Integer, nullable=False) 
-    item_type = Column(String, nullable=False) 
+    item_type = Column(String, nullable=False, index=True) 
     image_url = Column(String) 
     
     # 이 물품을 소유한 인벤토리 목록 역참조
@@ -68,6 +112,11 @@ class Item(Base):
 class Inventory(Base):
     """사용자가 소유한 물품 목록 및 장착 여부를 저장"""
     __tablename__ = "inventories"
+    __table_args__ = (
+        # 사용자당 아이템 1개 (중복 구매 확인 및 인벤토리 keyset 페이지 조회에 사용)
+        UniqueConstraint("user_id", "item_id", name="uq_inventories_user_id_item_id"),
+        Index("ix_inventories_user_id_version", "user_id", "version"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -76,7 +125,62 @@ class Inventory(Base):
     item_id = Column(Integer, ForeignKey("items.id"))
     
     is_equipped = Column(Boolean, default=False) # 현재 장착 여부
+    version = Column(Integer, default=0, nullable=False)
     
     # 관계 설정
     owner = relationship("User", back_populates="inventory")
-    item = relationship("Item", back_populates="owners")
\ No newline at end of file
+    item = relationship("Item", back_populates="owners")
+
+class SyncCursor(Base):
+    """사용자별 변경 버전 카운터 (todos/categories/inventories 쓰기마다 증가)"""
+    __tablename__ = "sync_cursors"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
+class SyncTombstone(Base):
+    """삭제된 행 기록 (델타 동기화 시 클라이언트에 삭제 전달)"""
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_owner_id_version", "owner_id", "version"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entity = Column(String, nullable=False) # todos | categories | inventory
+    entity_id = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False)
+
+class CarrotLedgerEntry(Base):
+    """당근 잔액 변동 이력 (추가 전용, 감사 및 재계산용)"""
+    __tablename__ = "carrot_ledger"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    amount = Column(Integer, nullable=False) # 증감량 (차감은 음수)
+    balance_after = Column(Integer, nullable=False)
+    reason = Column(String, nullable=False) # todo_complete | todo_uncomplete | todo_update | todo_batch | purchase | adjustment
+    ref_id = Column(Integer, nullable=True) # 관련 할일/아이템 id
+    created_at = Column(DATETIME, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+
+class RefreshToken(Base):
+    """로그인 세션의 리프레시 토큰 (원문 대신 SHA-256 해시만 저장, 사용할 때마다 새 토큰으로 교체)"""
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    family_id = Column(String, index=True, nullable=False) # 로그인 1회로 시작된 교체 체인 (액세스 토큰의 sid)
+    token_hash = Column(String, unique=True, nullable=False)
+    expires_at = Column(DATETIME, nullable=False)
+    created_at = Column(DATETIME, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), nullable=False)
+    revoked_at = Column(DATETIME, nullable=True)
+
+class TokenRevocation(Base):
+    """액세스 토큰 폐기 기록 (각 프로세스의 폐기 목록이 id 순으로 증분 적재)"""
+    __tablename__ = "token_revocations"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    family_id = Column(String, nullable=True) # 세션 하나만 폐기 (로그아웃, 리프레시 토큰 재사용 감지)
+    min_version = Column(Integer, nullable=True) # 이 버전 미만의 토큰 전체 폐기 (모든 기기에서 로그아웃)
+    created_at = Column(DATETIME, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), index=True, nullable=False)
@@ -1,39 +1,67 @@
-from typing import Any, Dict, List
+import json
+import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
-from . import crud, models, schemas
+from . import cache, crud, models, schemas
 from .auth import get_current_user
-from .database import get_db
+from .database import get_db, read_only
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 class CarrotUpdate(schemas.BaseModel):
     amount: int  
 
-@router.get("/shop/items")
+def _shop_item_dict(item: models.Item) -> dict:
+    return {
+        "name": item.name,
+        "price": item.price,
+        "image_url": item.image_url,
+        "item_id": item.id, 
+        "type": item.item_type 
+    }
+
+# 상점 카탈로그 (ETag, 직렬화된 JSON 본문): 캐시에 없으면 DB에서 읽어 캐시에 적재 (워커 시작 시 warm-up 에서도 호출)
+def load_shop_catalog(db: Session) -> tuple[str, bytes]:
+    catalog = cache.catalog_cache.get(cache.CATALOG_KEY)
+    if catalog is None:
+        result = [_shop_item_dict(item) for item in crud.get_all_shop_items(db)]
+        body = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        catalog = (cache.make_etag(body), body)
+        cache.catalog_cache.set(cache.CATALOG_KEY, catalog)
+    return catalog
+
+@router.get("/shop/items", dependencies=[Depends(read_only)])
 def read_shop_items(
+    request: Request,
+    cursor: int | None = None,
+    limit: int | None = Query(None, ge=1, le=crud.MAX_PAGE_SIZE),
+    item_type: str | None = None,
+    min_price: int | None = None,
+    max_price: int | None = None,
     db: Session = Depends(get_db),
-) -> List[Dict[str, Any]]:
-   
+) -> Response:
+    # 페이지/필터 조회: keyset 조회, 다음 페이지 커서(item_id)는 X-Next-Cursor 헤더로 전달
+    if any(param is not None for param in (cursor, limit, item_type, min_price, max_price)):
+        items, next_cursor = crud.get_shop_items_page(
+            db, after_id=cursor, limit=limit, item_type=item_type, min_price=min_price, max_price=max_price,
+        )
+        headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else {}
+        return JSONResponse([_shop_item_dict(item) for item in items], headers=headers)
+
+    # 전체 카탈로그: 직렬화된 본문을 캐시에서 바로 응답 (캐시 적중 시 DB 조회·직렬화 없음)
     try:
-        items = crud.get_all_shop_items(db)
-        result = []
-        for item in items:
-            result.append({
-                "name": item.name,
-                "price": item.price,
-                "image_url": item.image_url,
-                "item_id": item.id, 
-                "type": item.item_type 
-            })
-        
-        return result
-        
-    except Exception as e:
-        print(f"상점 물품 조회 중 오류 발생: {e}")
+        etag, body = load_shop_catalog(db)
+    except Exception:
+        logger.exception("상점 물품 조회 중 오류 발생")
         raise HTTPException(status_code=500, detail="아이템 목록을 불러오는 데 실패했습니다.")
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if cache.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
     
 @router.get("/shop/balance/", response_model=int)
 def read_user_carrot_balance(
@@ -51,15 +79,16 @@ def update_user_carrot_balance(
         return current_user.carrot_balance
     raise HTTPException(status_code=404, detail="사용자 잔액 정보를 찾을 수 없습니다.")
     
-@router.post("/shop/purchase/", response_model=schemas.User)
+@router.post("/shop/purchase/", response_model=schemas.UserExpanded, response_model_exclude_unset=True)
 def purchase_item(
     item_id: int,
+    expand: str | None = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ): 
     
     # 구매 트랜잭션 처리
-    updated_user = crud.purchase_item_transaction(db, current_user.id, item_id)
+    result = crud.purchase_item_transaction(db, current_user.id, item_id)
     
     # 문자열 에러 코드 처리
     if isinstance(result, str):
@@ -74,5 +103,5 @@ def purchase_item(
         else:
             raise HTTPException(status_code=500, detail="구매 처리 중 오류가 발생했습니다.")
             
-    # 성공 시 (User 객체 반환)
-    return result
\ No newline at end of file
+    # 성공 시 (User 객체 반환, 요청한 관계는 관계별 쿼리로 로드)
+    return schemas.UserExpanded.from_user(crud.get_user_expanded(db, result.id, expand), expand)
\ No newline at end of file
@@ -0,0 +1,146 @@
+import atexit
+import ipaddress
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from bisect import bisect_left
+
+from dotenv import load_dotenv
+
+from .database import pool_status
+from .events import hub as event_hub
+from .security import hash_pool
+
+load_dotenv()
+
+# --- 환경 변수 ---
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# /metrics 를 조회할 수 있는 클라이언트 주소·대역 (쉼표 구분, 기본은 같은 호스트의 수집기만, 비우면 /metrics 를 끔)
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1")
+
+# 요청 지연/DB 시간(초)과 요청당 SQL 문 수 히스토그램 구간
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+_log_listener: logging.handlers.QueueListener | None = None
+
+
+def _parse_networks(value: str) -> list:
+    return [ipaddress.ip_network(item.strip(), strict=False) for item in value.split(",") if item.strip()]
+
+
+METRICS_ALLOWED_NETWORKS = _parse_networks(METRICS_ALLOWED_IPS)
+
+
+def metrics_allowed(host: str) -> bool:
+    """클라이언트 주소가 METRICS_ALLOWED_IPS 에 속하는지 (IP가 아닌 주소는 거부)"""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in METRICS_ALLOWED_NETWORKS)
+
+
+def setup_logging() -> None:
+    """루트 로거를 LOG_LEVEL로 설정하고, 출력은 QueueListener 스레드에서 처리하도록 구성
+
+    요청 처리 스레드는 큐에 레코드를 넣기만 하므로 stderr 쓰기에 막히지 않음
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _log_listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+class Histogram:
+    """레이블별 누적 구간 카운트를 갖는 Prometheus 형식 히스토그램"""
+
+    def __init__(self, name: str, documentation: str, buckets: tuple, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = labelnames
+        # 레이블 값 -> [구간별 카운트..., +Inf 카운트], 합계
+        self._series: dict[tuple, tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(counts), total[0]) for labels, (counts, total) in sorted(self._series.items())]
+        for labels, counts, total in snapshot:
+            base = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            prefix = base + "," if base else ""
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            suffix = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_latency = Histogram(
+    "http_request_duration_seconds", "Request latency by route template.",
+    LATENCY_BUCKETS, ("method", "route", "status"),
+)
+request_db_seconds = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request.",
+    LATENCY_BUCKETS, ("method", "route"),
+)
+request_statements = Histogram(
+    "http_request_db_statements", "SQL statements executed per request.",
+    STATEMENT_BUCKETS, ("method", "route"),
+)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float, db_statements: int, db_seconds: float) -> None:
+    request_latency.observe((method, route, str(status)), seconds)
+    request_db_seconds.observe((method, route), db_seconds)
+    request_statements.observe((method, route), db_statements)
+
+
+def _gauges(prefix: str, values: dict) -> list[str]:
+    lines = []
+    for key, value in values.items():
+        name = f"{prefix}_{key}"
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {float(value)}")
+    return lines
+
+
+def render_metrics() -> str:
+    """/metrics 응답 본문 (Prometheus text exposition format)"""
+    lines = []
+    for histogram in (request_latency, request_db_seconds, request_statements):
+        lines.extend(histogram.render())
+    lines.extend(_gauges("db_pool", pool_status()))
+    lines.extend(_gauges("password_hash_pool", hash_pool.stats()))
+    lines.extend(_gauges("event_stream", event_hub.stats()))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,200 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from fastapi.security import OAuth2PasswordRequestForm
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# --- 환경 변수 ---
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+# memory: 워커 프로세스별 버킷, redis: 모든 워커가 RATE_LIMIT_REDIS_URL 의 버킷을 공유 (requirements.txt 의 redis 패키지)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# 프록시 뒤에서 실행할 때만 true (X-Forwarded-For 의 첫 주소를 클라이언트 IP로 사용)
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() in ("1", "true", "yes")
+
+
+class Limit:
+    """토큰 버킷 한도: period 초 동안 count 회 (버스트 최대 count 회, 이후 period/count 초마다 1회 회복)"""
+
+    def __init__(self, count: int, period: float):
+        self.count = count
+        self.period = period
+        self.rate = count / period
+
+    @classmethod
+    def parse(cls, spec: str) -> "Limit":
+        count, _, period = spec.partition("/")
+        return cls(int(count), float(period or 1))
+
+    def __repr__(self) -> str:
+        return f"Limit({self.count}/{self.period:g}s)"
+
+
+# 라우트별 한도: "METHOD 경로" -> {"ip": 한도, "account": 한도}
+# ip 한도는 미들웨어에서 라우팅·본문 파싱 전에, account 한도는 라우트 의존성에서 DB 조회 전에 확인
+DEFAULT_ROUTE_LIMITS = {
+    "POST /login/": {"ip": "20/60", "account": "5/60"},
+    "POST /signup/": {"ip": "5/600"},
+}
+
+
+def _load_route_limits() -> dict[str, dict[str, Limit]]:
+    # RATE_LIMIT_ROUTES='{"POST /login/": {"ip": "10/60"}}' 처럼 라우트 단위로 덮어쓰기/추가
+    configured = {route: dict(limits) for route, limits in DEFAULT_ROUTE_LIMITS.items()}
+    for route, limits in json.loads(os.getenv("RATE_LIMIT_ROUTES", "{}")).items():
+        configured.setdefault(route, {}).update(limits)
+    return {
+        route: {scope: Limit.parse(spec) for scope, spec in limits.items() if spec}
+        for route, limits in configured.items()
+    }
+
+
+ROUTE_LIMITS = _load_route_limits()
+
+
+class MemoryBackend:
+    """프로세스 로컬 토큰 버킷 (키 수 제한, 오래 쓰지 않은 키부터 제거)"""
+
+    def __init__(self, maxsize: int = RATE_LIMIT_MAX_KEYS):
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: Limit, cost: int = 1) -> float:
+        """토큰을 소비할 수 있으면 0, 없으면 다시 시도할 수 있을 때까지의 초를 반환"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (limit.count, now))
+            tokens = min(limit.count, tokens + (now - updated) * limit.rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / limit.rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+# 버킷 갱신을 Redis 안에서 원자적으로 수행 (시각도 Redis 서버 기준이라 워커 간 시계 차이 영향 없음)
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBackend:
+    """여러 워커가 공유하는 토큰 버킷. client 는 eval(script, numkeys, *keys_and_args)를 제공하는 객체
+    (redis.Redis 또는 테스트용 대체 구현)"""
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    def take(self, key: str, limit: Limit, cost: int = 1) -> float:
+        try:
+            wait = self.client.eval(_TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, limit.count, limit.rate, cost)
+        except Exception:
+            # 저장소 장애로 로그인/가입 전체가 막히지 않도록 허용 (해시 풀 대기열 제한이 최종 방어선)
+            logger.warning("rate limit store unavailable, allowing request", exc_info=True)
+            return 0.0
+        return float(wait)
+
+
+def _create_backend():
+    if RATE_LIMIT_BACKEND == "redis":
+        import redis
+
+        return RedisBackend(redis.Redis.from_url(RATE_LIMIT_REDIS_URL))
+    return MemoryBackend()
+
+
+backend = _create_backend()
+
+
+def set_backend(new_backend) -> None:
+    """버킷 저장소 교체 (테스트에서 공유 저장소 대체 구현을 주입할 때 사용)"""
+    global backend
+    backend = new_backend
+
+
+def _retry_after(wait: float) -> str:
+    return str(max(1, math.ceil(wait)))
+
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def check_ip(request: Request) -> JSONResponse | None:
+    """미들웨어용: 요청 라우트에 IP 한도가 있고 초과했으면 429 응답을 반환"""
+    if not RATE_LIMIT_ENABLED:
+        return None
+    route = f"{request.method} {request.url.path}"
+    limit = ROUTE_LIMITS.get(route, {}).get("ip")
+    if limit is None:
+        return None
+    wait = backend.take(f"ip:{route}:{client_ip(request)}", limit)
+    if not wait:
+        return None
+    return JSONResponse(
+        {"detail": "Too many requests, try again later"},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": _retry_after(wait)},
+    )
+
+
+def limit_login_account(request: Request, form_data: OAuth2PasswordRequestForm = Depends()) -> None:
+    """로그인 라우트 의존성: 계정(username)별 시도 횟수 제한 (DB 조회·bcrypt 검증 전에 실행)"""
+    if not RATE_LIMIT_ENABLED:
+        return
+    route = f"{request.method} {request.url.path}"
+    limit = ROUTE_LIMITS.get(route, {}).get("account")
+    if limit is None:
+        return
+    wait = backend.take(f"account:{route}:{form_data.username.strip().lower()}", limit)
+    if wait:
+        logger.info("login throttled for username=%s", form_data.username)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": _retry_after(wait)},
+        )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import time, date
 
 # --- Category Schemas ---
@@ -37,6 +37,34 @@ class Todo(TodoBase):
     class Config:
         from_attributes = True
 
+# --- Todo 일괄 처리 Schemas ---
+class TodoBatchUpdate(TodoUpdate):
+    id: int
+
+class TodoBatchRequest(BaseModel):
+    create: List[TodoCreate] = []
+    update: List[TodoBatchUpdate] = []
+    complete: List[int] = []
+    delete: List[int] = []
+
+class TodoBatchItemResult(BaseModel):
+    op: str  # create | update | complete | delete
+    index: int  # 요청 배열 내 위치
+    id: Optional[int] = None
+    status: str  # ok | not_found | forbidden | already_completed | duplicate | deleted(같은 배치에서 삭제되어 적용하지 않음) | invalid(제목·날짜를 null 로 보냄)
+
+class TodoBatchResponse(BaseModel):
+    results: List[TodoBatchItemResult]
+    carrot_balance: int
+
+class TodoDaySummary(BaseModel):
+    day: date
+    total: int
+    completed: int
+
+    class Config:
+        from_attributes = True
+
 # --- Item & Inventory Schemas ---
 class ItemBase(BaseModel):
     name: str
@@ -68,6 +96,12 @@ class Inventory(BaseModel):
     class Config:
         from_attributes = True
 
+class Outfit(BaseModel):
+    # 생략한 타입은 그대로, null 이면 해당 타입 장착 해제
+    hat: Optional[int] = None
+    accessory: Optional[int] = None
+    background: Optional[int] = None
+
 # --- User Schemas ---
 class UserBase(BaseModel):
     email: EmailStr
@@ -80,25 +114,65 @@ class UserCreate(UserBase):
         description="비밀번호는 8자 이상, 72자 이하여야 합니다."
     )
 
-class User(UserBase):
+class UserSummary(UserBase):
+    # 잔액/장착 정보만 담은 경량 응답 (todos, inventory 관계를 로드하지 않음)
     id: int
-    todos: List[Todo] = []
     carrot_balance: int 
     equipped_hat_id: Optional[int] = None
     equipped_acc_id: Optional[int] = None
-
-    inventory: List[Inventory] = []
+    equipped_background_id: Optional[int] = None
 
     class Config:
         from_attributes = True 
 
+class User(UserSummary):
+    todos: List[Todo] = []
+    inventory: List[Inventory] = []
+
+USER_EXPAND_FIELDS = ("todos", "inventory")
+
+# ?expand=todos,inventory 값에서 지원하는 관계 이름만 USER_EXPAND_FIELDS 순서로 반환
+def expand_fields(expand: str | None) -> list[str]:
+    requested = {field.strip() for field in (expand or "").split(",") if field.strip()}
+    return [field for field in USER_EXPAND_FIELDS if field in requested]
+
+class UserExpanded(UserSummary):
+    # ?expand=todos,inventory 로 요청한 관계만 포함 (response_model_exclude_unset=True 와 함께 사용)
+    # 관계는 crud.get_user_expanded 로 미리 로드한 user 를 넘겨야 행마다 lazy load 가 일어나지 않음
+    todos: Optional[List[Todo]] = None
+    inventory: Optional[List[Inventory]] = None
+
+    @classmethod
+    def from_user(cls, user, expand: str | None = None) -> "UserExpanded":
+        data = UserSummary.model_validate(user).model_dump()
+        for field in expand_fields(expand):
+            data[field] = getattr(user, field)
+        return cls(**data)
+
+# --- Sync Schemas ---
+class SyncResponse(BaseModel):
+    cursor: int  # 다음 요청의 since 값으로 사용
+    reset: bool = False  # True 이면 since 가 서버 커서보다 앞서 전체 스냅샷을 반환함 (로컬 상태를 버리고 이 응답으로 교체)
+    todos: List[Todo]
+    categories: List[Category]
+    inventory: List[Inventory]
+    deleted: Dict[str, List[int]]  # todos/categories: 행 id, inventory: item_id
+
 # --- Token Schemas ---
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str # 액세스 토큰 만료 시 POST /token/refresh/ 로 교체 (한 번만 사용 가능)
+    expires_in: int # 액세스 토큰 유효 시간(초)
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 class TokenData(BaseModel):
-    email: str | None = None
+    # 액세스 토큰 클레임: sub(사용자 id), ver(토큰 버전), sid(세션 id)
+    user_id: int
+    version: int
+    session_id: str | None = None
 
 class PurchaseRequest(BaseModel):
     item_id: int
\ No newline at end of file
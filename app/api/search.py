@@ -0,0 +1,268 @@
+import os
+import re
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+
+from dotenv import load_dotenv
+from sqlalchemy import Numeric, and_, cast, exists, func, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from . import cache, changes, crud, models
+
+load_dotenv()
+
+# --- 환경 변수 ---
+# 검색 인덱스가 없는 DB(SQLite)용 프로세스 내 역색인: 보관할 최대 사용자 수와 유지 시간
+SEARCH_INDEX_MAX_USERS = int(os.getenv("SEARCH_INDEX_MAX_USERS", "1000"))
+SEARCH_INDEX_TTL_SECONDS = float(os.getenv("SEARCH_INDEX_TTL_SECONDS", "600"))
+
+DEFAULT_LIMIT = 20
+MAX_QUERY_TERMS = 8
+# 트라이그램은 3글자부터 인덱스를 쓸 수 있으므로 더 짧은 검색어는 단어 접두어로만 찾음
+MIN_SUBSTRING_LENGTH = 3
+SCORE_PLACES = 6
+
+# 역색인 점수 (검색어 단어마다 가장 높은 하나, 제목 전체에 검색어가 포함되면 가산)
+TITLE_EXACT, TITLE_PREFIX, CATEGORY_EXACT, CATEGORY_PREFIX, SUBSTRING_BONUS = 100, 60, 30, 20, 50
+
+
+class InvalidCursor(ValueError):
+    """검색 커서 형식이 잘못된 경우"""
+
+
+# PostgreSQL 'simple' 파서처럼 밑줄·기호를 구분자로 보고 소문자 단어로 분리 (한글 포함)
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(value: str | None) -> list[str]:
+    return _WORD.findall((value or "").lower())
+
+
+def _trigrams(value: str) -> set[str]:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+# --- 커서 (점수, id) ---
+# 관련도 내림차순 → id 내림차순 keyset, 점수는 소수 SCORE_PLACES 자리로 고정하여 페이지 사이에 같은 값으로 비교
+def encode_cursor(score: Decimal | int, todo_id: int) -> str:
+    return f"{Decimal(score):.{SCORE_PLACES}f}:{todo_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[Decimal, int]:
+    score, _, todo_id = cursor.partition(":")
+    try:
+        score, todo_id = Decimal(score), int(todo_id)
+    except (InvalidOperation, ValueError):
+        raise InvalidCursor(cursor)
+    # NaN/sNaN/Infinity 도 Decimal 로는 만들어지지만, 순서 비교에서 InvalidOperation(500)이 나거나 keyset 조건이 무의미하므로 거절
+    if not score.is_finite():
+        raise InvalidCursor(cursor)
+    return score, todo_id
+
+
+def _after(score: Decimal, todo_id: int, cursor: tuple[Decimal, int] | None) -> bool:
+    return cursor is None or score < cursor[0] or (score == cursor[0] and todo_id < cursor[1])
+
+
+# --- 프로세스 내 역색인 (SQLite) ---
+class TodoSearchIndex:
+    """한 사용자의 할일 제목·카테고리 이름 역색인
+
+    단어 -> 할일 id (정렬된 단어 목록에서 이분 탐색으로 접두어 일치), 제목 트라이그램 -> 할일 id (부분 문자열 후보).
+    만들 때의 사용자 동기화 버전과 함께 보관하고, 할일·카테고리 쓰기로 버전이 바뀌면 다시 만듦"""
+
+    def __init__(self, version: int, todos, links):
+        self.version = version
+        self._titles: dict[int, str] = {}
+        self._dates: dict[int, date] = {}
+        self._categories: dict[int, set[int]] = {}
+        self._title_words: dict[str, set[int]] = {}
+        self._category_words: dict[str, set[int]] = {}
+        self._trigrams: dict[str, set[int]] = {}
+        for todo_id, title, todo_date in todos:
+            title = (title or "").lower()
+            self._titles[todo_id] = title
+            self._dates[todo_id] = todo_date.date() if isinstance(todo_date, datetime) else todo_date
+            self._categories[todo_id] = set()
+            for word in tokenize(title):
+                self._title_words.setdefault(word, set()).add(todo_id)
+            for trigram in _trigrams(title):
+                self._trigrams.setdefault(trigram, set()).add(todo_id)
+        for todo_id, category_id, text in links:
+            self._categories[todo_id].add(category_id)
+            for word in tokenize(text):
+                self._category_words.setdefault(word, set()).add(todo_id)
+        self._sorted_title_words = sorted(self._title_words)
+        self._sorted_category_words = sorted(self._category_words)
+
+    @staticmethod
+    def _prefixed(words: list[str], postings: dict[str, set[int]], term: str) -> set[int]:
+        matched: set[int] = set()
+        for index in range(bisect_left(words, term), len(words)):
+            if not words[index].startswith(term):
+                break
+            matched |= postings[words[index]]
+        return matched
+
+    def _term_scores(self, term: str) -> dict[int, int]:
+        scores: dict[int, int] = {}
+        for points, todo_ids in (
+            (CATEGORY_PREFIX, self._prefixed(self._sorted_category_words, self._category_words, term)),
+            (CATEGORY_EXACT, self._category_words.get(term, ())),
+            (TITLE_PREFIX, self._prefixed(self._sorted_title_words, self._title_words, term)),
+            (TITLE_EXACT, self._title_words.get(term, ())),
+        ):
+            for todo_id in todo_ids:
+                scores[todo_id] = points
+        return scores
+
+    def _substring(self, query: str) -> set[int]:
+        candidates = None
+        for trigram in _trigrams(query):
+            postings = self._trigrams.get(trigram)
+            if not postings:
+                return set()
+            candidates = set(postings) if candidates is None else candidates & postings
+        return {todo_id for todo_id in candidates or () if query in self._titles[todo_id]}
+
+    def search(self, terms: list[str], query: str, category_id: int | None = None,
+               start: date | None = None, end: date | None = None) -> list[tuple[int, int]]:
+        """(점수, 할일 id) 를 관련도 내림차순 → id 내림차순으로 반환"""
+        totals: dict[int, int] | None = None
+        for term in terms:
+            scores = self._term_scores(term)
+            # 모든 검색어 단어가 제목이나 카테고리 이름에 있어야 일치
+            totals = scores if totals is None else {
+                todo_id: total + scores[todo_id] for todo_id, total in totals.items() if todo_id in scores
+            }
+        totals = totals or {}
+        if len(query) >= MIN_SUBSTRING_LENGTH:
+            for todo_id in self._substring(query):
+                totals[todo_id] = totals.get(todo_id, 0) + SUBSTRING_BONUS
+        results = [
+            (score, todo_id) for todo_id, score in totals.items()
+            if (category_id is None or category_id in self._categories[todo_id])
+            and (start is None or self._dates[todo_id] >= start)
+            and (end is None or self._dates[todo_id] <= end)
+        ]
+        results.sort(reverse=True)
+        return results
+
+
+search_index_cache = cache.TTLCache(maxsize=SEARCH_INDEX_MAX_USERS, ttl=SEARCH_INDEX_TTL_SECONDS)
+
+
+def get_search_index(db: Session, user_id: int) -> TodoSearchIndex:
+    # 버전을 행보다 먼저 읽으므로 만드는 중에 커밋된 쓰기가 있으면 다음 검색에서 다시 만듦
+    version = changes.current_version(db, user_id)
+    index = search_index_cache.get(user_id)
+    if index is not None and index.version == version:
+        return index
+    association = models.todo_category_association
+    todos = db.query(models.Todo.id, models.Todo.title, models.Todo.date).filter(models.Todo.owner_id == user_id)
+    links = db.query(association.c.todo_id, models.Category.id, models.Category.text)\
+        .join(models.Category, models.Category.id == association.c.category_id)\
+        .join(models.Todo, models.Todo.id == association.c.todo_id)\
+        .filter(models.Todo.owner_id == user_id)
+    index = TodoSearchIndex(version, todos.all(), links.all())
+    search_index_cache.set(user_id, index)
+    return index
+
+
+def _search_in_process(db: Session, user_id: int, terms: list[str], query: str, category_id, start, end,
+                       after: tuple[Decimal, int] | None, limit: int) -> list[tuple[Decimal, int]]:
+    page = []
+    for score, todo_id in get_search_index(db, user_id).search(terms, query, category_id, start, end):
+        score = Decimal(score)
+        if _after(score, todo_id, after):
+            page.append((score, todo_id))
+            if len(page) > limit:
+                break
+    return page
+
+
+# --- PostgreSQL (GIN tsvector / pg_trgm 인덱스, models.search_vector 와 같은 식을 사용) ---
+_SIMPLE = literal_column("'simple'::regconfig")
+
+
+def _vector(column):
+    return func.to_tsvector(_SIMPLE, func.coalesce(column, literal_column("''")))
+
+
+def _prefix_query(terms: list[str]):
+    # 단어는 tokenize 결과(문자·숫자만)이므로 tsquery 구문 문자가 섞이지 않음
+    return func.to_tsquery(_SIMPLE, " & ".join(f"{term}:*" for term in terms))
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_postgresql(db: Session, user_id: int, terms: list[str], query: str, category_id, start, end,
+                       after: tuple[Decimal, int] | None, limit: int) -> list[tuple[Decimal, int]]:
+    association = models.todo_category_association
+    title_vector = _vector(models.Todo.title)
+    conditions = []
+    for term in terms:
+        term_query = _prefix_query([term])
+        in_category = exists(
+            select(1)
+            .select_from(association.join(models.Category, models.Category.id == association.c.category_id))
+            .where(association.c.todo_id == models.Todo.id, _vector(models.Category.text).op("@@")(term_query))
+        )
+        conditions.append(or_(title_vector.op("@@")(term_query), in_category))
+    matched = and_(*conditions) if conditions else None
+    if len(query) >= MIN_SUBSTRING_LENGTH:
+        substring = models.Todo.title.ilike(f"%{_escape_like(query)}%", escape="\\")
+        matched = substring if matched is None else or_(matched, substring)
+    rank = func.similarity(func.coalesce(models.Todo.title, ""), query)
+    if terms:
+        rank = rank + func.ts_rank(title_vector, _prefix_query(terms))
+    score = func.round(cast(rank, Numeric), SCORE_PLACES)
+
+    search = db.query(score, models.Todo.id).filter(models.Todo.owner_id == user_id, matched)
+    if category_id is not None:
+        search = search.filter(models.Todo.id.in_(
+            select(association.c.todo_id).where(association.c.category_id == category_id)
+        ))
+    if start is not None:
+        search = search.filter(models.Todo.date >= datetime.combine(start, time.min))
+    if end is not None:
+        search = search.filter(models.Todo.date < datetime.combine(end + timedelta(days=1), time.min))
+    if after is not None:
+        search = search.filter(or_(score < after[0], and_(score == after[0], models.Todo.id < after[1])))
+    return [tuple(row) for row in search.order_by(score.desc(), models.Todo.id.desc()).limit(limit + 1)]
+
+
+def search_todos(
+    db: Session,
+    user_id: int,
+    q: str,
+    category_id: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_LIMIT,
+) -> tuple[list[dict], str | None]:
+    """제목·카테고리 이름에서 검색어 단어(접두어 일치)를 모두 포함하거나 제목에 검색어가 들어 있는 할일을
+    관련도순으로 한 페이지 조회, 다음 페이지가 있으면 커서를 함께 반환"""
+    after = decode_cursor(cursor) if cursor else None
+    query = q.strip().lower()
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms and len(query) < MIN_SUBSTRING_LENGTH:
+        return [], None
+    if db.get_bind().dialect.name == "postgresql":
+        page = _search_postgresql(db, user_id, terms, query, category_id, start, end, after, limit)
+    else:
+        page = _search_in_process(db, user_id, terms, query, category_id, start, end, after, limit)
+    next_cursor = encode_cursor(*page[limit - 1]) if len(page) > limit else None
+    page = page[:limit]
+    if not page:
+        return [], None
+    rows = {
+        row["id"]: row
+        for row in crud.get_todo_rows(db, models.Todo.owner_id == user_id, models.Todo.id.in_([i for _, i in page]))
+    }
+    # 페이지 조회 후 삭제된 할일은 건너뜀
+    return [rows[todo_id] for _, todo_id in page if todo_id in rows], next_cursor
@@ -1,4 +1,9 @@
+import hashlib
 import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from jose import JWTError, jwt
@@ -10,15 +15,94 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 # 시크릿 키 유효 기간 30분
+# 리프레시 토큰 유효 기간 (사용할 때마다 새 토큰으로 교체되며 기간도 다시 시작)
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
 
 # --- 비밀번호 해싱 ---
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min_rounds/max_rounds를 함께 지정하여 비용 파라미터가 BCRYPT_ROUNDS 와 다른(낮거나 높은) 기존 해시가 needs_update 대상이 됨
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+class HashPoolBusy(Exception):
+    """해싱 대기열이 가득 차 요청을 받을 수 없는 경우"""
+
+class PasswordHashPool:
+    """bcrypt 연산 전용 고정 크기 스레드풀 (대기열 상한 초과 시 즉시 거절)"""
+
+    def __init__(self, workers: int, queue_limit: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._lock = threading.Lock()
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.queued = 0
+        self.in_flight = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashPoolBusy()
+        enqueued_at = time.monotonic()
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+
+        def task():
+            waited = time.monotonic() - enqueued_at
+            with self._lock:
+                self.queued -= 1
+                self.in_flight += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                    self.completed += 1
+                self._slots.release()
+
+        return self._executor.submit(task).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "queued": self.queued,
+                "in_flight": self.in_flight,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+hash_pool = PasswordHashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return hash_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+# 검증 성공 시 현재 비용 파라미터와 다른 해시라면 새 해시를 함께 반환 (아니면 None)
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return hash_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hash_pool.run(pwd_context.hash, password)
 
 # --- JWT 생성 ---
 def create_access_token(data: dict) -> str:
@@ -27,3 +111,11 @@ def create_access_token(data: dict) -> str:
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+# --- 리프레시 토큰 ---
+# 256비트 난수라 대입 공격이 불가능하므로 bcrypt 대신 SHA-256 해시로 저장·조회
+def create_refresh_token() -> str:
+    return secrets.token_urlsafe(32)
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,81 @@
+from datetime import date
+from typing import Any, Iterable
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import DateTime
+
+from . import models, schemas
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 미리 만들어 둔 TypeAdapter 로 직렬화
+    orjson = None
+
+# 목록 응답 빠른 경로: ORM 객체와 from_attributes 검증 대신 컬럼 튜플을 응답 dict 로 바로 변환하여 직렬화
+# (response_model 은 OpenAPI 문서용으로 유지, 응답 본문은 response_model 을 거친 결과와 바이트 단위로 동일)
+
+
+def _as_date(value):
+    return value.date()
+
+
+class RowLayout:
+    """응답 스키마 필드 -> 모델 컬럼 매핑
+
+    import 시 한 번 만들면서 별칭(alias)까지 포함해 모든 필드에 대응하는 컬럼이 있는지 검증하고,
+    요청마다에는 같은 순서로 조회한 행 튜플을 응답 키(FastAPI 기본값인 by_alias)의 dict 로만 변환"""
+
+    def __init__(self, schema: type[BaseModel], model: type, nested: Iterable[str] = ()):
+        nested = set(nested)
+        self.schema = schema
+        self.columns = []
+        self._fields: list[tuple[str, str | None, Any]] = []  # (응답 키, 중첩 필드 이름, 값 변환 함수)
+        for name, field in schema.model_fields.items():
+            key = field.alias or name
+            if name in nested:
+                self._fields.append((key, name, None))
+                continue
+            column = model.__table__.columns.get(key)
+            if column is None:
+                raise TypeError(f"{schema.__name__}.{name}: {model.__name__} has no column {key!r}")
+            # DATETIME 컬럼을 date 필드로 응답하는 경우 (할일 날짜)
+            convert = _as_date if field.annotation is date and isinstance(column.type, DateTime) else None
+            self.columns.append(getattr(model, column.key))
+            self._fields.append((key, None, convert))
+        missing = nested - {name for _, name, _ in self._fields if name}
+        if missing:
+            raise TypeError(f"{schema.__name__} has no fields {sorted(missing)}")
+
+    def to_dict(self, row, **nested) -> dict:
+        values = iter(row)
+        result = {}
+        for key, nested_name, convert in self._fields:
+            if nested_name is not None:
+                result[key] = nested[nested_name]
+                continue
+            value = next(values)
+            result[key] = convert(value) if convert is not None and value is not None else value
+        return result
+
+
+CATEGORY = RowLayout(schemas.Category, models.Category)
+TODO = RowLayout(schemas.Todo, models.Todo, nested=("categories",))
+ITEM = RowLayout(schemas.ItemResponse, models.Item)
+INVENTORY = RowLayout(schemas.Inventory, models.Inventory, nested=("item",))
+
+TODO_LIST = TypeAdapter(list[schemas.Todo])
+TODO_RANGE = TypeAdapter(dict[date, list[schemas.Todo]])
+CATEGORY_LIST = TypeAdapter(list[schemas.Category])
+INVENTORY_LIST = TypeAdapter(list[schemas.Inventory])
+
+
+def dumps(adapter: TypeAdapter, content) -> bytes:
+    if orjson is not None:
+        # 날짜 키(기간 조회 응답)는 OPT_NON_STR_KEYS 로 ISO 문자열 변환
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return adapter.dump_json(adapter.validate_python(content), by_alias=True)
+
+
+def json_response(adapter: TypeAdapter, content, headers: dict | None = None) -> Response:
+    return Response(content=dumps(adapter, content), media_type="application/json", headers=headers)
@@ -0,0 +1,229 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from . import cache, crud, models, security
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# --- 환경 변수 ---
+# 다른 프로세스에서 기록한 토큰 폐기가 이 프로세스에 반영되기까지의 최대 지연
+DENYLIST_REFRESH_SECONDS = float(os.getenv("DENYLIST_REFRESH_SECONDS", "5"))
+# 동시에 커밋된 폐기 기록은 id 순서와 커밋 순서가 다를 수 있으므로 마지막으로 읽은 id 이전 일부를 다시 읽음
+DENYLIST_OVERLAP_ROWS = 100
+# 폐기 시점에 발급돼 있던 액세스 토큰이 모두 만료되면 폐기 기록도 필요 없음
+REVOCATION_RETENTION = timedelta(minutes=security.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+class InvalidRefreshToken(Exception):
+    """리프레시 토큰이 없거나 만료·폐기된 경우"""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RevocationList:
+    """폐기된 세션(sid)과 사용자별 최소 토큰 버전을 담은 프로세스 로컬 폐기 목록
+
+    token_revocations 를 refresh_seconds 마다 마지막으로 읽은 id 이후만 조회하여 갱신하고,
+    액세스 토큰 유효 기간이 지난 항목은 제거하므로 크기는 최근 폐기 건수로 제한됨"""
+
+    def __init__(self, refresh_seconds: float = DENYLIST_REFRESH_SECONDS, retention: timedelta = REVOCATION_RETENTION):
+        self.refresh_seconds = refresh_seconds
+        self.retention = retention
+        self._sessions: dict[str, float] = {}  # sid -> 항목 만료 시각(epoch)
+        self._min_versions: dict[int, tuple[int, float]] = {}  # user_id -> (최소 토큰 버전, 항목 만료 시각)
+        self._last_id = 0
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def add(self, user_id: int, session_id: str | None = None, min_version: int | None = None,
+            created_at: datetime | None = None) -> None:
+        created_at = created_at or _utcnow()
+        expires_at = created_at.replace(tzinfo=timezone.utc).timestamp() + self.retention.total_seconds()
+        with self._lock:
+            if session_id is not None:
+                self._sessions[session_id] = max(expires_at, self._sessions.get(session_id, 0.0))
+            if min_version is not None:
+                version, previous = self._min_versions.get(user_id, (0, 0.0))
+                self._min_versions[user_id] = (max(version, min_version), max(expires_at, previous))
+
+    def is_revoked(self, user_id: int, version: int, session_id: str | None) -> bool:
+        if session_id is not None and session_id in self._sessions:
+            return True
+        entry = self._min_versions.get(user_id)
+        return entry is not None and version < entry[0]
+
+    def refresh(self, db: Session) -> None:
+        """갱신 주기가 지났으면 새 폐기 기록을 읽어 반영 (다른 스레드가 갱신 중이면 기다리지 않고 현재 목록 사용)"""
+        now = time.monotonic()
+        if now < self._next_refresh or not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            revocation = models.TokenRevocation
+            query = db.query(
+                revocation.id, revocation.user_id, revocation.family_id, revocation.min_version, revocation.created_at,
+            )
+            if self._last_id:
+                query = query.filter(revocation.id > self._last_id - DENYLIST_OVERLAP_ROWS)
+            else:
+                query = query.filter(revocation.created_at >= _utcnow() - self.retention)
+            rows = query.order_by(revocation.id).all()
+            for row in rows:
+                self.add(row.user_id, row.family_id, row.min_version, row.created_at)
+            if rows:
+                self._last_id = max(self._last_id, rows[-1].id)
+            self._prune()
+            self._next_refresh = now + self.refresh_seconds
+        finally:
+            self._refresh_lock.release()
+
+    def _prune(self) -> None:
+        now = time.time()
+        with self._lock:
+            for session_id in [key for key, expires_at in self._sessions.items() if expires_at <= now]:
+                del self._sessions[session_id]
+            for user_id in [key for key, (_, expires_at) in self._min_versions.items() if expires_at <= now]:
+                del self._min_versions[user_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._min_versions.clear()
+        self._last_id = 0
+        self._next_refresh = 0.0
+
+    def __len__(self) -> int:
+        return len(self._sessions) + len(self._min_versions)
+
+
+denylist = RevocationList()
+
+
+def _add_refresh_token(db: Session, user_id: int, family_id: str) -> str:
+    token = security.create_refresh_token()
+    now = _utcnow()
+    db.add(models.RefreshToken(
+        user_id=user_id,
+        family_id=family_id,
+        token_hash=security.hash_refresh_token(token),
+        expires_at=now + timedelta(days=security.REFRESH_TOKEN_EXPIRE_DAYS),
+        created_at=now,
+    ))
+    return token
+
+
+def _token_response(user_id: int, version: int, family_id: str, refresh_token: str) -> dict:
+    access_token = security.create_access_token(data={"sub": str(user_id), "ver": version, "sid": family_id})
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "expires_in": security.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+
+def _record_revocation(db: Session, user_id: int, family_id: str | None = None, min_version: int | None = None) -> datetime:
+    now = _utcnow()
+    db.add(models.TokenRevocation(user_id=user_id, family_id=family_id, min_version=min_version, created_at=now))
+    db.execute(delete(models.TokenRevocation).where(models.TokenRevocation.created_at < now - REVOCATION_RETENTION))
+    return now
+
+
+def start_session(db: Session, user: models.User) -> dict:
+    """비밀번호 확인 후 새 세션(리프레시 토큰 교체 체인)을 시작하고 토큰 응답을 반환"""
+    user_id, version = user.id, user.token_version or 0
+    # 이 사용자의 만료된 리프레시 토큰 정리
+    db.execute(delete(models.RefreshToken).where(
+        models.RefreshToken.user_id == user_id, models.RefreshToken.expires_at < _utcnow(),
+    ))
+    family_id = uuid.uuid4().hex
+    refresh_token = _add_refresh_token(db, user_id, family_id)
+    db.commit()
+    return _token_response(user_id, version, family_id, refresh_token)
+
+
+def rotate_refresh_token(db: Session, refresh_token: str) -> dict:
+    """리프레시 토큰을 새 토큰으로 교체하고 새 액세스 토큰을 발급 (bcrypt 없이 해시 조회와 PK 조회만 수행)"""
+    row = db.query(models.RefreshToken).filter(
+        models.RefreshToken.token_hash == security.hash_refresh_token(refresh_token)
+    ).first()
+    if row is None:
+        raise InvalidRefreshToken()
+    user_id, family_id = row.user_id, row.family_id
+    if row.revoked_at is not None:
+        # 이미 교체된 토큰이 다시 쓰이면 탈취된 것으로 보고 세션 전체를 폐기 (이미 폐기된 세션이면 거절만 함)
+        if revoke_session(db, user_id, family_id):
+            logger.warning("refresh token reuse detected user_id=%s sid=%s", user_id, family_id)
+        raise InvalidRefreshToken()
+    now = _utcnow()
+    if row.expires_at <= now:
+        raise InvalidRefreshToken()
+    # 같은 토큰으로 동시에 교체를 요청하면 한 요청만 성공
+    claimed = db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.id == row.id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    ).rowcount
+    user = crud.get_user_cached(db, user_id=user_id) if claimed else None
+    if user is None:
+        db.rollback()
+        raise InvalidRefreshToken()
+    version = user.token_version or 0
+    new_token = _add_refresh_token(db, user_id, family_id)
+    db.commit()
+    return _token_response(user_id, version, family_id, new_token)
+
+
+def revoke_session(db: Session, user_id: int, family_id: str) -> int:
+    """세션 하나를 폐기 (리프레시 토큰 체인과 그 세션에서 발급한 액세스 토큰), 폐기한 리프레시 토큰 수를 반환"""
+    revoked = db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.family_id == family_id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=_utcnow())
+    ).rowcount
+    if not revoked:
+        # 이미 폐기된 세션
+        db.rollback()
+        return 0
+    created_at = _record_revocation(db, user_id, family_id=family_id)
+    db.commit()
+    denylist.add(user_id, session_id=family_id, created_at=created_at)
+    return revoked
+
+
+def end_session(db: Session, refresh_token: str) -> None:
+    """로그아웃: 리프레시 토큰이 속한 세션을 폐기 (알 수 없는 토큰은 무시)"""
+    row = db.query(models.RefreshToken.user_id, models.RefreshToken.family_id).filter(
+        models.RefreshToken.token_hash == security.hash_refresh_token(refresh_token)
+    ).first()
+    if row is not None:
+        revoke_session(db, row.user_id, row.family_id)
+
+
+def revoke_all_sessions(db: Session, user_id: int) -> None:
+    """사용자의 모든 세션을 폐기 (토큰 버전을 올려 이전에 발급한 액세스 토큰 전체를 무효화)"""
+    db.execute(
+        update(models.User).where(models.User.id == user_id).values(token_version=models.User.token_version + 1)
+    )
+    version = db.query(models.User.token_version).filter(models.User.id == user_id).scalar()
+    db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.user_id == user_id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=_utcnow())
+    )
+    created_at = _record_revocation(db, user_id, min_version=version)
+    db.commit()
+    cache.invalidate_user(user_id)
+    denylist.add(user_id, min_version=version, created_at=created_at)
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from jose import jwt
+from sqlalchemy.orm import Session
+
+from . import changes, events, models, sessions
+from .auth import get_current_user, oauth2_scheme
+from .database import get_db, read_only
+
+router = APIRouter()
+
+# 연결이 끊겼을 때 EventSource 가 다시 연결하기까지 기다릴 시간
+RETRY_MS = 5000
+
+
+def _format(kind: str, data: dict) -> str:
+    return f"event: {kind}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _stream(user_id: int, cursor: int, claims: dict):
+    # 구독은 스트림이 시작된 뒤(이벤트 루프)에 하고, 연결이 끊기면 finally 에서 해제
+    subscription = events.hub.subscribe(user_id)
+    version, session_id = claims.get("ver", 0), claims.get("sid")
+    expires_at = claims.get("exp")
+    try:
+        # hello 의 cursor 이후 변경은 /sync?since=cursor 로 받고, 그 뒤로는 이 스트림의 이벤트로 갱신
+        yield f"retry: {RETRY_MS}\n" + _format("hello", {"cursor": cursor})
+        while True:
+            timeout = events.EVENTS_HEARTBEAT_SECONDS
+            if expires_at is not None:
+                timeout = min(timeout, expires_at - time.time())
+            if timeout <= 0 or sessions.denylist.is_revoked(user_id, version, session_id):
+                # 액세스 토큰이 만료·폐기되면 스트림을 닫음 (클라이언트는 토큰을 갱신하고 다시 연결)
+                yield _format("token_expired", {})
+                return
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                # 하트비트: 유휴 연결이 프록시에서 끊기지 않게 하고 끊긴 연결을 감지
+                yield ": ping\n\n"
+                continue
+            if message is None:
+                return
+            yield _format(message["type"], message["data"])
+    finally:
+        events.hub.unsubscribe(subscription)
+
+
+# --- 변경 스트림 API (Server-Sent Events) ---
+# 다른 기기에서 바뀐 할일 날짜, 당근 잔액, 장착 아이템을 폴링 없이 받음
+# 이벤트: hello {cursor}, todos {days}, carrot_balance {balance}, equipment {equipped, unequipped},
+#         resync {} (놓친 이벤트가 있으니 /sync 로 맞춤), token_expired {}
+@router.get("/events", dependencies=[Depends(read_only)])
+def stream_events(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    cursor = changes.current_version(db, current_user.id)
+    # 스트림이 열려 있는 동안 DB 커넥션을 잡고 있지 않도록 세션을 먼저 닫음
+    db.close()
+    # get_current_user 에서 서명·만료를 검증한 토큰
+    claims = jwt.get_unverified_claims(token)
+    return StreamingResponse(
+        _stream(current_user.id, cursor, claims),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
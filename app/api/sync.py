@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from . import changes, crud, models, schemas
+from .auth import get_current_user
+from .database import get_db, read_only
+
+router = APIRouter()
+
+# --- 델타 동기화 API (오프라인 우선 클라이언트) ---
+@router.get("/sync", response_model=schemas.SyncResponse, dependencies=[Depends(read_only)])
+def read_changes(
+    since: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    # 조회 시작 시점의 버전을 커서로 고정하여 조회 중 커밋된 변경은 다음 동기화로 넘김
+    cursor = changes.current_version(db, current_user.id)
+    # 서버에 없는 버전(DB 복구 등)을 받으면 처음부터 다시 보내고 reset 으로 알림 (델타와 구분해 로컬 상태를 교체하도록)
+    reset = since > cursor
+    if reset:
+        since = 0
+    result = crud.get_changes_since(db, user_id=current_user.id, since=since, until=cursor)
+    return {"cursor": cursor, "reset": reset, **result}
@@ -0,0 +1,76 @@
+import os
+import tempfile
+
+# 앱 모듈은 import 시점에 엔진을 만들므로 .env 보다 먼저 테스트용 SQLite DB 를 지정
+_DB_DIR = tempfile.mkdtemp(prefix="carrot-api-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["SECRET_KEY"] = "test-secret-key"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["LOG_LEVEL"] = "WARNING"
+# 폐기 목록은 테스트마다 비운 뒤 첫 요청에서 한 번만 읽어 요청별 SQL 문 수가 시간에 따라 달라지지 않게 함
+os.environ["DENYLIST_REFRESH_SECONDS"] = "3600"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import cache, database, models, observability, search, sessions
+from app.api.main import app
+
+PASSWORD = "password123"
+
+
+@pytest.fixture
+def client() -> TestClient:
+    # 테스트마다 빈 스키마와 빈 프로세스 캐시에서 시작 (lifespan 의 warm-up·이벤트 백엔드는 사용하지 않음)
+    models.Base.metadata.drop_all(bind=database.engine)
+    models.Base.metadata.create_all(bind=database.engine)
+    for ttl_cache in (
+        cache.token_cache, cache.user_cache, cache.catalog_cache, database.recent_writers, search.search_index_cache,
+    ):
+        ttl_cache.clear()
+    sessions.denylist.clear()
+    return TestClient(app)
+
+
+@pytest.fixture
+def db(client):
+    with database.SessionLocal() as session:
+        yield session
+
+
+def signup(client: TestClient, email: str = "user@example.com") -> dict:
+    response = client.post("/signup/", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def login(client: TestClient, email: str = "user@example.com") -> dict[str, str]:
+    response = client.post("/login/", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def user(client) -> dict:
+    return signup(client)
+
+
+@pytest.fixture
+def headers(client, user) -> dict[str, str]:
+    return login(client)
+
+
+@pytest.fixture
+def statements(monkeypatch) -> list[int]:
+    """요청마다 instrument_requests 미들웨어가 count_queries 로 집계한 SQL 문 수 (요청 순서대로)"""
+    counts: list[int] = []
+    observe = observability.observe_request
+
+    def record(method, route, status, seconds, db_statements, db_seconds):
+        counts.append(db_statements)
+        observe(method, route, status, seconds, db_statements, db_seconds)
+
+    monkeypatch.setattr(observability, "observe_request", record)
+    return counts
@@ -0,0 +1,89 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func
+
+from app.api import crud, database, models, schemas
+
+DAY = "2026-10-18"
+THREADS = 8
+OPS_PER_THREAD = 60
+TODOS = 4
+# 완료 취소·구매 차감이 잔액 부족으로 건너뛰지 않도록 넉넉히 지급 (모든 완료 전환이 원장에 남음)
+INITIAL_BALANCE = 100_000
+# 완료 상태로 바꾸는 원장 사유와 증감량
+TO_COMPLETED = {("todo_complete", 1), ("todo_update", 30)}
+TO_UNCOMPLETED = {("todo_uncomplete", -1), ("todo_update", -30)}
+
+
+def race(user_id: int, todo_ids: list[int], seed: int, barrier: threading.Barrier) -> list[tuple[str, int]]:
+    """스레드마다 자기 세션으로 완료/취소(PUT 경로 포함)와 잔액 증감을 섞어 실행하고, 반영된 잔액 증감만 기록"""
+    rng = random.Random(seed)
+    applied: list[tuple[str, int]] = []
+    with database.SessionLocal() as db:
+        todos = {todo.id: todo for todo in db.query(models.Todo).filter(models.Todo.id.in_(todo_ids))}
+        barrier.wait()
+        for _ in range(OPS_PER_THREAD):
+            choice = rng.randrange(6)
+            todo_id = rng.choice(todo_ids)
+            if choice < 2:
+                crud.set_todo_completed(db, todos[todo_id], choice == 0)
+            elif choice < 4:
+                crud.update_todo(db, todo_id, schemas.TodoUpdate(completed=choice == 2))
+            elif choice == 4:
+                if crud.apply_carrot_delta(db, user_id, 2, reason="adjustment") is not None:
+                    applied.append(("adjustment", 2))
+                db.commit()
+            else:
+                if crud.apply_carrot_delta(db, user_id, -3, reason="purchase", require_funds=True) is not None:
+                    applied.append(("purchase", -3))
+                db.commit()
+    return applied
+
+
+def test_concurrent_balance_changes_match_ledger(client, headers, user, db):
+    todo_ids = [
+        client.post("/todos/", json={"title": f"todo {index}", "date": DAY}, headers=headers).json()["id"]
+        for index in range(TODOS)
+    ]
+    crud.update_carrot_balance(db, user["id"], INITIAL_BALANCE, reason="seed")
+    barrier = threading.Barrier(THREADS)
+    with ThreadPoolExecutor(THREADS) as pool:
+        futures = [pool.submit(race, user["id"], todo_ids, seed, barrier) for seed in range(THREADS)]
+        applied = [entry for future in futures for entry in future.result()]
+
+    db.expire_all()
+    balance = db.query(models.User.carrot_balance).filter(models.User.id == user["id"]).scalar()
+    ledger = db.query(models.CarrotLedgerEntry).filter_by(user_id=user["id"]).order_by(models.CarrotLedgerEntry.id).all()
+
+    # 잔액은 원장 합계와 같고, 원장의 balance_after 는 기록 순서대로 누적한 값과 같음 (갱신 유실 없음)
+    assert balance == sum(entry.amount for entry in ledger)
+    running = 0
+    for entry in ledger:
+        running += entry.amount
+        assert entry.balance_after == running >= 0
+
+    # 스레드가 성공했다고 본 잔액 변경은 모두 원장에 한 번씩 기록됨
+    assert sorted(amount for _, amount in applied) == sorted(
+        entry.amount for entry in ledger if entry.reason in ("adjustment", "purchase")
+    )
+
+    # 할일마다 보상은 완료·취소 전환이 번갈아 성공한 만큼만 기록됨 (같은 전환을 두 요청이 모두 지급하지 않음)
+    todos = {todo.id: todo for todo in db.query(models.Todo).filter(models.Todo.id.in_(todo_ids))}
+    for todo_id, todo in todos.items():
+        transitions = [
+            (entry.reason, entry.amount) in TO_COMPLETED
+            for entry in ledger if entry.ref_id == todo_id and entry.reason.startswith("todo_")
+        ]
+        assert transitions == [index % 2 == 0 for index in range(len(transitions))]
+        assert bool(todo.completed) == (len(transitions) % 2 == 1)
+        assert all((entry.reason, entry.amount) in TO_COMPLETED | TO_UNCOMPLETED
+                   for entry in ledger if entry.ref_id == todo_id and entry.reason.startswith("todo_"))
+
+    summary = db.query(models.TodoDaySummary).filter_by(owner_id=user["id"]).one()
+    assert summary.total == TODOS
+    assert summary.completed == sum(bool(todo.completed) for todo in todos.values())
+    assert summary.completed == db.query(func.count()).filter(
+        models.Todo.owner_id == user["id"], models.Todo.completed.is_(True)
+    ).scalar()
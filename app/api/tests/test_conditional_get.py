@@ -0,0 +1,113 @@
+import pytest
+
+from .conftest import login, signup
+
+DAY = "2026-10-18"
+OTHER_DAY = "2026-11-02"
+
+# 할일 목록 조건부 조회 대상: (경로, 파라미터) — DAY 를 포함하고 OTHER_DAY 는 포함하지 않음
+TODO_LISTS = [
+    ("/todos/", {"target_date": DAY}),
+    ("/todos/range/", {"month": "2026-10"}),
+]
+
+
+@pytest.fixture
+def category(client, headers) -> dict:
+    return client.post("/categories/", json={"text": "work"}, headers=headers).json()
+
+
+@pytest.fixture
+def todo(client, headers, category) -> dict:
+    response = client.post(
+        "/todos/", json={"title": "write report", "date": DAY, "category_ids": [category["id"]]}, headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def fetch(client, headers, path, params=None):
+    """조회 후 같은 ETag 로 다시 요청하면 304 인지 확인하고 ETag 를 반환"""
+    response = client.get(path, params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    etag = response.headers["ETag"]
+    cached = client.get(path, params=params, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag and not cached.content
+    return etag
+
+
+def assert_changed(client, headers, path, params, etag):
+    response = client.get(path, params=params, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200, response.text
+    assert response.headers["ETag"] != etag
+    return response.json()
+
+
+def assert_unchanged(client, headers, path, params, etag):
+    assert client.get(path, params=params, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+
+@pytest.mark.parametrize(("path", "params"), TODO_LISTS)
+def test_todo_list_is_revalidated_after_update(client, headers, todo, path, params):
+    etag = fetch(client, headers, path, params)
+
+    client.put(f"/todos/{todo['id']}", json={"title": "send report"}, headers=headers)
+
+    assert "send report" in str(assert_changed(client, headers, path, params, etag))
+
+
+@pytest.mark.parametrize(("path", "params"), TODO_LISTS)
+def test_todo_list_is_revalidated_after_completion_and_delete(client, headers, todo, path, params):
+    etag = fetch(client, headers, path, params)
+    client.post(f"/todos/{todo['id']}/complete/", headers=headers)
+    assert_changed(client, headers, path, params, etag)
+    etag = fetch(client, headers, path, params)
+
+    client.delete(f"/todos/{todo['id']}", headers=headers)
+
+    assert "write report" not in str(assert_changed(client, headers, path, params, etag))
+
+
+@pytest.mark.parametrize(("path", "params"), TODO_LISTS)
+def test_todo_list_is_revalidated_after_category_rename_and_unlink(client, headers, todo, category, path, params):
+    etag = fetch(client, headers, path, params)
+    client.put(f"/categories/{category['id']}", json={"text": "office"}, headers=headers)
+    assert "office" in str(assert_changed(client, headers, path, params, etag))
+    etag = fetch(client, headers, path, params)
+
+    client.delete(f"/categories/{category['id']}", params={"todos": "unlink"}, headers=headers)
+
+    body = assert_changed(client, headers, path, params, etag)
+    assert "write report" in str(body) and "office" not in str(body)
+
+
+@pytest.mark.parametrize(("path", "params"), TODO_LISTS)
+def test_todo_list_is_not_invalidated_by_other_days(client, headers, todo, path, params):
+    etag = fetch(client, headers, path, params)
+
+    client.post("/todos/", json={"title": "later", "date": OTHER_DAY}, headers=headers)
+
+    assert_unchanged(client, headers, path, params, etag)
+
+
+def test_category_list_is_revalidated_after_create_rename_and_delete(client, headers, category):
+    etag = fetch(client, headers, "/categories/")
+    client.post("/categories/", json={"text": "home"}, headers=headers)
+    assert [entry["text"] for entry in assert_changed(client, headers, "/categories/", None, etag)] == ["work", "home"]
+
+    etag = fetch(client, headers, "/categories/")
+    client.put(f"/categories/{category['id']}", json={"text": "office"}, headers=headers)
+    assert "office" in str(assert_changed(client, headers, "/categories/", None, etag))
+
+    etag = fetch(client, headers, "/categories/")
+    client.delete(f"/categories/{category['id']}", params={"todos": "unlink"}, headers=headers)
+    assert [entry["text"] for entry in assert_changed(client, headers, "/categories/", None, etag)] == ["home"]
+
+
+def test_etags_are_per_user(client, headers, todo):
+    etag = fetch(client, headers, "/todos/", {"target_date": DAY})
+    signup(client, "other@example.com")
+    other = login(client, "other@example.com")
+
+    assert client.get("/todos/", params={"target_date": DAY}, headers={**other, "If-None-Match": etag}).status_code == 200
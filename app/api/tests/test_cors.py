@@ -0,0 +1,15 @@
+ORIGIN = "http://localhost"
+
+
+def test_pagination_and_etag_headers_are_exposed_to_browsers(client, headers):
+    for index in range(3):
+        client.post("/todos/", json={"title": f"todo {index}", "date": "2026-10-18"}, headers=headers)
+
+    page = client.get("/todos/search", params={"q": "todo", "limit": 1}, headers={**headers, "Origin": ORIGIN})
+    listing = client.get("/todos/", params={"target_date": "2026-10-18"}, headers={**headers, "Origin": ORIGIN})
+
+    assert "X-Next-Cursor" in page.headers
+    assert "ETag" in listing.headers
+    for response in (page, listing):
+        exposed = {name.strip().lower() for name in response.headers["access-control-expose-headers"].split(",")}
+        assert {"x-next-cursor", "etag"} <= exposed
@@ -0,0 +1,231 @@
+import asyncio
+import time
+
+import pytest
+
+from app.api import events, models, sessions, stream
+
+DAY = "2026-10-18"
+
+# asyncio 스트림의 기본 줄 길이 한도(64 KiB)를 넘는 줄
+OVERLONG_LINE = b"x" * (64 * 1024 + 1) + b"\n"
+
+
+def run(coro, timeout: float = 5):
+    return asyncio.run(asyncio.wait_for(coro, timeout))
+
+
+async def wait_for(predicate, timeout: float = 2) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def published(monkeypatch) -> list[dict]:
+    """커밋 후 발행된 이벤트 (MemoryBackend 가 전달하는 메시지 목록)"""
+    messages: list[dict] = []
+    backend = events.MemoryBackend()
+    asyncio.run(backend.start(messages.append))
+    monkeypatch.setattr(events, "backend", backend)
+    return messages
+
+
+def messages(subscription: events.Subscription) -> list:
+    queued = []
+    while not subscription.queue.empty():
+        queued.append(subscription.queue.get_nowait())
+    return queued
+
+
+def test_hub_routes_events_to_the_users_connections():
+    hub = events.Hub()
+    first, second, other = hub.subscribe(1), hub.subscribe(1), hub.subscribe(2)
+    todos = {"user_id": 1, "type": "todos", "data": {"days": [DAY]}}
+
+    hub.deliver(todos)
+    hub.deliver({"user_id": None, **events.RESYNC})
+
+    assert messages(first) == messages(second) == [todos, {"user_id": None, **events.RESYNC}]
+    assert messages(other) == [{"user_id": None, **events.RESYNC}]
+    assert hub.stats() == {"users": 2, "connections": 3, "delivered": 5, "overflows": 0}
+
+    hub.unsubscribe(first)
+    hub.unsubscribe(second)
+    hub.deliver(todos)
+    assert hub.stats()["users"] == 1 and hub.stats()["delivered"] == 5
+
+
+def test_slow_connection_gets_a_single_resync_on_overflow():
+    hub = events.Hub()
+    slow = hub.subscribe(1)
+    slow.queue = asyncio.Queue(2)
+
+    for balance in range(4):
+        hub.deliver({"user_id": 1, "type": "carrot_balance", "data": {"balance": balance}})
+
+    # 가득 차면 밀린 이벤트(넘친 이벤트 포함)를 버리고 resync 를 남긴 뒤 이어서 받음
+    assert messages(slow) == [events.RESYNC, {"user_id": 1, "type": "carrot_balance", "data": {"balance": 3}}]
+    assert slow.overflows == hub.overflows == 1
+
+
+def test_oldest_connection_is_closed_over_the_per_user_limit():
+    hub = events.Hub(max_connections_per_user=2)
+    oldest, middle = hub.subscribe(1), hub.subscribe(1)
+    middle.put(events.RESYNC)
+
+    newest = hub.subscribe(1)
+
+    assert messages(oldest) == [None]
+    assert messages(middle) == [events.RESYNC]
+    hub.deliver({"user_id": 1, **events.RESYNC})
+    assert messages(newest) == [{"user_id": 1, **events.RESYNC}]
+    assert messages(oldest) == []
+
+
+def test_events_are_published_once_after_commit(published, client, headers, user):
+    todo = client.post("/todos/", json={"title": "write report", "date": DAY}, headers=headers).json()
+    assert published == [{"user_id": user["id"], "type": "todos", "data": {"days": [DAY]}}]
+    published.clear()
+
+    client.post(f"/todos/{todo['id']}/complete/", headers=headers)
+
+    assert sorted(published, key=lambda message: message["type"]) == [
+        {"user_id": user["id"], "type": "carrot_balance", "data": {"balance": 1}},
+        {"user_id": user["id"], "type": "todos", "data": {"days": [DAY]}},
+    ]
+
+
+def test_rolled_back_changes_are_not_published(published, db, user):
+    db.get(models.User, user["id"])
+    events.todos_changed(db, user["id"], [])
+    events.balance_changed(db, user["id"], 10)
+    db.rollback()
+    db.commit()
+
+    assert published == []
+
+
+def test_broker_fans_out_between_workers():
+    async def scenario():
+        broker = events.Broker()
+        server = await asyncio.start_server(broker.handle, "127.0.0.1", 0)
+        address = f"127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        workers = [events.BrokerBackend(address) for _ in range(3)]
+        delivered: list[list[dict]] = [[] for _ in workers]
+        for worker, received in zip(workers, delivered):
+            await worker.start(received.append)
+        try:
+            await wait_for(lambda: all(worker.connected for worker in workers) and len(broker._peers) == 3)
+            for received in delivered:
+                assert received == [events.RESYNC]
+                received.clear()
+            message = {"user_id": 1, "type": "todos", "data": {"days": [DAY]}}
+
+            workers[0].publish(message)
+            await wait_for(lambda: all(delivered))
+            await asyncio.sleep(0.05)
+
+            # 보낸 워커는 브로커를 거치지 않고 바로 한 번만 받고, 다른 워커는 브로커를 거쳐 받음
+            assert delivered == [[message]] * 3
+        finally:
+            for worker in workers:
+                await worker.stop()
+            server.close()
+            await server.wait_closed()
+
+    run(scenario())
+
+
+def test_stream_sends_hello_events_and_closes_on_token_expiry(client, monkeypatch):
+    monkeypatch.setattr(events, "hub", events.Hub())
+    monkeypatch.setattr(events, "EVENTS_HEARTBEAT_SECONDS", 0.05)
+
+    async def scenario():
+        body = stream._stream(1, 7, {"ver": 0, "sid": "session", "exp": time.time() + 0.3})
+        assert await anext(body) == 'retry: 5000\nevent: hello\ndata: {"cursor":7}\n\n'
+        assert events.hub.stats()["connections"] == 1
+
+        events.hub.deliver({"user_id": 1, "type": "todos", "data": {"days": [DAY]}})
+        assert await anext(body) == f'event: todos\ndata: {{"days":["{DAY}"]}}\n\n'
+
+        rest = [chunk async for chunk in body]
+        # 만료 전까지 하트비트를 보내고, 만료되면 token_expired 를 보낸 뒤 종료
+        assert rest[-1] == "event: token_expired\ndata: {}\n\n"
+        assert rest[:-1] and set(rest[:-1]) == {": ping\n\n"}
+        assert events.hub.stats()["connections"] == 0
+
+    run(scenario())
+
+
+def test_stream_closes_when_the_session_is_revoked(client, monkeypatch):
+    monkeypatch.setattr(events, "hub", events.Hub())
+    monkeypatch.setattr(events, "EVENTS_HEARTBEAT_SECONDS", 0.05)
+
+    async def scenario():
+        body = stream._stream(1, 0, {"ver": 0, "sid": "session", "exp": time.time() + 60})
+        await anext(body)
+        assert await anext(body) == ": ping\n\n"
+
+        sessions.denylist.add(1, session_id="session")
+
+        assert [chunk async for chunk in body] == ["event: token_expired\ndata: {}\n\n"]
+
+    run(scenario())
+
+
+def test_broker_backend_reconnects_after_overlong_line():
+    async def scenario():
+        connections = 0
+
+        async def handle(reader, writer):
+            nonlocal connections
+            connections += 1
+            if connections == 1:
+                # 첫 연결에서는 한도를 넘는 줄을 보냄
+                writer.write(OVERLONG_LINE)
+                await writer.drain()
+            await reader.read()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        delivered = []
+        backend = events.BrokerBackend(f"127.0.0.1:{port}")
+        await backend.start(delivered.append)
+        try:
+            # 연결할 때마다 resync 를 보냄: 끊긴 뒤 다시 연결되어야 두 번째 resync 가 옴
+            await wait_for(lambda: delivered.count(events.RESYNC) >= 2 and backend.connected)
+            assert not backend._task.done()
+        finally:
+            await backend.stop()
+            server.close()
+            await server.wait_closed()
+
+    run(scenario())
+
+
+def test_broker_drops_peer_sending_overlong_line_and_keeps_relaying():
+    async def scenario():
+        broker = events.Broker()
+        server = await asyncio.start_server(broker.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        _, bad_writer = await asyncio.open_connection("127.0.0.1", port)
+        sender_reader, sender_writer = await asyncio.open_connection("127.0.0.1", port)
+        receiver_reader, receiver_writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            await wait_for(lambda: len(broker._peers) == 3)
+            bad_writer.write(OVERLONG_LINE)
+            await bad_writer.drain()
+            await wait_for(lambda: len(broker._peers) == 2)
+
+            sender_writer.write(b'{"user_id":1,"type":"todos","data":{}}\n')
+            await sender_writer.drain()
+            assert await receiver_reader.readline() == b'{"user_id":1,"type":"todos","data":{}}\n'
+        finally:
+            for writer in (bad_writer, sender_writer, receiver_writer):
+                writer.close()
+            server.close()
+            await server.wait_closed()
+
+    run(scenario())
@@ -0,0 +1,46 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import observability, ratelimit
+from app.api.main import app
+
+
+def get_metrics(host: str, headers: dict | None = None):
+    return TestClient(app, client=(host, 50000)).get("/metrics", headers=headers)
+
+
+@pytest.mark.parametrize("host", ["127.0.0.1", "::1"])
+def test_metrics_are_served_to_the_local_collector(client, host):
+    response = get_metrics(host)
+
+    assert response.status_code == 200
+    assert "# TYPE db_pool_" in response.text
+
+
+@pytest.mark.parametrize("host", ["203.0.113.5", "testclient"])
+def test_metrics_are_hidden_from_other_clients(client, host):
+    assert get_metrics(host).status_code == 404
+
+
+def test_allowed_networks_are_configurable(client, monkeypatch):
+    monkeypatch.setattr(observability, "METRICS_ALLOWED_NETWORKS", observability._parse_networks("10.0.0.0/8, 192.0.2.7"))
+
+    assert get_metrics("10.1.2.3").status_code == 200
+    assert get_metrics("192.0.2.7").status_code == 200
+    assert get_metrics("127.0.0.1").status_code == 404
+
+
+def test_empty_allow_list_disables_metrics(client, monkeypatch):
+    monkeypatch.setattr(observability, "METRICS_ALLOWED_NETWORKS", observability._parse_networks(""))
+
+    assert get_metrics("127.0.0.1").status_code == 404
+
+
+def test_forwarded_address_is_used_only_behind_a_trusted_proxy(client, monkeypatch):
+    # 신뢰하지 않으면 헤더로 루프백을 사칭해도 거부
+    assert get_metrics("203.0.113.5", {"X-Forwarded-For": "127.0.0.1"}).status_code == 404
+
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_TRUST_FORWARDED", True)
+    # 프록시 뒤에서는 프록시(루프백)가 아니라 원래 클라이언트 주소로 판단
+    assert get_metrics("127.0.0.1", {"X-Forwarded-For": "203.0.113.5"}).status_code == 404
+    assert get_metrics("127.0.0.1", {"X-Forwarded-For": "127.0.0.1, 10.0.0.1"}).status_code == 200
@@ -0,0 +1,64 @@
+import pytest
+
+from app.api import crud, main, models
+from app.api.database import QueryBudgetExceeded
+
+DAY = "2026-10-18"
+TODOS = 6
+INVENTORY = 4
+
+# 목록 엔드포인트별 요청당 SQL 문 수 상한 (인증 포함, 목록 행 수와 무관)
+# 행마다 관계를 조회하는 N+1 이 생기면 QUERY_BUDGET 초과로 요청이 QueryBudgetExceeded 를 일으켜 테스트가 실패
+LIST_ENDPOINTS = [
+    ("/todos/", {"target_date": DAY}, 3),
+    ("/todos/range/", {"month": "2026-10"}, 3),
+    ("/todos/summary/", {"month": "2026-10"}, 1),
+    ("/todos/search", {"q": "todo"}, 5),
+    ("/categories/", {}, 2),
+    ("/api/inventory", {}, 1),
+    ("/api/inventory", {"limit": 2}, 1),
+    ("/shop/items", {"limit": 2}, 1),
+    ("/sync", {"since": 0}, 5),
+]
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    def set_budget(statements: int) -> None:
+        monkeypatch.setattr(main, "QUERY_BUDGET", statements)
+    return set_budget
+
+
+@pytest.fixture
+def seeded(client, user, headers, db):
+    category_ids = [
+        client.post("/categories/", json={"text": f"category {index}"}, headers=headers).json()["id"]
+        for index in range(3)
+    ]
+    for index in range(TODOS):
+        response = client.post(
+            "/todos/", json={"title": f"todo {index}", "date": DAY, "category_ids": category_ids}, headers=headers,
+        )
+        assert response.status_code == 200
+    items = [models.Item(name=f"item {index}", price=1, item_type="hat", image_url="") for index in range(INVENTORY)]
+    db.add_all(items)
+    db.commit()
+    crud.update_carrot_balance(db, user["id"], 100)
+    for item in items:
+        assert client.post("/shop/purchase/", params={"item_id": item.id}, headers=headers).status_code == 200
+    # 앞선 쓰기로 비워진 사용자 캐시를 채움
+    client.get("/users/me/", headers=headers)
+
+
+@pytest.mark.parametrize(("path", "params", "statements"), LIST_ENDPOINTS)
+def test_list_endpoint_within_budget(client, headers, seeded, budget, path, params, statements):
+    budget(statements)
+    response = client.get(path, params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json()
+
+
+def test_budget_guard_fails_request(client, headers, seeded, budget):
+    budget(1)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/todos/", params={"target_date": DAY}, headers=headers)
@@ -0,0 +1,150 @@
+import pytest
+
+from app.api import ratelimit, security
+
+from .conftest import PASSWORD, login, signup
+
+EMAIL = "user@example.com"
+
+
+class FakeRedis:
+    """RedisBackend 가 사용하는 eval(script, numkeys, key, capacity, rate, cost) 만 구현한 공유 저장소 대체 구현
+    (토큰 버킷 스크립트와 같은 계산, 시각은 now 로 직접 진행)"""
+
+    def __init__(self):
+        self.now = 1_000.0
+        self.buckets: dict[str, tuple[float, float]] = {}
+        self.calls: list[tuple] = []
+
+    def eval(self, script, numkeys, key, capacity, rate, cost):
+        assert script == ratelimit._TOKEN_BUCKET_SCRIPT and numkeys == 1
+        self.calls.append((key, capacity, rate, cost))
+        tokens, updated = self.buckets.get(key, (capacity, self.now))
+        tokens = min(capacity, tokens + max(0.0, self.now - updated) * rate)
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        self.buckets[key] = (tokens, self.now)
+        return str(wait)
+
+
+class BrokenRedis:
+    def eval(self, *args):
+        raise ConnectionError("redis unavailable")
+
+
+@pytest.fixture
+def store(client, monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(ratelimit, "ROUTE_LIMITS", {
+        "POST /login/": {"ip": ratelimit.Limit(100, 60), "account": ratelimit.Limit(2, 60)},
+        "POST /signup/": {"ip": ratelimit.Limit(2, 600)},
+    })
+    previous = ratelimit.backend
+    ratelimit.set_backend(ratelimit.RedisBackend(fake))
+    yield fake
+    ratelimit.set_backend(previous)
+
+
+@pytest.fixture
+def hash_calls(monkeypatch) -> list:
+    calls = []
+    run = security.hash_pool.run
+
+    def record(fn, *args):
+        calls.append(fn)
+        return run(fn, *args)
+
+    monkeypatch.setattr(security.hash_pool, "run", record)
+    return calls
+
+
+def attempt_login(client, email: str = EMAIL, password: str = "wrong-password"):
+    return client.post("/login/", data={"username": email, "password": password})
+
+
+def assert_throttled(response):
+    assert response.status_code == 429, response.text
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_signup_is_limited_per_ip(store, client):
+    signup(client, "first@example.com")
+    signup(client, "second@example.com")
+
+    response = client.post("/signup/", json={"email": "third@example.com", "password": PASSWORD})
+
+    assert_throttled(response)
+    assert response.json() == {"detail": "Too many requests, try again later"}
+    assert int(response.headers["Retry-After"]) == 300
+    assert [key for key, *_ in store.calls] == ["ratelimit:ip:POST /signup/:testclient"] * 3
+
+
+def test_login_is_limited_per_account_before_bcrypt_and_db(store, client, user, hash_calls, statements):
+    assert attempt_login(client).status_code == 401
+    # 계정 키는 대소문자·공백을 무시하므로 같은 버킷을 사용 (사용자 조회는 정확히 일치해야 하므로 bcrypt 는 실행되지 않음)
+    assert attempt_login(client, f"  {EMAIL.upper()} ").status_code == 401
+    assert len(hash_calls) == 1
+
+    response = attempt_login(client, password=PASSWORD)
+
+    assert_throttled(response)
+    assert response.json() == {"detail": "Too many login attempts, try again later"}
+    assert len(hash_calls) == 1
+    assert statements[-1] == 0
+    # 다른 계정은 영향을 받지 않음
+    assert attempt_login(client, "other@example.com").status_code == 401
+
+
+def test_login_is_allowed_again_after_refill(store, client, user):
+    attempt_login(client)
+    attempt_login(client)
+    assert_throttled(attempt_login(client, password=PASSWORD))
+
+    store.now += 30  # 2회/60초: 30초마다 1회 회복
+
+    assert login(client)
+
+
+def test_ip_limit_rejects_before_routing(store, client, user, hash_calls, statements, monkeypatch):
+    monkeypatch.setitem(ratelimit.ROUTE_LIMITS, "POST /login/", {"ip": ratelimit.Limit(1, 60)})
+    attempt_login(client)
+
+    response = attempt_login(client, password=PASSWORD)
+
+    assert_throttled(response)
+    assert len(hash_calls) == 1
+    assert statements[-1] == 0
+
+
+def test_workers_sharing_a_store_share_buckets(store, client):
+    # 같은 저장소를 쓰는 다른 워커의 백엔드가 소비한 토큰도 반영됨
+    other_worker = ratelimit.RedisBackend(store)
+    limit = ratelimit.ROUTE_LIMITS["POST /signup/"]["ip"]
+    assert other_worker.take("ip:POST /signup/:testclient", limit) == 0
+    assert other_worker.take("ip:POST /signup/:testclient", limit) == 0
+
+    assert_throttled(client.post("/signup/", json={"email": EMAIL, "password": PASSWORD}))
+
+
+def test_store_failure_allows_requests(store, client):
+    ratelimit.set_backend(ratelimit.RedisBackend(BrokenRedis()))
+
+    for index in range(3):
+        signup(client, f"user{index}@example.com")
+
+
+def test_throttled_response_is_readable_cross_origin(store, client):
+    signup(client, "first@example.com")
+    signup(client, "second@example.com")
+
+    response = client.post(
+        "/signup/", json={"email": EMAIL, "password": PASSWORD}, headers={"Origin": "http://localhost"},
+    )
+
+    assert_throttled(response)
+    assert response.headers["access-control-allow-origin"] == "http://localhost"
+    assert "retry-after" in response.headers["access-control-expose-headers"].lower()
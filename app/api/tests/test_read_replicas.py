@@ -0,0 +1,79 @@
+import itertools
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.api import database, models
+
+from .conftest import _DB_DIR
+
+DAY = "2026-10-18"
+
+
+@pytest.fixture
+def replica(client, monkeypatch):
+    """primary 와 별도의 SQLite 파일을 복제본으로 사용 (복제하지 않으므로 스키마만 있는, 항상 뒤처진 복제본)"""
+    engine = create_engine(f"sqlite:///{_DB_DIR}/replica.db")
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(database, "replica_engines", [engine])
+    monkeypatch.setattr(database, "_replica_cycle", itertools.cycle([0]))
+    yield engine
+    engine.dispose()
+
+
+def todo_titles(client, headers) -> list[str]:
+    response = client.get("/todos/", params={"target_date": DAY}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [todo["title"] for todo in response.json()]
+
+
+def create_todo(client, headers):
+    response = client.post("/todos/", json={"title": "written", "date": DAY}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def on_other_worker(client):
+    # 다른 워커: 프로세스 안의 최근 쓰기 기록이 없고, 쿠키를 보내지 않는 클라이언트
+    database.recent_writers.clear()
+    client.cookies.clear()
+
+
+def test_reads_go_to_replica_without_recent_writes(replica, client, headers):
+    create_todo(client, headers)
+    on_other_worker(client)
+
+    assert todo_titles(client, headers) == []
+
+
+def test_write_response_carries_last_write_time(replica, client, headers):
+    before = int(time.time() * 1000)
+    response = create_todo(client, headers)
+
+    assert int(response.headers[database.LAST_WRITE_HEADER]) >= before
+    assert response.cookies[database.LAST_WRITE_COOKIE] == response.headers[database.LAST_WRITE_HEADER]
+    assert "X-Last-Write" not in client.get("/todos/", params={"target_date": DAY}, headers=headers).headers
+
+
+def test_cookie_keeps_reads_on_primary_across_workers(replica, client, headers):
+    create_todo(client, headers)
+    database.recent_writers.clear()
+
+    assert todo_titles(client, headers) == ["written"]
+
+
+def test_header_keeps_reads_on_primary_across_workers(replica, client, headers):
+    last_write = create_todo(client, headers).headers[database.LAST_WRITE_HEADER]
+    on_other_worker(client)
+
+    assert todo_titles(client, {**headers, database.LAST_WRITE_HEADER: last_write}) == ["written"]
+
+
+@pytest.mark.parametrize("last_write", ["not-a-number", "0", str(int((time.time() + 3600) * 1000))])
+def test_invalid_or_expired_last_write_is_ignored(replica, client, headers, last_write):
+    create_todo(client, headers)
+    on_other_worker(client)
+
+    assert todo_titles(client, {**headers, database.LAST_WRITE_HEADER: last_write}) == []
@@ -0,0 +1,37 @@
+import pytest
+
+DAY = "2026-10-18"
+
+
+@pytest.fixture
+def todos(client, headers):
+    for index in range(3):
+        client.post("/todos/", json={"title": f"carrot {index}", "date": DAY}, headers=headers)
+
+
+def search(client, headers, **params):
+    return client.get("/todos/search", params={"q": "carrot", "limit": 1, **params}, headers=headers)
+
+
+def test_cursor_pages_through_results(client, headers, todos):
+    titles = []
+    cursor = None
+    while True:
+        response = search(client, headers, **({"cursor": cursor} if cursor else {}))
+        assert response.status_code == 200, response.text
+        titles += [todo["title"] for todo in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert sorted(titles) == ["carrot 0", "carrot 1", "carrot 2"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "nan:1", "NaN:1", "snan:1", "-sNaN:1", "inf:1", "-Infinity:1", "not-a-score:1", "1.0:x", "1.0",
+])
+def test_malformed_cursor_is_rejected(client, headers, todos, cursor):
+    response = search(client, headers, cursor=cursor)
+
+    assert response.status_code == 400, response.text
+    assert response.json() == {"detail": "Invalid cursor"}
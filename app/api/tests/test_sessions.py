@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+from app.api import models
+
+from .conftest import PASSWORD
+
+EMAIL = "user@example.com"
+
+
+def start_session(client) -> dict:
+    response = client.post("/login/", data={"username": EMAIL, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def refresh(client, refresh_token: str):
+    return client.post("/token/refresh/", json={"refresh_token": refresh_token})
+
+
+def me(client, tokens: dict) -> int:
+    return client.get("/users/me/", headers={"Authorization": f"Bearer {tokens['access_token']}"}).status_code
+
+
+def test_refresh_rotates_the_refresh_token(client, user):
+    tokens = start_session(client)
+
+    rotated = refresh(client, tokens["refresh_token"])
+
+    assert rotated.status_code == 200, rotated.text
+    body = rotated.json()
+    assert body["refresh_token"] != tokens["refresh_token"]
+    assert body["expires_in"] > 0 and me(client, body) == 200
+    # 새 토큰은 다시 교체할 수 있음
+    assert refresh(client, body["refresh_token"]).status_code == 200
+
+
+def test_refresh_token_reuse_revokes_the_session(client, user):
+    tokens = start_session(client)
+    other_device = start_session(client)
+    rotated = refresh(client, tokens["refresh_token"]).json()
+
+    reused = refresh(client, tokens["refresh_token"])
+
+    assert reused.status_code == 401
+    assert reused.json() == {"detail": "Invalid refresh token"}
+    # 같은 세션의 최신 리프레시 토큰과 액세스 토큰도 폐기되고, 다른 기기의 세션은 유지
+    assert refresh(client, rotated["refresh_token"]).status_code == 401
+    assert me(client, rotated) == 401 and me(client, tokens) == 401
+    assert me(client, other_device) == 200
+    assert refresh(client, other_device["refresh_token"]).status_code == 200
+
+
+def test_unknown_or_expired_refresh_token_is_rejected(client, db, user):
+    assert refresh(client, "not-a-token").status_code == 401
+
+    tokens = start_session(client)
+    db.query(models.RefreshToken).update({models.RefreshToken.expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+
+
+def test_logout_ends_only_the_current_session(client, user):
+    tokens = start_session(client)
+    other_device = start_session(client)
+
+    response = client.post("/logout/", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 204
+    assert me(client, tokens) == 401
+    assert refresh(client, tokens["refresh_token"]).status_code == 401
+    assert me(client, other_device) == 200
+    # 알 수 없는 토큰으로 로그아웃해도 오류 없음
+    assert client.post("/logout/", json={"refresh_token": "not-a-token"}).status_code == 204
+
+
+def test_logout_all_revokes_every_session(client, user):
+    tokens = start_session(client)
+    other_device = start_session(client)
+
+    response = client.post("/logout/all/", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+    assert response.status_code == 204
+    for session in (tokens, other_device):
+        assert me(client, session) == 401
+        assert refresh(client, session["refresh_token"]).status_code == 401
+    # 다시 로그인하면 새 세션은 정상 사용
+    assert me(client, start_session(client)) == 200
@@ -0,0 +1,49 @@
+import pytest
+
+from app.api import models
+
+
+@pytest.fixture
+def items(db) -> list[models.Item]:
+    items = [
+        models.Item(name="hat", price=10, item_type="head", image_url="hat.png"),
+        models.Item(name="scarf", price=20, item_type="neck", image_url="scarf.png"),
+    ]
+    db.add_all(items)
+    db.commit()
+    return items
+
+
+def catalog(client, etag: str | None = None):
+    return client.get("/shop/items", headers={"If-None-Match": etag} if etag else {})
+
+
+def test_catalog_is_served_from_cache_with_etag(client, items, statements):
+    first = catalog(client)
+    assert first.status_code == 200
+    assert [item["name"] for item in first.json()] == ["hat", "scarf"]
+
+    cached = catalog(client, first.headers["ETag"])
+    assert cached.status_code == 304 and not cached.content
+    assert cached.headers["ETag"] == first.headers["ETag"]
+    # 캐시 적중 시 DB 조회 없음 (검증 요청도 마찬가지)
+    assert statements[-1] == 0
+    assert catalog(client).content == first.content and statements[-1] == 0
+
+
+@pytest.mark.parametrize("change", ["add", "update", "delete"])
+def test_catalog_is_revalidated_after_item_change(client, db, items, change):
+    etag = catalog(client).headers["ETag"]
+
+    if change == "add":
+        db.add(models.Item(name="gloves", price=30, item_type="hand"))
+    elif change == "update":
+        items[0].price = 15
+    else:
+        db.delete(items[1])
+    db.commit()
+
+    response = catalog(client, etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert catalog(client, response.headers["ETag"]).status_code == 304
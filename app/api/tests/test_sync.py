@@ -0,0 +1,65 @@
+from .conftest import login, signup
+
+DAY = "2026-10-18"
+
+
+def sync(client, headers, since: int = 0) -> dict:
+    response = client.get("/sync", params={"since": since}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def create_todo(client, headers, title: str) -> dict:
+    return client.post("/todos/", json={"title": title, "date": DAY}, headers=headers).json()
+
+
+def test_full_snapshot_then_deltas(client, headers):
+    first = create_todo(client, headers, "first")
+    snapshot = sync(client, headers)
+    assert [todo["id"] for todo in snapshot["todos"]] == [first["id"]]
+    assert snapshot["reset"] is False
+
+    second = create_todo(client, headers, "second")
+    delta = sync(client, headers, snapshot["cursor"])
+
+    assert delta["cursor"] > snapshot["cursor"]
+    assert [todo["id"] for todo in delta["todos"]] == [second["id"]]
+    assert delta["reset"] is False
+    # 변경이 없으면 빈 델타와 같은 커서
+    empty = sync(client, headers, delta["cursor"])
+    assert (empty["cursor"], empty["todos"], empty["reset"]) == (delta["cursor"], [], False)
+
+
+def test_deletes_show_up_as_tombstones(client, headers):
+    todo = create_todo(client, headers, "doomed")
+    category = client.post("/categories/", json={"text": "work"}, headers=headers).json()
+    cursor = sync(client, headers)["cursor"]
+
+    client.delete(f"/todos/{todo['id']}", headers=headers)
+    client.delete(f"/categories/{category['id']}", headers=headers)
+    delta = sync(client, headers, cursor)
+
+    assert delta["deleted"]["todos"] == [todo["id"]]
+    assert delta["deleted"]["categories"] == [category["id"]]
+    assert delta["todos"] == [] and delta["categories"] == []
+    # 전체 스냅샷에는 삭제 기록을 보내지 않음
+    assert sync(client, headers)["deleted"] == {"todos": [], "categories": [], "inventory": []}
+
+
+def test_cursor_ahead_of_server_resets_to_full_snapshot(client, headers):
+    todo = create_todo(client, headers, "kept")
+    cursor = sync(client, headers)["cursor"]
+
+    response = sync(client, headers, cursor + 100)
+
+    assert response["reset"] is True
+    assert response["cursor"] == cursor
+    assert [entry["id"] for entry in response["todos"]] == [todo["id"]]
+
+
+def test_changes_are_per_user(client, headers):
+    create_todo(client, headers, "mine")
+    signup(client, "other@example.com")
+    other = login(client, "other@example.com")
+
+    assert sync(client, other)["todos"] == []
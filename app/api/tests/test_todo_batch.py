@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.api import crud, database, models, schemas
+
+DAY = "2026-10-18"
+
+
+@pytest.fixture
+def todo_ids(client, headers) -> list[int]:
+    return [
+        client.post("/todos/", json={"title": f"todo {index}", "date": DAY}, headers=headers).json()["id"]
+        for index in range(3)
+    ]
+
+
+def batch(client, headers, **ops) -> dict:
+    response = client.post("/todos/batch/", json=ops, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def statuses(body: dict, op: str) -> list[tuple[int, str]]:
+    return [(result["id"], result["status"]) for result in body["results"] if result["op"] == op]
+
+
+def day_summary(client, headers) -> dict:
+    summaries = client.get("/todos/summary/", params={"start": DAY, "end": DAY}, headers=headers).json()
+    return summaries[0] if summaries else {"total": 0, "completed": 0}
+
+
+def test_duplicate_delete_ids_are_deleted_once(client, headers, user, db, todo_ids):
+    body = batch(client, headers, delete=[todo_ids[0], todo_ids[0], todo_ids[1]])
+
+    assert statuses(body, "delete") == [(todo_ids[0], "ok"), (todo_ids[0], "duplicate"), (todo_ids[1], "ok")]
+    assert day_summary(client, headers)["total"] == 1
+    tombstones = db.query(models.SyncTombstone.entity_id).filter_by(owner_id=user["id"], entity="todos").all()
+    assert sorted(entity_id for (entity_id,) in tombstones) == sorted(todo_ids[:2])
+
+
+def test_duplicate_complete_ids_grant_one_carrot(client, headers, todo_ids):
+    body = batch(client, headers, complete=[todo_ids[0], todo_ids[0]])
+
+    assert statuses(body, "complete") == [(todo_ids[0], "ok"), (todo_ids[0], "duplicate")]
+    assert body["carrot_balance"] == 1
+    assert day_summary(client, headers)["completed"] == 1
+
+
+def test_todo_deleted_in_same_batch_is_not_completed_or_updated(client, headers, todo_ids):
+    body = batch(
+        client, headers,
+        update=[{"id": todo_ids[0], "completed": True}],
+        complete=[todo_ids[0], todo_ids[1]],
+        delete=[todo_ids[0]],
+    )
+
+    assert statuses(body, "update") == [(todo_ids[0], "deleted")]
+    assert statuses(body, "complete") == [(todo_ids[0], "deleted"), (todo_ids[1], "ok")]
+    assert statuses(body, "delete") == [(todo_ids[0], "ok")]
+    # 삭제된 할일에는 당근을 지급하지 않음 (남은 할일 완료분 1개만)
+    assert body["carrot_balance"] == 1
+    assert day_summary(client, headers) == {"day": DAY, "total": 2, "completed": 1}
+
+
+def test_overlapping_batches_pay_each_completion_once(client, headers, user, todo_ids):
+    # 여러 기기가 같은 할일을 동시에 완료하는 배치를 보내도 완료 보상과 집계는 한 번만 반영
+    request = schemas.TodoBatchRequest(
+        update=[{"id": todo_ids[0], "completed": True}],
+        complete=todo_ids[1:],
+    )
+    threads = 8
+    barrier = threading.Barrier(threads)
+
+    def apply() -> list[dict]:
+        with database.SessionLocal() as session:
+            barrier.wait()
+            return crud.apply_todo_batch(session, user["id"], request)[0]
+
+    with ThreadPoolExecutor(threads) as pool:
+        outcomes = [result for future in [pool.submit(apply) for _ in range(threads)] for result in future.result()]
+
+    completes = [result for result in outcomes if result["op"] == "complete"]
+    assert sorted(result["id"] for result in completes if result["status"] == "ok") == sorted(todo_ids[1:])
+    assert {result["status"] for result in completes} == {"ok", "already_completed"}
+    assert client.get("/users/me/", headers=headers).json()["carrot_balance"] == 30 + len(todo_ids[1:])
+    assert day_summary(client, headers) == {"day": DAY, "total": 3, "completed": 3}
+
+
+@pytest.mark.parametrize("field", ["date", "title"])
+def test_null_required_field_is_reported_per_item(client, headers, todo_ids, field):
+    body = batch(
+        client, headers,
+        update=[{"id": todo_ids[0], field: None}, {"id": todo_ids[1], "title": "renamed"}],
+        complete=[todo_ids[2]],
+    )
+
+    assert statuses(body, "update") == [(todo_ids[0], "invalid"), (todo_ids[1], "ok")]
+    assert statuses(body, "complete") == [(todo_ids[2], "ok")]
+    todo = client.get(f"/todos/{todo_ids[0]}", headers=headers).json()
+    assert todo["title"] == "todo 0" and todo["date"].startswith(DAY)
+
+
+@pytest.mark.parametrize("field", ["date", "title"])
+def test_put_rejects_null_required_field(client, headers, todo_ids, field):
+    response = client.put(f"/todos/{todo_ids[0]}", json={field: None}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": f"{field} must not be null"}
@@ -0,0 +1,44 @@
+import pytest
+
+DAY = "2026-10-18"
+
+
+@pytest.fixture
+def todos(client, headers):
+    for day in ("2026-09-30", DAY, "2026-10-31", "2026-11-01"):
+        client.post("/todos/", json={"title": f"todo {day}", "date": day}, headers=headers)
+
+
+@pytest.mark.parametrize("path", ["/todos/range/", "/todos/summary/"])
+@pytest.mark.parametrize(("params", "days"), [
+    ({"month": "2026-10"}, ["2026-10-18", "2026-10-31"]),
+    ({"start": "2026-09-30", "end": "2026-10-18"}, ["2026-09-30", "2026-10-18"]),
+    ({"start": DAY, "end": DAY}, [DAY]),
+])
+def test_range_includes_both_ends(client, headers, todos, path, params, days):
+    response = client.get(path, params=params, headers=headers)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    # range 는 기간의 모든 날짜를 키로 반환하므로 할일이 있는 날짜만 비교
+    found = sorted(day for day, items in body.items() if items) if isinstance(body, dict) else sorted(
+        summary["day"] for summary in body
+    )
+    assert found == days
+
+
+@pytest.mark.parametrize("path", ["/todos/range/", "/todos/summary/"])
+@pytest.mark.parametrize(("params", "detail"), [
+    ({"month": "2026-13"}, "month must be formatted as YYYY-MM"),
+    ({"month": "october"}, "month must be formatted as YYYY-MM"),
+    ({"month": "9999-12"}, "month is out of range"),
+    ({"start": "9999-12-01", "end": "9999-12-31"}, "end is out of range"),
+    ({"start": DAY}, "Either month or both start and end are required"),
+    ({"start": DAY, "end": "2026-10-17"}, "end must not be before start"),
+    ({"start": "2025-01-01", "end": "2026-01-02"}, "Range must not exceed 366 days"),
+])
+def test_invalid_range_is_rejected(client, headers, path, params, detail):
+    response = client.get(path, params=params, headers=headers)
+
+    assert response.status_code == 400, response.text
+    assert response.json() == {"detail": detail}
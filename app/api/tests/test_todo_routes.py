@@ -0,0 +1,34 @@
+import pytest
+
+DAY = "2026-10-18"
+
+
+@pytest.fixture
+def todo(client, headers) -> dict:
+    response = client.post("/todos/", json={"title": "write report", "date": DAY}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+# /todos/ 아래 고정 경로는 끝 슬래시 유무와 관계없이 /todos/{todo_id} 로 해석되지 않음
+@pytest.mark.parametrize(("path", "params"), [
+    ("/todos/range", {"month": "2026-10"}),
+    ("/todos/summary", {"month": "2026-10"}),
+    ("/todos/search", {"q": "rep"}),
+])
+def test_fixed_todo_paths_accept_both_slash_forms(client, headers, todo, path, params):
+    without_slash = client.get(path, params=params, headers=headers)
+    with_slash = client.get(path + "/", params=params, headers=headers)
+    assert without_slash.status_code == with_slash.status_code == 200
+    assert without_slash.json() == with_slash.json()
+
+
+@pytest.mark.parametrize("path", ["/todos/batch", "/todos/batch/"])
+def test_batch_path_accepts_both_slash_forms(client, headers, todo, path):
+    response = client.post(path, json={"complete": [todo["id"]]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["results"] == [{"op": "complete", "index": 0, "id": todo["id"], "status": "ok"}]
+
+
+def test_todo_by_id(client, headers, todo):
+    assert client.get(f"/todos/{todo['id']}", headers=headers).json()["title"] == "write report"
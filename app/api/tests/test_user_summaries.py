@@ -0,0 +1,100 @@
+import pytest
+
+from app.api import crud, models
+
+from .conftest import PASSWORD
+
+EXPAND = "todos,inventory"
+TODOS = 5
+CATEGORIES = 2
+INVENTORY = 3
+
+# 응답을 만드는 데 쓰는 SQL 문 수 상한 (인증용 사용자 캐시가 채워진 상태, 관계 행 수와 무관)
+# ?expand=todos,inventory 는 할일·카테고리 IN 쿼리 2회와 인벤토리+아이템 JOIN 쿼리 1회만 더함
+EXPAND_STATEMENTS = 3
+
+
+@pytest.fixture
+def account(client, user, headers, db):
+    """카테고리 2개가 붙은 할일 5개, 인벤토리 아이템 3개, 구매할 아이템 1개를 가진 사용자"""
+    category_ids = [
+        client.post("/categories/", json={"text": f"category {index}"}, headers=headers).json()["id"]
+        for index in range(CATEGORIES)
+    ]
+    todo_ids = [
+        client.post(
+            "/todos/", json={"title": f"todo {index}", "date": "2026-10-18", "category_ids": category_ids},
+            headers=headers,
+        ).json()["id"]
+        for index in range(TODOS)
+    ]
+    items = [models.Item(name=f"item {index}", price=10, item_type="hat", image_url="") for index in range(INVENTORY + 2)]
+    db.add_all(items)
+    db.commit()
+    crud.update_carrot_balance(db, user["id"], 100)
+    for item in items[:INVENTORY]:
+        assert client.post("/shop/purchase/", params={"item_id": item.id}, headers=headers).status_code == 200
+    return {"todo_ids": todo_ids, "item_ids": [item.id for item in items[INVENTORY:]]}
+
+
+def measure(client, headers, statements, method: str, url: str, **kwargs):
+    # 앞선 쓰기로 비워진 사용자 캐시를 먼저 채워 인증 조회가 측정에 섞이지 않게 함
+    client.get("/users/me/", headers=headers)
+    response = client.request(method, url, headers=headers, **kwargs)
+    assert response.status_code == 200, response.text
+    return response.json(), statements[-1]
+
+
+def assert_expanded(body: dict) -> None:
+    assert len(body["todos"]) == TODOS
+    assert all(len(todo["categories"]) == CATEGORIES for todo in body["todos"])
+    assert len(body["inventory"]) >= INVENTORY
+    assert all(entry["item"]["name"] for entry in body["inventory"])
+
+
+def test_users_me_statements(client, headers, statements, account):
+    body, count = measure(client, headers, statements, "GET", "/users/me/")
+    assert "todos" not in body and "inventory" not in body
+    assert count <= 1
+
+    body, expanded = measure(client, headers, statements, "GET", "/users/me/", params={"expand": EXPAND})
+    assert_expanded(body)
+    assert expanded <= count + EXPAND_STATEMENTS
+
+
+def test_signup_statements(client, statements):
+    response = client.post("/signup/", json={"email": "new@example.com", "password": PASSWORD})
+    assert response.status_code == 201
+    assert "todos" not in response.json()
+    assert statements[-1] <= 3
+
+
+@pytest.mark.parametrize("expand", [None, EXPAND])
+def test_complete_and_uncomplete_statements(client, headers, statements, account, expand):
+    todo_id = account["todo_ids"][0]
+    params = {"expand": expand} if expand else {}
+    extra = EXPAND_STATEMENTS if expand else 0
+
+    body, count = measure(client, headers, statements, "POST", f"/todos/{todo_id}/complete/", params=params)
+    assert body["carrot_balance"] == 100 - 10 * INVENTORY + 1
+    assert count <= 7 + extra
+
+    body, count = measure(client, headers, statements, "POST", f"/todos/{todo_id}/uncomplete/", params=params)
+    assert body["carrot_balance"] == 100 - 10 * INVENTORY
+    assert count <= 7 + extra
+    if expand:
+        assert_expanded(body)
+    else:
+        assert "todos" not in body and "inventory" not in body
+
+
+@pytest.mark.parametrize("expand", [None, EXPAND])
+def test_purchase_statements(client, headers, statements, account, expand):
+    params = {"item_id": account["item_ids"][0]}
+    if expand:
+        params["expand"] = expand
+    body, count = measure(client, headers, statements, "POST", "/shop/purchase/", params=params)
+    assert body["carrot_balance"] == 100 - 10 * (INVENTORY + 1)
+    assert count <= 9 + (EXPAND_STATEMENTS if expand else 0)
+    if expand:
+        assert_expanded(body)
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session 
-from datetime import date
-from . import crud, models, schemas
-from .database import get_db
+from datetime import date, timedelta
+from . import cache, crud, models, schemas, search, serializers
+from .database import get_db, read_only
 from .auth import get_current_user
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # --- 할일(Todo) 생성 API ---
 @router.post("/todos/", response_model=schemas.Todo)
@@ -17,25 +19,151 @@ def create_todo_for_user(
     # crud 함수를 호출하여 데이터베이스에 할일을 생성하고, 생성된 할일 객체를 반환.
     return crud.create_user_todo(db=db, todo=todo, user_id=current_user.id)
 
+# --- 목록 조회 조건부 응답 (ETag/If-None-Match) ---
+# 목록 응답 형식이 바뀌면 올려서 클라이언트가 가진 이전 ETag 를 무효화
+LIST_ETAG_FORMAT = 1
+
+# 리비전으로 만든 ETag 헤더 (목록을 조회·직렬화하지 않고 계산)
+def _revision_headers(*parts) -> dict[str, str]:
+    etag = cache.make_etag(":".join(str(part) for part in (LIST_ETAG_FORMAT, *parts)).encode())
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+def _not_modified(request: Request, headers: dict[str, str]) -> Response | None:
+    if cache.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return None
+
 # --- 할일(Todo) 목록 조회 API ---
-@router.get("/todos/", response_model=list[schemas.Todo])
+@router.get("/todos/", response_model=list[schemas.Todo], dependencies=[Depends(read_only)])
 def read_todos(
-    request: Request, 
     target_date: date,
+    request: Request,
     db: Session = Depends(get_db),  
     current_user: models.User = Depends(get_current_user),  
 ):
-    # 백엔드에서 받은 요청 헤더와 인증된 사용자 정보를 출력.
-    print(f"[todos.py - read_todos] 요청 헤더: {request.headers}")
-    print(f"[todos.py - read_todos] 인증된 사용자: {current_user.email} (ID: {current_user.id})")
-    # 날짜를 기준으로 할일을 조회하는 crud 함수 호출
-    todos = crud.get_todos_by_date(db, user_id=current_user.id, target_date=target_date)
-    if todos is None:
-        return []
-    return todos
+    # 요청 헤더(Authorization 토큰 포함)는 기록하지 않음
+    logger.debug("read_todos user_id=%s target_date=%s", current_user.id, target_date)
+    # 그날 목록이 바뀌지 않았으면 리비전 조회 한 번으로 304 응답
+    revision = crud.get_day_revision(db, user_id=current_user.id, day=target_date)
+    headers = _revision_headers("todos", current_user.id, target_date, revision)
+    not_modified = _not_modified(request, headers)
+    if not_modified is not None:
+        return not_modified
+    # 날짜를 기준으로 할일을 조회하여 ORM 객체 없이 바로 직렬화
+    todos = crud.get_todo_rows_by_date(db, user_id=current_user.id, target_date=target_date)
+    return serializers.json_response(serializers.TODO_LIST, todos, headers=headers)
+
+# --- 기간별 할일(Todo) 조회 API (캘린더) ---
+MAX_RANGE_DAYS = 366
+
+# month=YYYY-MM 또는 start~end(양끝 포함) 중 하나로 받은 기간을 [start, end) 로 변환
+def _resolve_range(start: date | None, end: date | None, month: str | None) -> tuple[date, date]:
+    if month is not None:
+        try:
+            year, mon = (int(part) for part in month.split("-"))
+            start = date(year, mon, 1)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="month must be formatted as YYYY-MM")
+        try:
+            end_exclusive = date(year + mon // 12, mon % 12 + 1, 1)
+        except (ValueError, OverflowError):
+            # 9999-12 처럼 다음 달 1일이 date 범위를 벗어나는 경우
+            raise HTTPException(status_code=400, detail="month is out of range")
+    elif start is not None and end is not None:
+        try:
+            end_exclusive = end + timedelta(days=1)
+        except OverflowError:
+            raise HTTPException(status_code=400, detail="end is out of range")
+    else:
+        raise HTTPException(status_code=400, detail="Either month or both start and end are required")
+    if end_exclusive <= start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end_exclusive - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range must not exceed {MAX_RANGE_DAYS} days")
+    return start, end_exclusive
+
+@router.get("/todos/range/", response_model=dict[date, list[schemas.Todo]], dependencies=[Depends(read_only)])
+@router.get("/todos/range", response_model=dict[date, list[schemas.Todo]], dependencies=[Depends(read_only)], include_in_schema=False)
+def read_todos_by_range(
+    request: Request,
+    start: date | None = None,
+    end: date | None = None,
+    month: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    start, end_exclusive = _resolve_range(start, end, month)
+    revisions = crud.get_day_revisions(db, user_id=current_user.id, start=start, end=end_exclusive)
+    headers = _revision_headers("todos-range", current_user.id, start, end_exclusive, revisions)
+    not_modified = _not_modified(request, headers)
+    if not_modified is not None:
+        return not_modified
+    # 기간 내 모든 날짜를 빈 목록으로 채운 뒤 한 번의 쿼리 결과를 날짜별로 분배
+    grouped = {start + timedelta(days=offset): [] for offset in range((end_exclusive - start).days)}
+    for todo in crud.get_todo_rows_by_range(db, user_id=current_user.id, start=start, end=end_exclusive):
+        grouped[todo["date"]].append(todo)
+    return serializers.json_response(serializers.TODO_RANGE, grouped, headers=headers)
+
+# --- 일자별 완료 현황 API (캘린더 히트맵) ---
+@router.get("/todos/summary/", response_model=list[schemas.TodoDaySummary], dependencies=[Depends(read_only)])
+@router.get("/todos/summary", response_model=list[schemas.TodoDaySummary], dependencies=[Depends(read_only)], include_in_schema=False)
+def read_todo_day_summaries(
+    start: date | None = None,
+    end: date | None = None,
+    month: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    # 할일이 있는 날짜만 반환 (todo_day_summaries 집계 테이블에서 조회)
+    start, end_exclusive = _resolve_range(start, end, month)
+    return crud.get_day_summaries(db, user_id=current_user.id, start=start, end=end_exclusive)
+
+# --- 할일(Todo) 검색 API ---
+# 제목·카테고리 이름에서 검색어 단어를 접두어로 찾아 관련도순으로 반환 (start~end 는 양끝 포함)
+# 다음 페이지가 있으면 X-Next-Cursor 헤더의 값을 cursor 로 전달
+@router.get("/todos/search", response_model=list[schemas.Todo], dependencies=[Depends(read_only)])
+@router.get("/todos/search/", response_model=list[schemas.Todo], dependencies=[Depends(read_only)], include_in_schema=False)
+def search_todos(
+    q: str = Query(..., min_length=1, max_length=100),
+    category_id: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    cursor: str | None = None,
+    limit: int = Query(search.DEFAULT_LIMIT, ge=1, le=crud.MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if start is not None and end is not None and end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    try:
+        todos, next_cursor = search.search_todos(
+            db, user_id=current_user.id, q=q, category_id=category_id, start=start, end=end, cursor=cursor, limit=limit,
+        )
+    except search.InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else None
+    return serializers.json_response(serializers.TODO_LIST, todos, headers=headers)
+
+# --- 할일(Todo) 일괄 처리 API (오프라인 동기화, 오늘 전체 완료 등) ---
+MAX_BATCH_SIZE = 500
+
+@router.post("/todos/batch/", response_model=schemas.TodoBatchResponse)
+@router.post("/todos/batch", response_model=schemas.TodoBatchResponse, include_in_schema=False)
+def apply_todo_batch(
+    batch: schemas.TodoBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    size = len(batch.create) + len(batch.update) + len(batch.complete) + len(batch.delete)
+    if size > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch must not exceed {MAX_BATCH_SIZE} operations")
+    results, balance = crud.apply_todo_batch(db, user_id=current_user.id, batch=batch)
+    return {"results": results, "carrot_balance": balance}
 
 # --- 특정 할일(Todo) 조회 API ---
-@router.get("/todos/{todo_id}", response_model=schemas.Todo)
+# /todos/ 아래 고정 경로(range, summary, search, batch)는 이 라우트보다 먼저 등록해야 하며,
+# 끝 슬래시가 없는 요청이 {todo_id} 로 해석되어 422 가 되지 않도록 두 형태를 모두 등록
+@router.get("/todos/{todo_id}", response_model=schemas.Todo, dependencies=[Depends(read_only)])
 def read_todo_by_id(
     todo_id: int, 
     db: Session = Depends(get_db),  
@@ -61,6 +189,9 @@ def update_todo_by_id(
         raise HTTPException(status_code=404, detail="Todo not found")
     if db_todo.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this todo")
+    null_fields = crud.null_required_fields(todo)
+    if null_fields:
+        raise HTTPException(status_code=400, detail=f"{', '.join(null_fields)} must not be null")
     return crud.update_todo(db=db, todo_id=todo_id, todo=todo)
 
 # --- 특정 할일(Todo) 삭제 API ---
@@ -78,52 +209,59 @@ def delete_todo_by_id(
     return crud.delete_todo(db=db, todo_id=todo_id)
 
 # --- 할일(Todo) 당근 지급 로직 API ---
-@router.post("/todos/{todo_id}/complete/", response_model=schemas.User)
+@router.post("/todos/{todo_id}/complete/", response_model=schemas.UserExpanded, response_model_exclude_unset=True)
 def complete_todo(
     todo_id: int, 
+    expand: str | None = None,
     db: Session = Depends(get_db),  
     current_user: models.User = Depends(get_current_user), 
 ):
     db_todo = crud.get_todo(db, todo_id=todo_id)
     if db_todo is None:
         raise HTTPException(status_code=404, detail="Todo not found")
-    if db_todo.owner_id != current_user.id:
+    # 커밋하면 current_user 가 만료되므로 id 는 미리 읽어 둠 (응답용 행은 get_user_expanded 로 한 번만 조회)
+    user_id = current_user.id
+    if db_todo.owner_id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized to complete this todo")
     if db_todo.completed:
         raise HTTPException(status_code=400, detail="Todo is already completed")
-    db_todo.completed = True
-    current_user.carrot_balance += 1
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    if crud.set_todo_completed(db, db_todo, True) is None:
+        raise HTTPException(status_code=400, detail="Todo is already completed")
+    return schemas.UserExpanded.from_user(crud.get_user_expanded(db, user_id, expand), expand)
 
 # --- 할일(Todo) 완료 취소 API ---
-@router.post("/todos/{todo_id}/uncomplete/", response_model=schemas.User)
+@router.post("/todos/{todo_id}/uncomplete/", response_model=schemas.UserExpanded, response_model_exclude_unset=True)
 def uncomplete_todo(
-    todo_id: int,  
+    todo_id: int, 
+    expand: str | None = None, 
     db: Session = Depends(get_db),  
     current_user: models.User = Depends(get_current_user),  
 ):
     db_todo = crud.get_todo(db, todo_id=todo_id)
     if db_todo is None:
         raise HTTPException(status_code=404, detail="Todo not found")
-    if db_todo.owner_id != current_user.id:
+    user_id = current_user.id
+    if db_todo.owner_id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized to uncomplete this todo")
     if not db_todo.completed:
         raise HTTPException(status_code=400, detail="Todo is not completed yet")
-    db_todo.completed = False
-    current_user.carrot_balance = max(0, current_user.carrot_balance - 1)
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    if crud.set_todo_completed(db, db_todo, False) is None:
+        raise HTTPException(status_code=400, detail="Todo is not completed yet")
+    return schemas.UserExpanded.from_user(crud.get_user_expanded(db, user_id, expand), expand)
 
 # --- Category APIs ---
-@router.get("/categories/", response_model=list[schemas.Category])
+@router.get("/categories/", response_model=list[schemas.Category], dependencies=[Depends(read_only)])
 def read_categories(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    return crud.get_categories_by_user(db, user_id=current_user.id)
+    headers = _revision_headers("categories", current_user.id, *crud.get_category_revision(db, user_id=current_user.id))
+    not_modified = _not_modified(request, headers)
+    if not_modified is not None:
+        return not_modified
+    categories = crud.get_category_rows(db, user_id=current_user.id)
+    return serializers.json_response(serializers.CATEGORY_LIST, categories, headers=headers)
 
 @router.post("/categories/", response_model=schemas.Category)
 def create_category(
@@ -148,10 +286,14 @@ def update_category(
 @router.delete("/categories/{category_id}", response_model=schemas.Category)
 def delete_category(
     category_id: int,
+    todos: str | None = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
+    # todos=delete_todos | unlink (생략 시 CATEGORY_DELETE_POLICY 기본값)
+    if todos is not None and todos not in crud.CATEGORY_DELETE_POLICIES:
+        raise HTTPException(status_code=400, detail=f"todos must be one of {', '.join(crud.CATEGORY_DELETE_POLICIES)}")
     db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
     if db_category and db_category.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
-    return crud.delete_category(db=db, category_id=category_id)
\ No newline at end of file
+    return crud.delete_category(db=db, category_id=category_id, policy=todos)
\ No newline at end of file